@@ -0,0 +1,14 @@
+"""
+Benchmarks for the Python tooling in scripts/.
+
+- generate.py         : schema-valid synthetic datasets at 1x/10x/100x/1000x
+- load.py             : asyncio HTTP/1.1 keep-alive load driver
+- run.py              : timing harness (wall time, peak RSS, requests/sec) -> JSON
+- serve_fonts.py      : font throughput, stock handler vs serve.py
+- example_sentences.py: example-sentence cross-check scaling
+- progress.py         : serve.py progress API writes/reads under many clients
+- engines.py          : serve.py --engine threaded vs asyncio, req/s and p50/p99
+- romaji.py           : romaji -> kana throughput, compiled table vs rule scan vs Core
+
+Each module is also a script: python scripts/bench/<name>.py --help
+"""
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Side-by-side benchmark of the serve.py engines (`--engine threaded` vs `asyncio`).
+
+For each engine it starts serve.py from the repo root, warms the file cache,
+then drives the app's static assets and data files with the keep-alive load
+driver (load.py) at each `--clients` level, plain and with
+Accept-Encoding: gzip. With `--idle N` it also holds N idle keep-alive
+connections open for the whole run (a thread each on the threaded engine).
+
+Prints requests/sec and p50/p99 latency per engine and client count;
+`--out` writes the full result JSON.
+
+Usage:
+  python scripts/bench/engines.py
+  python scripts/bench/engines.py --clients 50 200 400 --duration 5 --idle 200 --out /tmp/engines.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import load  # noqa: E402
+from run import LOAD_PATHS, free_port, wait_for_port  # noqa: E402
+
+ENGINES = ["threaded", "asyncio"]
+ASSET_PATHS = ["/index.html", "/src/app.js", "/src/core/index.js", "/src/core/lesson_engine.js"] + LOAD_PATHS
+
+
+def open_idle(port: int, count: int) -> List[socket.socket]:
+    """Keep-alive connections that made one request and then sit idle."""
+    socks = []
+    for _ in range(count):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.sendall(f"HEAD /index.html HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode("latin-1"))
+        sock.recv(65536)
+        socks.append(sock)
+    return socks
+
+
+def bench_engine(engine: str, clients: List[int], duration: float, idle: int, cache_mb: float) -> Dict[str, Any]:
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "scripts" / "serve.py"), str(port), "--engine", engine, "--cache-mb", str(cache_mb)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    idle_socks: List[socket.socket] = []
+    try:
+        wait_for_port(port)
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        for path in ASSET_PATHS:
+            for headers in ({}, {"Accept-Encoding": "gzip"}):
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    raise RuntimeError(f"{engine}: GET {path} -> {resp.status}")
+        conn.close()
+        idle_socks = open_idle(port, idle)
+        runs = []
+        for count in clients:
+            for label, headers in (("plain", {}), ("gzip", {"Accept-Encoding": "gzip"})):
+                result = load.run_load("127.0.0.1", port, ASSET_PATHS, count, duration, headers)
+                result["encoding"] = label
+                runs.append(result)
+                print(f"  {engine:8s} {count:4d} clients {label:5s}: {result['rps']:8.0f} req/s "
+                      f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+                      f"{result['errors']} errors", file=sys.stderr)
+        return {"engine": engine, "idle_connections": len(idle_socks), "runs": runs}
+    finally:
+        for sock in idle_socks:
+            sock.close()
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Compare serve.py --engine threaded vs asyncio under load.")
+    ap.add_argument("--clients", type=int, nargs="+", default=[50, 200, 400],
+                    help="Concurrent keep-alive clients per run (default: 50 200 400)")
+    ap.add_argument("--duration", type=float, default=5.0, help="Seconds per run (default: 5)")
+    ap.add_argument("--idle", type=int, default=0, help="Extra idle keep-alive connections held open (default: 0)")
+    ap.add_argument("--cache-mb", type=float, default=64, help="serve.py --cache-mb (default: 64)")
+    ap.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    ap.add_argument("--out", help="Write the result JSON here")
+    args = ap.parse_args()
+
+    results = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "paths": ASSET_PATHS,
+        "duration_s": args.duration,
+        "engines": [bench_engine(e, args.clients, args.duration, args.idle, args.cache_mb) for e in args.engines],
+    }
+
+    by_engine = {r["engine"]: {(run["clients"], run["encoding"]): run for run in r["runs"]} for r in results["engines"]}
+    header = f"{'clients':>7s} {'enc':5s}" + "".join(f" | {e:>8s} req/s   p50 ms   p99 ms" for e in args.engines)
+    print(header)
+    print("-" * len(header))
+    for count in args.clients:
+        for label in ("plain", "gzip"):
+            row = f"{count:7d} {label:5s}"
+            for engine in args.engines:
+                run = by_engine[engine][(count, label)]
+                row += f" | {run['rps']:14.0f} {run['p50_ms']:8.2f} {run['p99_ms']:8.2f}"
+            print(row)
+    errors = sum(run["errors"] for r in results["engines"] for run in r["runs"])
+    if errors:
+        print(f"{errors} request errors")
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
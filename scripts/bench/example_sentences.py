@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for validate_data.validate_example_sentences.
+
+Builds synthetic example-sentence datasets at 1x, 10x and 100x the size of
+data/ui_text/example_sentences.v4.json (examples per verb class and overrides
+per template are multiplied; roughly 1% of references are broken on purpose)
+and times the cross-reference check. Time per example should stay flat as the
+dataset grows, and each template should produce at most one issue per
+reference kind.
+
+Usage:
+  python scripts/bench/example_sentences.py --scales 1 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import validate_data  # noqa: E402
+
+EXAMPLES_PATH = ROOT / "data" / "ui_text" / "example_sentences.v4.json"
+TEMPLATES_PATH = ROOT / "data" / "conjugations" / "conjugation_templates.v3.json"
+VERBS_PATH = ROOT / "data" / "verbs" / "verbs.v2.jsonl"
+
+
+def scale_examples(base: Dict[str, Any], scale: int, rng: random.Random) -> Tuple[Dict[str, Any], int]:
+    """Return a copy of `base` with `scale`x the examples and overrides."""
+    data = copy.deepcopy(base)
+    total = 0
+    for tpl in data["templates"].values():
+        for verb_class, examples in tpl.get("by_verb_class", {}).items():
+            scaled = []
+            for _ in range(scale):
+                for ex in examples:
+                    ex = dict(ex)
+                    if rng.random() < 0.01:
+                        ex["character_ids"] = list(ex.get("character_ids", [])) + ["ghost_99"]
+                    if rng.random() < 0.01:
+                        ex["text"] = ex.get("text", "") + "{no_such_token}"
+                    scaled.append(ex)
+            tpl["by_verb_class"][verb_class] = scaled
+            total += len(scaled)
+        overrides = tpl.get("overrides") or []
+        if overrides:
+            scaled_ov = []
+            for n in range(scale):
+                for ov in overrides:
+                    ov = copy.deepcopy(ov)
+                    # Fresh verb ids per copy, so copies don't trip the duplicate-override check.
+                    ov["verb_ids"] = [f"{vid}#{n}" for vid in ov["verb_ids"]]
+                    if rng.random() < 0.01:
+                        ov["verb_ids"].append(f"missing_verb_{n}")
+                    scaled_ov.append(ov)
+                    total += len(ov.get("examples") or [])
+            tpl["overrides"] = scaled_ov
+    return data, total
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark example-sentence cross-reference validation at several scales.")
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Size multipliers (default: 1 10 100)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per scale; the best is reported (default: 3)")
+    ap.add_argument("--seed", type=int, default=1, help="RNG seed for injected broken references")
+    args = ap.parse_args()
+
+    base = validate_data.load_json(EXAMPLES_PATH)
+    templates = validate_data.load_json(TEMPLATES_PATH)
+    _, base_by_id = validate_data.load_jsonl_records(VERBS_PATH)
+
+    print(f"{'scale':>6} {'examples':>9} {'best ms':>9} {'us/example':>11} {'issues':>7}")
+    for scale in args.scales:
+        rng = random.Random(args.seed)
+        data, total = scale_examples(base, scale, rng)
+        verbs_by_id = {f"{vid}#{n}": None for vid in base_by_id for n in range(scale)}
+        best = float("inf")
+        issues: List[validate_data.Issue] = []
+        for _ in range(args.repeat):
+            issues = []
+            start = time.perf_counter()
+            validate_data.validate_example_sentences(data, verbs_by_id, templates, issues, "bench")
+            best = min(best, time.perf_counter() - start)
+        print(f"{scale:>6} {total:>9} {best * 1000:>9.1f} {best / max(1, total) * 1e6:>11.2f} {len(issues):>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset generator for the tooling benchmarks.
+
+Writes a project-shaped tree (schemas/, data/, tests/) whose verbs, exceptions,
+example sentences and learning paths are `--scale` times the shipped data and
+still pass scripts/validate_data.py:
+
+- verbs: replica r of every non-irregular verb gets a hiragana prefix on its
+  kana (and on its new_conjugations), id `<id>_r<r>` and kanji null. Prefixes
+  are "ん" plus a fixed-width base-44 number, so replica kana never collide with
+  each other or with shipped kana (no shipped verb starts with ん). Replica 0 is
+  the original record, so golden tests still resolve. Irregular verbs are a
+  closed set and are not replicated.
+- exceptions: godan_ru_exceptions, special_cases and ambiguous_kana gain the
+  prefixed kana of each replica.
+- example sentences: overrides are replicated per verb replica, and each
+  template gains one override per replica pointing at a replicated verb;
+  per-class example lists grow by repeating the shipped examples.
+- learning paths: stages are repeated with fresh ids.
+
+Some files cannot grow without limit and stay schema-valid (e.g. at most 10
+examples per verb class, 200 overrides per template, 80 stages per path). Those
+are clamped; synthetic_manifest.json records the effective sizes.
+
+Usage:
+  python scripts/bench/generate.py --scale 100 --out /tmp/jsrs_100
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+
+SCALES = [1, 10, 100, 1000]
+
+# Schema limits (see schemas/*.schema.json).
+MAX_EXAMPLES_PER_CLASS = 10
+MAX_OVERRIDES_PER_TEMPLATE = 200
+MAX_STAGES = 80
+MAX_GODAN_RU_EXCEPTIONS = 500
+
+PREFIX_MARK = "ん"
+PREFIX_DIGITS = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわ"
+
+COPIED = [
+    "schemas",
+    "data/conjugations/conjugation_templates.v3.json",
+    "data/ui_text/rule_hints.v3.json",
+    "data/ui_text/furigana.verbs.v2.v1.json",
+    "tests/conjugation_golden_tests.v1.json",
+    "tests/conjugation_golden_tests.v2.json",
+]
+
+
+def prefix_width(scale: int) -> int:
+    """Digits needed to number replicas 1..scale-1."""
+    width, n = 1, len(PREFIX_DIGITS)
+    while n < scale:
+        width, n = width + 1, n * len(PREFIX_DIGITS)
+    return width
+
+
+def kana_prefix(replica: int, width: int) -> str:
+    """"ん" + fixed-width hiragana base-44 replica number ("" for replica 0)."""
+    if replica == 0:
+        return ""
+    digits = []
+    n = replica
+    for _ in range(width):
+        n, digit = divmod(n, len(PREFIX_DIGITS))
+        digits.append(PREFIX_DIGITS[digit])
+    return PREFIX_MARK + "".join(reversed(digits))
+
+
+def replica_id(verb_id: str, replica: int) -> str:
+    return verb_id if replica == 0 else f"{verb_id}_r{replica}"
+
+
+def load_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def generate_verbs(base: List[Dict[str, Any]], scale: int, out: Path) -> Dict[str, List[str]]:
+    """Write the scaled verbs JSONL; returns base id -> replica ids."""
+    replicas: Dict[str, List[str]] = {}
+    width = prefix_width(scale)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8") as f:
+        for r in range(scale):
+            prefix = kana_prefix(r, width)
+            for verb in base:
+                if r > 0 and verb.get("verb_class") == "irregular":
+                    continue
+                rec = verb
+                if r > 0:
+                    rec = copy.deepcopy(verb)
+                    rec["id"] = replica_id(verb["id"], r)
+                    rec["kana"] = prefix + verb["kana"]
+                    rec["kanji"] = None
+                    if isinstance(rec.get("new_conjugations"), dict):
+                        rec["new_conjugations"] = {k: prefix + v for k, v in rec["new_conjugations"].items()}
+                replicas.setdefault(verb["id"], []).append(rec["id"])
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    return replicas
+
+
+def generate_exceptions(base: Dict[str, Any], replicas: Dict[str, List[str]], scale: int) -> Dict[str, Any]:
+    data = copy.deepcopy(base)
+    ru = list(data.get("godan_ru_exceptions", []))
+    special = data.get("special_cases", {})
+    ambiguous = data.get("ambiguous_kana", {})
+    base_special = copy.deepcopy(special)
+    base_ambiguous = copy.deepcopy(ambiguous)
+    width = prefix_width(scale)
+    for r in range(1, scale):
+        prefix = kana_prefix(r, width)
+        for kana in base.get("godan_ru_exceptions", []):
+            if len(ru) < MAX_GODAN_RU_EXCEPTIONS:
+                ru.append(prefix + kana)
+        for section, mapping in base_special.items():
+            for kana, form in mapping.items():
+                special[section][prefix + kana] = prefix + form
+        for kana, ids in base_ambiguous.items():
+            # Irregular entries (ある) have no replicas and drop out here.
+            replica_ids = [replicas[i][r] for i in ids if r < len(replicas.get(i, []))]
+            if len(replica_ids) >= 2:
+                ambiguous[prefix + kana] = replica_ids
+    data["godan_ru_exceptions"] = ru
+    return data
+
+
+def generate_examples(base: Dict[str, Any], replicas: Dict[str, List[str]], scale: int) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    data = copy.deepcopy(base)
+    clamped = {"examples_per_class": 0, "overrides_per_template": 0}
+    replicated = [ids for ids in replicas.values() if len(ids) > 1]
+    for t, tpl in enumerate(data["templates"].values()):
+        for verb_class, examples in tpl["by_verb_class"].items():
+            want = len(examples) * scale
+            grown = [copy.deepcopy(examples[i % len(examples)]) for i in range(min(want, MAX_EXAMPLES_PER_CLASS))]
+            if want > MAX_EXAMPLES_PER_CLASS:
+                clamped["examples_per_class"] += 1
+            tpl["by_verb_class"][verb_class] = grown
+        overrides = tpl.get("overrides") or []
+        grown_ov = []
+        for r in range(scale):
+            for ov in overrides:
+                ids = [replicas[v][r] for v in ov["verb_ids"] if v in replicas and r < len(replicas[v])]
+                if ids:
+                    new_ov = copy.deepcopy(ov)
+                    new_ov["verb_ids"] = ids
+                    grown_ov.append(new_ov)
+            if r > 0 and replicated:
+                # One extra override per replica, rotating through verbs and templates.
+                ids = replicated[(r + t) % len(replicated)]
+                examples = next(iter(tpl["by_verb_class"].values()))
+                grown_ov.append({"verb_ids": [ids[r]], "examples": copy.deepcopy(examples[:1])})
+        if len(grown_ov) > MAX_OVERRIDES_PER_TEMPLATE:
+            clamped["overrides_per_template"] += 1
+            grown_ov = grown_ov[:MAX_OVERRIDES_PER_TEMPLATE]
+        if grown_ov or "overrides" in tpl:
+            tpl["overrides"] = grown_ov
+    return data, clamped
+
+
+def generate_learning_path(base: Dict[str, Any], scale: int) -> Dict[str, Any]:
+    data = copy.deepcopy(base)
+    stages = base["stages"]
+    grown = []
+    for r in range(scale):
+        for stage in stages:
+            if len(grown) >= MAX_STAGES:
+                break
+            new_stage = copy.deepcopy(stage)
+            if r > 0:
+                new_stage["id"] = f"{stage['id']}_r{r}"
+            grown.append(new_stage)
+    data["stages"] = grown
+    return data
+
+
+def generate(scale: int, out: Path, source: Path = ROOT) -> Dict[str, Any]:
+    """Write a synthetic tree at `out`; returns its manifest."""
+    if scale < 1:
+        raise ValueError("scale must be >= 1")
+    out.mkdir(parents=True, exist_ok=True)
+    for rel in COPIED:
+        src = source / rel
+        dst = out / rel
+        if src.is_dir():
+            shutil.copytree(src, dst, dirs_exist_ok=True)
+        elif src.exists():
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dst)
+
+    base_verbs = [json.loads(line) for line in (source / "data/verbs/verbs.v2.jsonl").read_text(encoding="utf-8").splitlines() if line.strip()]
+    replicas = generate_verbs(base_verbs, scale, out / "data/verbs/verbs.v2.jsonl")
+    verb_count = sum(len(ids) for ids in replicas.values())
+
+    exceptions = generate_exceptions(load_json(source / "data/exceptions/verb_exceptions.v1.json"), replicas, scale)
+    write_json(out / "data/exceptions/verb_exceptions.v1.json", exceptions)
+
+    examples, clamped = generate_examples(load_json(source / "data/ui_text/example_sentences.v4.json"), replicas, scale)
+    write_json(out / "data/ui_text/example_sentences.v4.json", examples)
+
+    stage_counts = {}
+    for name in ("learning_path.guided.v1.json", "learning_path.genki_aligned.v1.json"):
+        path_data = generate_learning_path(load_json(source / "data/learning_paths" / name), scale)
+        write_json(out / "data/learning_paths" / name, path_data)
+        stage_counts[name] = len(path_data["stages"])
+
+    manifest = {
+        "scale": scale,
+        "verbs": verb_count,
+        "ambiguous_kana": len(exceptions.get("ambiguous_kana", {})),
+        "godan_ru_exceptions": len(exceptions.get("godan_ru_exceptions", [])),
+        "overrides": sum(len(t.get("overrides") or []) for t in examples["templates"].values()),
+        "examples": sum(len(v) for t in examples["templates"].values() for v in t["by_verb_class"].values()),
+        "stages": stage_counts,
+        "clamped_to_schema": clamped,
+    }
+    write_json(out / "synthetic_manifest.json", manifest)
+    return manifest
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generate a schema-valid synthetic dataset tree.")
+    ap.add_argument("--scale", type=int, required=True, help=f"Size multiplier, e.g. one of {SCALES}")
+    ap.add_argument("--out", required=True, help="Output directory (created if missing)")
+    args = ap.parse_args()
+
+    try:
+        manifest = generate(args.scale, Path(args.out))
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(manifest, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Minimal HTTP/1.1 keep-alive load driver (asyncio, stdlib only).
+
+Opens `--clients` persistent connections to a local server and has each one
+request `--paths` round-robin for `--duration` seconds. It reports requests
+per second, bytes per second and p50/p99 latency. The driver parses just
+enough of each response (status line, Content-Length) to reuse the
+connection, so it measures the server rather than a client library.
+
+Usage:
+  python scripts/serve.py 8000 &
+  python scripts/bench/load.py --port 8000 --paths /index.html /data/verbs/verbs.v2.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def read_response(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one response; returns status, body size and whether the server will close."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    close = lines[0].startswith("HTTP/1.0")
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value.strip())
+        elif name == "connection":
+            close = value.strip().lower() == "close"
+    if status in (204, 304) or status < 200:
+        length = 0
+    if length:
+        await reader.readexactly(length)
+    return {"status": status, "bytes": length, "close": close}
+
+
+async def client(host: str, port: int, paths: Sequence[str], offset: int, deadline: float,
+                 headers: Dict[str, str], latencies: List[float], stats: Dict[str, int]) -> None:
+    extra = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    requests = [f"GET {p} HTTP/1.1\r\nHost: {host}:{port}\r\n{extra}\r\n".encode("latin-1") for p in paths]
+    reader: Optional[asyncio.StreamReader] = None
+    writer: Optional[asyncio.StreamWriter] = None
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+                stats["connections"] += 1
+            start = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            i += 1
+            try:
+                resp = await read_response(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                stats["errors"] += 1
+                writer.close()
+                writer = None
+                continue
+            latencies.append(time.perf_counter() - start)
+            stats["requests"] += 1
+            stats["bytes"] += resp["bytes"]
+            if resp["status"] >= 400:
+                stats["errors"] += 1
+            if resp["close"]:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def _run(host: str, port: int, paths: Sequence[str], clients: int, duration: float,
+               headers: Dict[str, str]) -> Dict[str, Any]:
+    latencies: List[float] = []
+    stats = {"requests": 0, "bytes": 0, "errors": 0, "connections": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, paths, n, deadline, headers, latencies, stats) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "clients": clients,
+        "duration_s": round(elapsed, 3),
+        "requests": stats["requests"],
+        "errors": stats["errors"],
+        "connections": stats["connections"],
+        "rps": round(stats["requests"] / elapsed, 1) if elapsed else 0.0,
+        "mb_per_s": round(stats["bytes"] / elapsed / 1e6, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_load(host: str, port: int, paths: Sequence[str], clients: int = 8, duration: float = 5.0,
+             headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Drive `paths` round-robin from `clients` keep-alive connections; returns the summary."""
+    if not paths:
+        raise ValueError("at least one path is required")
+    return asyncio.run(_run(host, port, list(paths), max(1, clients), duration, dict(headers or {})))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="HTTP/1.1 keep-alive load driver for scripts/serve.py.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--paths", nargs="+", default=["/index.html"], help="Request paths, fetched round-robin")
+    ap.add_argument("--clients", type=int, default=8, help="Concurrent connections (default: 8)")
+    ap.add_argument("--duration", type=float, default=5.0, help="Seconds to run (default: 5)")
+    ap.add_argument("--header", action="append", default=[], metavar="NAME:VALUE", help="Extra request header (repeatable)")
+    args = ap.parse_args()
+
+    headers = {}
+    for raw in args.header:
+        name, sep, value = raw.partition(":")
+        if not sep:
+            ap.error(f"--header expects NAME:VALUE, got {raw!r}")
+        headers[name.strip()] = value.strip()
+
+    print(json.dumps(run_load(args.host, args.port, args.paths, args.clients, args.duration, headers), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
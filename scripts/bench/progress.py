@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Throughput of the serve.py progress API (`--progress-db`) under many clients.
+
+Starts serve.py on a temporary SQLite store, uploads a full card store per
+simulated client (one profile each, like a first sync), then has every
+client send single-review deltas (one card + one review event) over a
+keep-alive connection for `--duration` seconds. It reports:
+
+- PATCH requests/sec and p50/p99 latency (every request is a committed write)
+- snapshot GET latency at the end of the run
+- bytes per review: a delta body vs the full-store JSON that saveCards()
+  wrote to localStorage twice per save, plus the time to serialize each
+
+Usage:
+  python scripts/bench/progress.py --clients 64 --duration 10
+  python scripts/bench/progress.py --cards 20000 --read-ratio 0.1 --out /tmp/progress.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import load  # noqa: E402
+from run import free_port, wait_for_port  # noqa: E402
+
+STAGES = ["S1", "S2", "S3", "S4", "S5", "S6"]
+
+
+def card_ids(count: Optional[int]) -> List[str]:
+    """`verb::template` ids for the shipped data; synthetic ids pad up to `count` (None: shipped size)."""
+    verbs = [json.loads(line)["id"] for line in (ROOT / "data" / "verbs" / "verbs.v2.jsonl").read_text(encoding="utf-8").splitlines() if line.strip()]
+    templates = json.loads((ROOT / "data" / "conjugations" / "conjugation_templates.v3.json").read_text(encoding="utf-8"))
+    template_ids = [t["id"] for t in templates if t.get("active") and t.get("id") != "plain_dictionary"]
+    ids = [f"{v}::{t}" for v in verbs for t in template_ids]
+    if count is None:
+        return ids
+    ids += [f"synthetic_{i:06d}::{template_ids[i % len(template_ids)]}" for i in range(max(0, count - len(ids)))]
+    return ids[:count]
+
+
+def make_card(card_id: str, rng: random.Random) -> Dict[str, Any]:
+    """A card with the same fields Core.createCard() / applyReviewResult() store."""
+    verb_id, conjugation_id = card_id.split("::")
+    stage = rng.choice(STAGES)
+    return {
+        "card_id": card_id,
+        "verb_id": verb_id,
+        "conjugation_id": conjugation_id,
+        "stage": stage,
+        "learning_step": None,
+        "due_at": "2026-10-18T09:00:00.000Z",
+        "last_reviewed_at": "2026-10-17T09:00:00.000Z",
+        "success_streak": rng.randint(0, 6),
+        "success_count_total": rng.randint(1, 20),
+        "failure_count_total": rng.randint(0, 5),
+        "hint_used_last": False,
+        "is_leech": False,
+    }
+
+
+def request_bytes(method: str, path: str, port: int, body: bytes = b"") -> bytes:
+    head = f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+    if body:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+async def client(port: int, profile: str, ids: List[str], seed: int, deadline: float, read_ratio: float,
+                 patch_latencies: List[float], read_latencies: List[float], stats: Dict[str, int]) -> None:
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    revision = 0
+    try:
+        while time.perf_counter() < deadline:
+            if read_ratio > 0 and rng.random() < read_ratio:
+                payload = request_bytes("GET", f"/api/progress?profile={profile}&since={revision}", port)
+                latencies = read_latencies
+            else:
+                card_id = rng.choice(ids)
+                correct = rng.random() < 0.85
+                patch = {
+                    "cards": {card_id: make_card(card_id, rng)},
+                    "events": [{"card_id": card_id, "at": "2026-10-17T09:00:00.000Z", "mode": "reviews",
+                                "correct": correct, "hint_used": False, "stage": "S2"}],
+                    "replace": False,
+                }
+                body = json.dumps(patch, separators=(",", ":")).encode("utf-8")
+                payload = request_bytes("PATCH", f"/api/progress?profile={profile}", port, body)
+                stats["body_bytes"] += len(body)
+                latencies = patch_latencies
+            start = time.perf_counter()
+            writer.write(payload)
+            resp = await load.read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if resp["status"] >= 400:
+                stats["errors"] += 1
+            if latencies is patch_latencies:
+                stats["patches"] += 1
+                revision += 1
+            else:
+                stats["reads"] += 1
+    finally:
+        writer.close()
+
+
+async def drive(port: int, profiles: List[str], ids: List[str], duration: float, read_ratio: float) -> Dict[str, Any]:
+    patch_latencies: List[float] = []
+    read_latencies: List[float] = []
+    stats = {"patches": 0, "reads": 0, "errors": 0, "body_bytes": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        client(port, profile, ids, n, deadline, read_ratio, patch_latencies, read_latencies, stats)
+        for n, profile in enumerate(profiles)
+    ))
+    elapsed = time.perf_counter() - start
+    patch_latencies.sort()
+    read_latencies.sort()
+    return {
+        "clients": len(profiles),
+        "duration_s": round(elapsed, 3),
+        "patches": stats["patches"],
+        "reads": stats["reads"],
+        "errors": stats["errors"],
+        "patch_rps": round(stats["patches"] / elapsed, 1) if elapsed else 0.0,
+        "patch_p50_ms": round(load.percentile(patch_latencies, 50) * 1000, 3),
+        "patch_p99_ms": round(load.percentile(patch_latencies, 99) * 1000, 3),
+        "read_p50_ms": round(load.percentile(read_latencies, 50) * 1000, 3),
+        "read_p99_ms": round(load.percentile(read_latencies, 99) * 1000, 3),
+        "avg_patch_body_bytes": round(stats["body_bytes"] / stats["patches"]) if stats["patches"] else 0,
+    }
+
+
+def timed_request(conn: http.client.HTTPConnection, method: str, path: str, body: Optional[bytes] = None) -> Dict[str, Any]:
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    start = time.perf_counter()
+    conn.request(method, path, body=body, headers=headers)
+    resp = conn.getresponse()
+    data = resp.read()
+    elapsed = time.perf_counter() - start
+    if resp.status != 200:
+        raise RuntimeError(f"{method} {path} -> {resp.status}: {data[:200]!r}")
+    return {"ms": round(elapsed * 1000, 3), "bytes": len(data)}
+
+
+def serialize_cost(store: Dict[str, Any], delta: Dict[str, Any], rounds: int = 20) -> Dict[str, float]:
+    """json.dumps time for the full store vs one delta (a stand-in for JSON.stringify in saveCards)."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        json.dumps(store, ensure_ascii=False)
+    full_ms = (time.perf_counter() - start) * 1000 / rounds
+    start = time.perf_counter()
+    for _ in range(rounds * 100):
+        json.dumps(delta, ensure_ascii=False)
+    delta_ms = (time.perf_counter() - start) * 1000 / (rounds * 100)
+    return {"full_store_ms": round(full_ms, 3), "delta_ms": round(delta_ms, 4)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the serve.py progress API with many concurrent clients.")
+    ap.add_argument("--clients", type=int, default=32, help="Concurrent keep-alive clients, one profile each (default: 32)")
+    ap.add_argument("--duration", type=float, default=5.0, help="Seconds of delta traffic (default: 5)")
+    ap.add_argument("--cards", type=int, default=None, help="Cards per profile (default: shipped verbs x active templates)")
+    ap.add_argument("--read-ratio", type=float, default=0.0, help="Share of requests that are `since` pulls (default: 0)")
+    ap.add_argument("--out", help="Write the result JSON here")
+    args = ap.parse_args()
+
+    ids = card_ids(args.cards)
+    rng = random.Random(0)
+    store = {card_id: make_card(card_id, rng) for card_id in ids}
+    replace_body = json.dumps({"cards": store, "events": [], "replace": True}, separators=(",", ":")).encode("utf-8")
+    profiles = [f"bench-{n:03d}" for n in range(max(1, args.clients))]
+
+    with tempfile.TemporaryDirectory(prefix="jsrs_progress_") as tmp:
+        port = free_port()
+        db_path = Path(tmp) / "progress.sqlite3"
+        proc = subprocess.Popen(
+            [sys.executable, str(ROOT / "scripts" / "serve.py"), str(port), "--progress-db", str(db_path)],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port)
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            uploads = [timed_request(conn, "PATCH", f"/api/progress?profile={p}", replace_body)["ms"] for p in profiles]
+            print(f"uploaded {len(ids)} cards x {len(profiles)} profiles "
+                  f"({len(replace_body) / 1e6:.2f} MB each, median {sorted(uploads)[len(uploads) // 2]:.1f} ms)", file=sys.stderr)
+
+            traffic = asyncio.run(drive(port, profiles, ids, args.duration, args.read_ratio))
+            snapshot = timed_request(conn, "GET", f"/api/progress?profile={profiles[0]}")
+            conn.close()
+        finally:
+            proc.terminate()
+            proc.wait()
+        db_bytes = sum(p.stat().st_size for p in Path(tmp).iterdir())
+
+    sample_id = ids[0]
+    delta = {"cards": {sample_id: store[sample_id]}, "events": [{"card_id": sample_id, "correct": True}], "replace": False}
+    result = {
+        "cards_per_profile": len(ids),
+        "profiles": len(profiles),
+        "full_store_bytes": len(json.dumps(store, ensure_ascii=False).encode("utf-8")),
+        "replace_upload_ms_median": sorted(uploads)[len(uploads) // 2],
+        "traffic": traffic,
+        "snapshot_get": snapshot,
+        "serialize": serialize_cost(store, delta),
+        "db_bytes": db_bytes,
+    }
+
+    t = traffic
+    print(f"{t['clients']} clients, {t['duration_s']:.1f} s: {t['patch_rps']:.0f} PATCH/s "
+          f"(p50 {t['patch_p50_ms']:.2f} ms, p99 {t['patch_p99_ms']:.2f} ms), {t['errors']} errors")
+    if t["reads"]:
+        print(f"  since pulls: {t['reads']} (p50 {t['read_p50_ms']:.2f} ms, p99 {t['read_p99_ms']:.2f} ms)")
+    print(f"bytes per review: {t['avg_patch_body_bytes']} (delta) vs {result['full_store_bytes']} x 2 (full store); "
+          f"serialize {result['serialize']['delta_ms']:.4f} ms vs {result['serialize']['full_store_ms']:.2f} ms")
+    print(f"snapshot GET of {len(ids)} cards: {snapshot['ms']:.1f} ms, {snapshot['bytes'] / 1e6:.2f} MB")
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 1 if t["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Transliteration throughput of the romaji -> kana transducer.
+
+Builds inputs of each `--lengths` size from typed answers (sokuon, ん before
+vowels and consonants, yōon, katakana, spaces) and reports characters/sec for:
+
+- python-table: romaji.RomajiTransducer (the compiled DFA)
+- python-scan : romaji.scan_romaji_to_kana (the spec rules, no table)
+- js-core     : Core.romajiToKana in node, if node is on PATH
+
+Usage:
+  python scripts/bench/romaji.py
+  python scripts/bench/romaji.py --lengths 16 1024 65536 --seconds 1 --out /tmp/romaji.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import romaji  # noqa: E402
+
+WORDS = ["kitte", "kittta", "kanpai", "kin'en", "kin en", "shinbun", "chotto", "ryokou", "gakkou",
+         "tabemasendeshita", "nyuugaku", "konnichiha", "xtsu", "KATAKANA", "カタカナ", "nomimasu", "hashitte"]
+
+JS_BENCH = """
+const Core = require(process.argv[1]);
+const [input, seconds] = [process.argv[2], Number(process.argv[3])];
+for (let i = 0; i < 5; i += 1) Core.romajiToKana(input);
+let calls = 0;
+const start = process.hrtime.bigint();
+let elapsed = 0;
+while (elapsed < seconds) {
+  for (let i = 0; i < 16; i += 1) Core.romajiToKana(input);
+  calls += 16;
+  elapsed = Number(process.hrtime.bigint() - start) / 1e9;
+}
+console.log(JSON.stringify({ calls, elapsed }));
+"""
+
+
+def make_input(length: int) -> str:
+    parts: List[str] = []
+    size = i = 0
+    while size < length:
+        word = WORDS[i % len(WORDS)] + (" " if i % 3 == 0 else "")
+        parts.append(word)
+        size += len(word)
+        i += 1
+    return "".join(parts)[:length]
+
+
+def time_python(fn: Callable[[str], str], text: str, seconds: float) -> Dict[str, float]:
+    for _ in range(3):
+        fn(text)
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        fn(text)
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return {"calls": calls, "elapsed": elapsed}
+
+
+def time_node(text: str, seconds: float) -> Dict[str, float]:
+    proc = subprocess.run(["node", "-e", JS_BENCH, str(ROOT / "src" / "core" / "index.js"), text, str(seconds)],
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Measure romaji -> kana throughput on long inputs.")
+    ap.add_argument("--lengths", type=int, nargs="+", default=[16, 256, 4096, 65536],
+                    help="Input lengths in characters (default: 16 256 4096 65536)")
+    ap.add_argument("--seconds", type=float, default=0.5, help="Time per implementation and length (default: 0.5)")
+    ap.add_argument("--out", help="Write the result JSON here")
+    args = ap.parse_args()
+
+    transducer = romaji.RomajiTransducer(romaji.compile_romaji_table(romaji.ROMAJI_MAP))
+    impls: Dict[str, Callable[[str, float], Dict[str, float]]] = {
+        "python-table": lambda text, s: time_python(transducer.romaji_to_kana, text, s),
+        "python-scan": lambda text, s: time_python(romaji.scan_romaji_to_kana, text, s),
+    }
+    if shutil.which("node"):
+        impls["js-core"] = time_node
+    else:
+        print("node not found; skipping js-core", file=sys.stderr)
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'length':>7s}" + "".join(f" {name:>14s}" for name in impls) + "   (Mchar/s)")
+    for length in args.lengths:
+        text = make_input(length)
+        if transducer.romaji_to_kana(text) != romaji.scan_romaji_to_kana(text):
+            print(f"table and scan disagree on the {length}-character input", file=sys.stderr)
+            return 1
+        row = f"{length:7d}"
+        for name, run in impls.items():
+            timing = run(text, args.seconds)
+            rate = length * timing["calls"] / timing["elapsed"]
+            results.append({"impl": name, "length": length, "chars_per_s": rate, **timing})
+            row += f" {rate / 1e6:14.2f}"
+        print(row)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({"results": results}, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
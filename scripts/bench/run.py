@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Timing harness for the Python tooling.
+
+For each `--scales` entry it generates a synthetic dataset (generate.py), then
+records wall time and peak RSS of:
+
+- validate_data.py (default mode and --stream, cache disabled)
+- conjugation.py --out (golden tests + full answer table, serialized to disk)
+
+and requests/sec, MB/s and p50/p99 latency of serve.py serving the dataset's
+data files to the keep-alive load driver (load.py), plain and with
+Accept-Encoding: gzip.
+
+Each tool runs as a child process so its peak RSS is measured on its own
+(os.wait4 where available). Results go to a JSON file stamped with the git
+commit; `--compare` prints the ratio against an earlier results file.
+
+Usage:
+  python scripts/bench/run.py --scales 1 10 100
+  python scripts/bench/run.py --scales 1 10 --compare .cache/bench/results.<old>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import generate  # noqa: E402
+import load  # noqa: E402
+
+RESULTS_FORMAT = 1
+DEFAULT_OUT_DIR = ROOT / ".cache" / "bench"
+
+LOAD_PATHS = [
+    "/data/verbs/verbs.v2.jsonl",
+    "/data/conjugations/conjugation_templates.v3.json",
+    "/data/exceptions/verb_exceptions.v1.json",
+    "/data/ui_text/example_sentences.v4.json",
+    "/data/learning_paths/learning_path.guided.v1.json",
+]
+
+# Metrics where a higher number is better (everything else: lower is better).
+HIGHER_IS_BETTER = {"rps", "mb_per_s"}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def measure(cmd: List[str], cwd: Optional[Path] = None) -> Dict[str, Any]:
+    """Run `cmd` to completion; returns wall time, peak RSS (MB) and exit code."""
+    with tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=err)
+        peak_rss_mb: Optional[float] = None
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is KiB on Linux, bytes on macOS.
+            unit = 1 if sys.platform == "darwin" else 1024
+            peak_rss_mb = round(usage.ru_maxrss * unit / 1e6, 1)
+        else:
+            proc.wait()
+        wall = time.perf_counter() - start
+        err.seek(0)
+        stderr = err.read()
+    result: Dict[str, Any] = {"wall_s": round(wall, 3), "peak_rss_mb": peak_rss_mb, "returncode": proc.returncode}
+    if proc.returncode != 0:
+        result["stderr"] = stderr.decode("utf-8", "replace")[-2000:]
+    return result
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"serve.py did not start listening on port {port}")
+
+
+def bench_serve(dataset: Path, clients: int, duration: float) -> Dict[str, Any]:
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "scripts" / "serve.py"), str(port)],
+        cwd=dataset, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        # Warm the compressed-variant cache so both runs measure steady state.
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        for path in LOAD_PATHS:
+            conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+            conn.getresponse().read()
+        conn.close()
+        return {
+            "plain": load.run_load("127.0.0.1", port, LOAD_PATHS, clients, duration),
+            "gzip": load.run_load("127.0.0.1", port, LOAD_PATHS, clients, duration, {"Accept-Encoding": "gzip"}),
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def bench_scale(scale: int, workdir: Path, clients: int, duration: float) -> Dict[str, Any]:
+    dataset = workdir / f"scale_{scale}"
+    if dataset.exists():
+        shutil.rmtree(dataset)
+    start = time.perf_counter()
+    manifest = generate.generate(scale, dataset)
+    generate_s = round(time.perf_counter() - start, 3)
+
+    validate = [sys.executable, str(ROOT / "scripts" / "validate_data.py"), "--root", str(dataset), "--no-cache"]
+    conjugation = [sys.executable, str(ROOT / "scripts" / "conjugation.py"), "--root", str(dataset),
+                   "--out", str(dataset / "answer_table.json")]
+    return {
+        "dataset": manifest,
+        "generate_s": generate_s,
+        "validate_data": measure(validate),
+        "validate_data_stream": measure(validate + ["--stream"]),
+        "conjugation_table": measure(conjugation),
+        "serve": bench_serve(dataset, clients, duration),
+    }
+
+
+def flatten(prefix: str, value: Any, out: Dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k != "dataset":
+                flatten(f"{prefix}.{k}" if prefix else k, v, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Rows of `metric old new ratio` for metrics present in both runs."""
+    old_flat: Dict[str, float] = {}
+    new_flat: Dict[str, float] = {}
+    flatten("", old.get("scales", {}), old_flat)
+    flatten("", new.get("scales", {}), new_flat)
+    rows = [f"{'metric':<48} {'old':>10} {'new':>10} {'change':>8}"]
+    for key in sorted(old_flat.keys() & new_flat.keys()):
+        leaf = key.rsplit(".", 1)[-1]
+        if leaf in {"returncode", "clients", "duration_s", "requests", "connections", "errors"}:
+            continue
+        a, b = old_flat[key], new_flat[key]
+        if a == 0:
+            continue
+        ratio = b / a
+        better = ratio > 1 if leaf in HIGHER_IS_BETTER else ratio < 1
+        mark = "+" if better else "-" if ratio != 1 else " "
+        rows.append(f"{key:<48} {a:>10.3f} {b:>10.3f} {mark}{abs(ratio - 1) * 100:>6.1f}%")
+    return rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark validate_data.py, conjugation.py and serve.py on synthetic datasets.")
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help=f"Dataset multipliers (choices include {generate.SCALES})")
+    ap.add_argument("--clients", type=int, default=8, help="Load driver connections (default: 8)")
+    ap.add_argument("--duration", type=float, default=5.0, help="Seconds per load run (default: 5)")
+    ap.add_argument("--workdir", default=None, help="Where datasets are generated (default: a temp dir, removed afterwards)")
+    ap.add_argument("--out", default=None, help="Results JSON path (default: .cache/bench/results.<commit>.json)")
+    ap.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+    args = ap.parse_args()
+
+    commit = git_commit()
+    results: Dict[str, Any] = {
+        "format": RESULTS_FORMAT,
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "load": {"clients": args.clients, "duration_s": args.duration, "paths": LOAD_PATHS},
+        "scales": {},
+    }
+
+    tmp = None if args.workdir else tempfile.TemporaryDirectory(prefix="jsrs_bench_")
+    workdir = Path(args.workdir) if args.workdir else Path(tmp.name)
+    failed = False
+    try:
+        for scale in args.scales:
+            print(f"scale {scale}x ...", file=sys.stderr, flush=True)
+            entry = bench_scale(scale, workdir, args.clients, args.duration)
+            results["scales"][str(scale)] = entry
+            for key in ("validate_data", "validate_data_stream", "conjugation_table"):
+                run = entry[key]
+                failed = failed or run["returncode"] != 0
+                print(f"  {key:<22} {run['wall_s']:>8.2f} s  {run['peak_rss_mb'] or 0:>7.1f} MB  rc={run['returncode']}", file=sys.stderr)
+            for mode, summary in entry["serve"].items():
+                print(f"  serve ({mode:<5})          {summary['rps']:>8.0f} req/s  p50 {summary['p50_ms']:.2f} ms  p99 {summary['p99_ms']:.2f} ms", file=sys.stderr)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    out = Path(args.out) if args.out else DEFAULT_OUT_DIR / f"results.{(commit or 'unknown')[:12]}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {out}")
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"\nvs {args.compare} (commit {old.get('commit')}):")
+        print("\n".join(compare(old, results)))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Font download throughput: stock SimpleHTTPRequestHandler vs scripts/serve.py.
+
+Starts both handlers on ephemeral localhost ports and downloads every font in
+public/fonts/Zen_Kaku_Gothic_New/ repeatedly, reporting MB/s per file.
+The stock handler speaks HTTP/1.0 (one connection per request, body copied
+through Python); the serve.py handler keeps the connection alive and sends
+bodies with sendfile(2). A ranged pass (second half of each file) exercises
+the resume path that the stock handler cannot serve.
+
+Usage:
+  python scripts/bench/serve_fonts.py --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import http.client
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import serve  # noqa: E402
+
+FONT_DIR = "public/fonts/Zen_Kaku_Gothic_New"
+
+
+class QuietStockHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+
+class QuietCachingHandler(serve.CachingRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+
+def start_server(handler_cls) -> Tuple[ThreadingHTTPServer, int]:
+    handler = functools.partial(handler_cls, directory=str(ROOT))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, httpd.server_address[1]
+
+
+def fetch(port: int, url: str, rounds: int, range_header: Optional[str]) -> Tuple[int, float]:
+    """Download `url` `rounds` times, reusing the connection when allowed."""
+    conn: Optional[http.client.HTTPConnection] = None
+    total = 0
+    headers = {"Range": range_header} if range_header else {}
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if conn is None:
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", url, headers=headers)
+        resp = conn.getresponse()
+        total += len(resp.read())
+        if resp.will_close:
+            conn.close()
+            conn = None
+    elapsed = time.perf_counter() - start
+    if conn is not None:
+        conn.close()
+    return total, elapsed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Compare font download throughput of the stock and serve.py handlers.")
+    ap.add_argument("--rounds", type=int, default=20, help="Downloads per file per handler (default: 20)")
+    args = ap.parse_args()
+
+    serve.register_mime_types()
+    fonts = sorted(p for p in (ROOT / FONT_DIR).iterdir() if p.suffix in (".ttf", ".woff2"))
+    if not fonts:
+        print(f"ERROR: no fonts found under {FONT_DIR}", file=sys.stderr)
+        return 1
+
+    servers: Dict[str, int] = {}
+    running: List[ThreadingHTTPServer] = []
+    for name, cls in (("stock", QuietStockHandler), ("serve.py", QuietCachingHandler)):
+        httpd, port = start_server(cls)
+        servers[name] = port
+        running.append(httpd)
+
+    print(f"{'file':40} {'size':>10} {'stock MB/s':>11} {'serve MB/s':>11} {'range MB/s':>11}")
+    totals = {"stock": [0, 0.0], "serve.py": [0, 0.0], "range": [0, 0.0]}
+    try:
+        for font in fonts:
+            url = "/" + font.relative_to(ROOT).as_posix()
+            size = font.stat().st_size
+            row = {}
+            for name, port in servers.items():
+                nbytes, secs = fetch(port, url, args.rounds, None)
+                totals[name][0] += nbytes
+                totals[name][1] += secs
+                row[name] = nbytes / secs / 1e6
+            nbytes, secs = fetch(servers["serve.py"], url, args.rounds, f"bytes={size // 2}-")
+            totals["range"][0] += nbytes
+            totals["range"][1] += secs
+            row["range"] = nbytes / secs / 1e6
+            print(f"{font.name:40} {size:>10} {row['stock']:>11.1f} {row['serve.py']:>11.1f} {row['range']:>11.1f}")
+    finally:
+        for httpd in running:
+            httpd.shutdown()
+
+    stock = totals["stock"][0] / totals["stock"][1] / 1e6
+    fast = totals["serve.py"][0] / totals["serve.py"][1] / 1e6
+    print(f"\nOverall: stock {stock:.1f} MB/s, serve.py {fast:.1f} MB/s ({fast / stock:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
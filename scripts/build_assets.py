@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# build_assets.py
+#
+# Builds the deployable site with content-hashed asset names instead of
+# hand-bumped ?v= query strings, so browsers can keep every asset forever and
+# a repeat visit only revalidates index.html.
+#
+# What it does:
+# - Copies index.html, src/, data/ and public/ into --out (default: dist/).
+# - Starting from index.html, follows every local reference:
+#   - index.html: src="..." / href="..." attributes
+#   - CSS: url(...) and @import (relative to the stylesheet)
+#   - JS: string literals naming a file under data/, src/ or public/
+#     (DATA_PATHS, DATA_BUNDLE_MANIFEST; relative to the page)
+#   and renames each referenced file to <name>.<sha256[:16]>.<ext>. A file is
+#   hashed after its own references are rewritten, so changing a font also
+#   renames styles.css. Query strings are dropped. Files that already
+#   carry a hash (data/bundle/app_data.<hash>.json) keep their name.
+# - Removes the unhashed copies of renamed files and writes
+#   asset-manifest.json (source path -> hashed path, bytes, sha256).
+# - Fails if a reference points at a missing file.
+#
+# serve.py sends `public, max-age=31536000, immutable` for hashed names
+# (FINGERPRINTED_RE) and a short max-age for HTML.
+#
+# Usage:
+#   python scripts/build_bundle.py --root .
+#   python scripts/subset_fonts.py --root .
+#   python scripts/build_assets.py --root . --out dist
+#   python scripts/serve.py 8000 --directory dist
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import sys
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set
+
+from validate_data import find_project_root
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+ASSET_MANIFEST_FORMAT = 1
+ENTRY_POINT = "index.html"
+COPY_TREES = ["src", "data", "public"]
+
+# Same pattern serve.py uses to mark a path immutable.
+FINGERPRINTED_RE = re.compile(r"\.[0-9a-f]{16}\.[A-Za-z0-9]+$")
+HTML_REF_RE = re.compile(r"""\b(src|href)=(["'])([^"']+)\2""")
+CSS_REF_RE = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+JS_REF_RE = re.compile(r"""(["'])((?:data|src|public)/[^"'?\s]+)(\?[^"'\s]*)?\1""")
+
+
+class AssetError(RuntimeError):
+    pass
+
+
+def is_local(ref: str) -> bool:
+    return bool(ref) and ":" not in ref and not ref.startswith(("#", "/", "?"))
+
+
+def hashed_name(name: str, digest: str) -> str:
+    path = PurePosixPath(name)
+    return f"{path.stem}.{digest[:16]}{path.suffix}"
+
+
+class AssetBuilder:
+    """Renames referenced files in `out` to content-hashed names, leaves first."""
+
+    def __init__(self, out: Path) -> None:
+        self.out = out
+        self.renamed: Dict[str, str] = {}  # source path -> hashed path (posix, relative to out)
+        self.records: Dict[str, Dict[str, object]] = {}
+        self.missing: List[str] = []
+        self._active: Set[str] = set()
+
+    def resolve(self, base_dir: PurePosixPath, ref: str) -> Optional[str]:
+        parts: List[str] = []
+        for part in (base_dir / ref).parts:
+            if part == "..":
+                if not parts:
+                    return None
+                parts.pop()
+            elif part != ".":
+                parts.append(part)
+        return "/".join(parts)
+
+    def rewrite_ref(self, base_dir: PurePosixPath, ref: str, where: str) -> str:
+        """`ref` with its file part replaced by the hashed name (query dropped)."""
+        path = ref.split("#", 1)[0].split("?", 1)[0]
+        rel = self.resolve(base_dir, path)
+        if rel is None or not (self.out / rel).is_file():
+            self.missing.append(f"{where}: {ref}")
+            return ref
+        hashed = self.fingerprint(rel)
+        return str(PurePosixPath(path).with_name(PurePosixPath(hashed).name))
+
+    def rewrite_text(self, rel: str, text: str) -> str:
+        base_dir = PurePosixPath(rel).parent
+        suffix = PurePosixPath(rel).suffix
+        if suffix == ".html":
+            return HTML_REF_RE.sub(
+                lambda m: f"{m.group(1)}={m.group(2)}{self.rewrite_ref(base_dir, m.group(3), rel)}{m.group(2)}"
+                if is_local(m.group(3)) else m.group(0), text)
+        if suffix == ".css":
+            return CSS_REF_RE.sub(
+                lambda m: f'url("{self.rewrite_ref(base_dir, m.group(2), rel)}")'
+                if is_local(m.group(2)) else m.group(0), text)
+        if suffix == ".js":
+            # fetch() URLs resolve against the page, not the script.
+            return JS_REF_RE.sub(
+                lambda m: f"{m.group(1)}{self.rewrite_ref(PurePosixPath('.'), m.group(2), rel)}{m.group(1)}", text)
+        return text
+
+    def process(self, rel: str) -> bytes:
+        """Rewrite the references inside `rel` (in place under out) and return its bytes."""
+        path = self.out / rel
+        body = path.read_bytes()
+        if PurePosixPath(rel).suffix in (".html", ".css", ".js"):
+            text = body.decode("utf-8")
+            rewritten = self.rewrite_text(rel, text)
+            if rewritten != text:
+                body = rewritten.encode("utf-8")
+                path.write_bytes(body)
+        return body
+
+    def fingerprint(self, rel: str) -> str:
+        if rel in self.renamed:
+            return self.renamed[rel]
+        if rel in self._active:
+            raise AssetError(f"reference cycle through {rel}")
+        self._active.add(rel)
+        body = self.process(rel)
+        self._active.discard(rel)
+        digest = hashlib.sha256(body).hexdigest()
+        name = PurePosixPath(rel).name
+        hashed = rel if FINGERPRINTED_RE.search(name) else str(PurePosixPath(rel).parent / hashed_name(name, digest))
+        if hashed != rel:
+            (self.out / rel).rename(self.out / hashed)
+        self.renamed[rel] = hashed
+        self.records[rel] = {"path": hashed, "bytes": len(body), "sha256": digest}
+        return hashed
+
+
+def build_site(root: Path, out: Path) -> Dict[str, object]:
+    target = out.resolve()
+    trees = [root / tree for tree in COPY_TREES]
+    if target == root or target in root.parents or any(target == t or t in target.parents for t in trees):
+        raise AssetError(f"refusing to build into {out}: it would replace source files")
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+    shutil.copy2(root / ENTRY_POINT, out / ENTRY_POINT)
+    for tree in COPY_TREES:
+        shutil.copytree(root / tree, out / tree, ignore=shutil.ignore_patterns("__pycache__"))
+
+    builder = AssetBuilder(out)
+    builder.process(ENTRY_POINT)
+    if builder.missing:
+        raise AssetError("missing referenced files:\n  " + "\n  ".join(builder.missing))
+    manifest = {
+        "format": ASSET_MANIFEST_FORMAT,
+        "entry": ENTRY_POINT,
+        "assets": dict(sorted(builder.records.items())),
+    }
+    (out / ASSET_MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build the deployable site with content-hashed asset names.")
+    ap.add_argument("--root", default=".", help="Project root containing index.html, src/, data/ and public/ (default: current dir)")
+    ap.add_argument("--out", default="dist", help="Output directory, replaced on every build (default: dist)")
+    args = ap.parse_args()
+
+    root = find_project_root(Path(args.root))
+    out = Path(args.out)
+    if not out.is_absolute():
+        out = root / out
+    try:
+        manifest = build_site(root, out)
+    except AssetError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        if "data/bundle/" in str(e) or "fonts/subset/" in str(e):
+            print("Run scripts/build_bundle.py and scripts/subset_fonts.py first.", file=sys.stderr)
+        return 1
+    assets = manifest["assets"]
+    renamed = sum(1 for src, rec in assets.items() if rec["path"] != src)
+    total = sum(rec["bytes"] for rec in assets.values())
+    print(f"Wrote {out} ({len(assets)} referenced assets, {renamed} renamed, {total} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
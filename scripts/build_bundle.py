@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# build_bundle.py
+#
+# Compiles the app's startup datasets into one minified, content-hashed JSON
+# bundle so init() can load everything with a single request.
+#
+# What it does:
+# - Runs the full validate_data.py check suite first; any ERROR aborts the build.
+# - Reads:
+#   - data/verbs/verbs.v2.jsonl (parsed into an array)
+#   - data/conjugations/conjugation_templates.v3.json
+#   - data/exceptions/verb_exceptions.v1.json
+#   - data/ui_text/rule_hints.v3.json
+#   - data/ui_text/example_sentences.v4.json
+#   - data/ui_text/furigana.verbs.v2.v1.json
+#   - data/learning_paths/learning_path.guided.v1.json
+#   - data/learning_paths/learning_path.genki_aligned.v1.json
+# - Adds the precomputed verb x template answer table from conjugation.py
+#   (after replaying the golden conjugation tests against the Python port).
+# - Adds the precompiled verb x template example-sentence index from
+#   example_index.py (after replaying tests/example_index_cases.v2.json, a
+#   fixture recorded from Core.resolveExampleSentence).
+# - Refuses to build if public/fonts/subset/ exists and lacks a character the
+#   data uses (see subset_fonts.py).
+# - Writes:
+#   - data/bundle/app_data.<sha256[:16]>.json (immutable; safe to cache forever)
+#   - data/bundle/manifest.json (small, always revalidated; points at the bundle)
+# - Removes bundles from earlier builds.
+#
+# Usage:
+#   python scripts/build_bundle.py --root .
+#
+# Requirements:
+#   pip install jsonschema
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from conjugation import build_answer_table, run_golden_tests
+from data_sources import SOURCES, load_jsonl, source_path
+from example_index import build_example_index, lexicon_problems, run_cases
+from subset_fonts import check_font_coverage
+from validate_data import find_project_root, load_json, print_report, run_checks
+
+BUNDLE_FORMAT = 1
+BUNDLE_DIR = Path("data") / "bundle"
+MANIFEST_NAME = "manifest.json"
+
+def dump_minified(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=False).encode("utf-8")
+
+def build_bundle(root: Path) -> Tuple[bytes, Dict[str, Any]]:
+    """Return the bundle bytes and the per-source manifest entries."""
+    bundle: Dict[str, Any] = {"format": BUNDLE_FORMAT}
+    sources: Dict[str, Any] = {}
+    for key, rel, kind in SOURCES:
+        path = root / rel
+        raw = path.read_bytes()
+        bundle[key] = load_jsonl(path) if kind == "jsonl" else load_json(path)
+        sources[key] = {
+            "path": rel,
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "bytes": len(raw),
+        }
+    bundle["answers"] = build_answer_table(bundle["verbs"], bundle["templates"], bundle["exceptions"])
+    bundle["example_index"] = build_example_index(bundle["verbs"], bundle["templates"], bundle["example_sentences"])
+    return dump_minified(bundle), sources
+
+def write_bundle(root: Path, body: bytes, sources: Dict[str, Any]) -> Path:
+    out_dir = root / BUNDLE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(body).hexdigest()
+    name = f"app_data.{digest[:16]}.json"
+    bundle_path = out_dir / name
+
+    if not bundle_path.exists() or bundle_path.read_bytes() != body:
+        bundle_path.write_bytes(body)
+    for stale in out_dir.glob("app_data.*.json"):
+        if stale.name != name:
+            stale.unlink()
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "bundle": (BUNDLE_DIR / name).as_posix(),
+        "sha256": digest,
+        "bytes": len(body),
+        "sources": sources,
+    }
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return bundle_path
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build the single-request data bundle for the Japanese SRS App.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'schemas/' (default: current dir)")
+    ap.add_argument("--skip-validation", action="store_true", help="Bundle without running validate_data checks")
+    args = ap.parse_args()
+
+    root = find_project_root(Path(args.root))
+
+    if not args.skip_validation:
+        issues, verbs_count = run_checks(root)
+        if any(i.severity == "ERROR" for i in issues):
+            print_report(issues, verbs_count=verbs_count)
+            print("\nBundle not written: fix the errors above first.", file=sys.stderr)
+            return 1
+
+        verbs_by_id = {v.get("id"): v for v in load_jsonl(source_path(root, "verbs"))}
+        failures = run_golden_tests(root, verbs_by_id, load_json(source_path(root, "exceptions")))
+        for msg in failures:
+            print(f"[FAIL ] {msg}", file=sys.stderr)
+        if failures:
+            print("\nBundle not written: the conjugation port disagrees with the golden tests.", file=sys.stderr)
+            return 1
+
+        problems = lexicon_problems(load_json(source_path(root, "example_sentences")))
+        if not problems:
+            _, problems = run_cases(root)
+        for msg in problems:
+            print(f"[FAIL ] {msg}", file=sys.stderr)
+        if problems:
+            print("\nBundle not written: the example index disagrees with Core.resolveExampleSentence.", file=sys.stderr)
+            return 1
+
+        missing_glyphs = check_font_coverage(root)
+        for msg in missing_glyphs:
+            print(f"[ERROR] {msg}", file=sys.stderr)
+        if missing_glyphs:
+            print("\nBundle not written: rerun scripts/subset_fonts.py so the fonts cover the data.", file=sys.stderr)
+            return 1
+
+    body, sources = build_bundle(root)
+    bundle_path = write_bundle(root, body, sources)
+    source_bytes = sum(s["bytes"] for s in sources.values())
+    print(f"Wrote {bundle_path.relative_to(root).as_posix()} ({len(body)} bytes from {len(sources)} files, {source_bytes} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# cohort_report.py
+#
+# Cohort-wide analytics over many exported progress backups (the JSON written
+# by buildBackupPayload in src/app.js: {version, exported_at, data: {cards,
+# settings, stats}}).
+#
+# What it reports:
+# - Mistake patterns by template and by verb class, scored like
+#   getTopMistakePatterns: a card counts once it has >= 4 answers and >= 2
+#   misses; score = misses * 1.5 + error rate * 10 (+5 for leeches).
+# - Stage distribution (LEARNING, S1-S6, RETIRED) overall and per template.
+# - Accuracy by template and verb class from the cards' lifetime
+#   success/failure totals.
+# - Learners per learning path.
+# Dictionary-form cards are skipped, as in filterCardStore.
+#
+# Each backup is parsed by one worker (--jobs) and reduced to a small
+# per-file summary; only summaries come back to the parent, and at most a
+# few files per worker are in flight, so memory does not grow with the
+# cohort. Summaries are cached in .cache/cohort_report.json by the SHA-256 of
+# the file, so a rerun only parses new backups. The cache is dropped when this
+# script or the verbs file changes. Byte-identical backups are counted once.
+#
+# Usage:
+#   python scripts/cohort_report.py backups/
+#   python scripts/cohort_report.py backups/*.json --jobs 4 --top 15 --out /tmp/cohort.json
+#   python scripts/cohort_report.py backups/ --no-cache
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_sources import load_jsonl, source_path
+from validate_data import find_project_root, load_json
+
+DEFAULT_CACHE_PATH = Path(".cache") / "cohort_report.json"
+STAGE_ORDER = ["LEARNING", "S1", "S2", "S3", "S4", "S5", "S6", "RETIRED"]
+DICTIONARY_TEMPLATE_ID = "plain_dictionary"
+
+# Mirrors of the getTopMistakePatterns constants in src/app.js.
+MISTAKE_MIN_ATTEMPTS = 4
+MISTAKE_MIN_MISSES = 2
+MISTAKE_FAIL_WEIGHT = 1.5
+MISTAKE_ERROR_WEIGHT = 10
+MISTAKE_LEECH_BONUS = 5
+
+# Backups in flight per worker process.
+IN_FLIGHT_PER_JOB = 4
+
+_VERB_CLASSES: Dict[str, str] = {}
+
+
+def _init_worker(verb_classes: Dict[str, str]) -> None:
+    global _VERB_CLASSES
+    _VERB_CLASSES = verb_classes
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def card_count(card: Dict[str, Any], key: str) -> int:
+    """A lifetime counter of a card; ValueError (not TypeError) when it is not a number."""
+    value = card.get(key) or 0
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Card {key} is not a number: {value!r}")
+    try:
+        return int(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f"Card {key} is not a number: {value!r}") from None
+
+
+def score_mistake(card: Dict[str, Any]) -> Optional[Tuple[float, int]]:
+    """(score, misses) like scoreMistake in src/app.js, or None below the thresholds."""
+    success = card_count(card, "success_count_total")
+    failure = card_count(card, "failure_count_total")
+    attempts = success + failure
+    if attempts < MISTAKE_MIN_ATTEMPTS or failure < MISTAKE_MIN_MISSES:
+        return None
+    score = failure * MISTAKE_FAIL_WEIGHT + failure / attempts * MISTAKE_ERROR_WEIGHT
+    if card.get("is_leech"):
+        score += MISTAKE_LEECH_BONUS
+    return score, failure
+
+
+def empty_group() -> Dict[str, Any]:
+    return {"cards": 0, "success": 0, "failure": 0, "leeches": 0,
+            "mistake_cards": 0, "mistake_misses": 0, "mistake_score": 0.0, "stages": {}}
+
+
+def add_card(group: Dict[str, Any], card: Dict[str, Any], stage: str, mistake: Optional[Tuple[float, int]]) -> None:
+    group["cards"] += 1
+    group["success"] += card_count(card, "success_count_total")
+    group["failure"] += card_count(card, "failure_count_total")
+    group["leeches"] += 1 if card.get("is_leech") else 0
+    group["stages"][stage] = group["stages"].get(stage, 0) + 1
+    if mistake is not None:
+        group["mistake_cards"] += 1
+        group["mistake_score"] += mistake[0]
+        group["mistake_misses"] += mistake[1]
+
+
+def summarize_backup(payload: Any, verb_classes: Dict[str, str]) -> Dict[str, Any]:
+    """Per-learner counts for one parsed backup; raises ValueError like applyImportedData."""
+    data = payload.get("data") if isinstance(payload, dict) and "data" in payload else payload
+    if not isinstance(data, dict):
+        raise ValueError("Invalid backup format.")
+    cards, settings, stats = data.get("cards"), data.get("settings"), data.get("stats")
+    if not isinstance(cards, dict) or not isinstance(settings, dict) or not isinstance(stats, dict):
+        raise ValueError("Backup missing required data.")
+    learning_path = settings.get("learning_path") or "guided"
+    if not isinstance(learning_path, str):
+        raise ValueError(f"Invalid learning_path: {learning_path!r}")
+
+    templates: Dict[str, Dict[str, Any]] = {}
+    classes: Dict[str, Dict[str, Any]] = {}
+    stages: Counter = Counter()
+    count = 0
+    for card in cards.values():
+        if not isinstance(card, dict) or card.get("conjugation_id") == DICTIONARY_TEMPLATE_ID:
+            continue
+        template_id = str(card.get("conjugation_id"))
+        verb_id = card.get("verb_id")
+        verb_class = verb_classes.get(verb_id, "unknown") if isinstance(verb_id, str) else "unknown"
+        stage = card.get("stage") if card.get("stage") in STAGE_ORDER else "unknown"
+        mistake = score_mistake(card)
+        add_card(templates.setdefault(template_id, empty_group()), card, stage, mistake)
+        add_card(classes.setdefault(verb_class, empty_group()), card, stage, mistake)
+        stages[stage] += 1
+        count += 1
+    return {
+        "learning_path": learning_path,
+        "cards": count,
+        "stages": dict(stages),
+        "templates": templates,
+        "classes": classes,
+    }
+
+
+def summarize_file(path: str) -> Dict[str, Any]:
+    """Worker entry point: one file in, one summary (or {"error": ...}) out.
+
+    Backups are user-supplied, so any malformed content is reported, not raised.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        return summarize_backup(payload, _VERB_CLASSES)
+    except (OSError, ValueError, TypeError, RecursionError) as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def iter_summaries(paths: List[Path], jobs: int, verb_classes: Dict[str, str]) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    """(path, summary) as workers finish, with a bounded number of files in flight."""
+    if jobs <= 1 or len(paths) <= 1:
+        _init_worker(verb_classes)
+        for path in paths:
+            yield path, summarize_file(str(path))
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(verb_classes,)) as pool:
+        todo = iter(paths)
+        pending = {pool.submit(summarize_file, str(p)): p for p in islice(todo, jobs * IN_FLIGHT_PER_JOB)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+                for path in islice(todo, 1):
+                    pending[pool.submit(summarize_file, str(path))] = path
+
+
+class SummaryCache:
+    """Per-file summaries keyed by file SHA-256, valid for one analysis digest."""
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[Path], analysis: str) -> None:
+        self.path = path
+        self.analysis = analysis
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if path is not None and path.exists():
+            try:
+                data = load_json(path)
+                if data.get("version") == self.VERSION and data.get("analysis") == analysis:
+                    self.entries = data.get("entries") or {}
+            except Exception:
+                self.entries = {}
+
+    def store(self, digest: str, summary: Dict[str, Any]) -> None:
+        self.entries[digest] = summary
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "analysis": self.analysis, "entries": self.entries},
+                                  ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+        self.dirty = False
+
+
+def find_backups(inputs: Iterable[str]) -> List[Path]:
+    found: List[Path] = []
+    for item in inputs:
+        path = Path(item)
+        found.extend(sorted(path.rglob("*.json")) if path.is_dir() else [path])
+    return found
+
+
+def merge_group(into: Dict[str, Any], group: Dict[str, Any]) -> None:
+    for key in ("cards", "success", "failure", "leeches", "mistake_cards", "mistake_misses", "mistake_score"):
+        into[key] += group[key]
+    into["learners"] = into.get("learners", 0) + 1
+    into["learners_with_mistakes"] = into.get("learners_with_mistakes", 0) + (1 if group["mistake_cards"] else 0)
+    for stage, n in group["stages"].items():
+        into["stages"][stage] = into["stages"].get(stage, 0) + n
+
+
+def aggregate(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    cohort: Dict[str, Any] = {"learners": 0, "cards": 0, "stages": {}, "paths": {}, "templates": {}, "classes": {}}
+    for summary in summaries:
+        cohort["learners"] += 1
+        cohort["cards"] += summary["cards"]
+        cohort["paths"][summary["learning_path"]] = cohort["paths"].get(summary["learning_path"], 0) + 1
+        for stage, n in summary["stages"].items():
+            cohort["stages"][stage] = cohort["stages"].get(stage, 0) + n
+        for kind in ("templates", "classes"):
+            for key, group in summary[kind].items():
+                merge_group(cohort[kind].setdefault(key, empty_group()), group)
+    for kind in ("templates", "classes"):
+        for group in cohort[kind].values():
+            answered = group["success"] + group["failure"]
+            group["answered"] = answered
+            group["accuracy"] = group["success"] / answered if answered else None
+            group["mistake_score"] = round(group["mistake_score"], 3)
+    return cohort
+
+
+def analysis_digest(root: Path) -> str:
+    """Summaries depend on this script and on the verb -> class map."""
+    h = hashlib.sha256(Path(__file__).read_bytes())
+    h.update(source_path(root, "verbs").read_bytes())
+    return h.hexdigest()
+
+
+def print_report(cohort: Dict[str, Any], labels: Dict[str, str], top: int, min_answers: int) -> None:
+    print(f"\n{cohort['learners']} learners, {cohort['cards']} cards; paths: "
+          + ", ".join(f"{k} {v}" for k, v in sorted(cohort["paths"].items())))
+
+    for kind, title in (("templates", "template"), ("classes", "verb class")):
+        ranked = sorted(cohort[kind].items(), key=lambda kv: -kv[1]["mistake_score"])
+        ranked = [(k, g) for k, g in ranked if g["mistake_cards"]][:top]
+        print(f"\nMistake patterns by {title} (top {top}):")
+        print(f"  {'':38s} {'score':>10s} {'cards':>7s} {'misses':>7s} {'learners':>9s}")
+        for key, g in ranked:
+            print(f"  {labels.get(key, key)[:38]:38s} {g['mistake_score']:10.1f} {g['mistake_cards']:7d} "
+                  f"{g['mistake_misses']:7d} {g['learners_with_mistakes']:4d}/{g['learners']:<4d}")
+
+    total = sum(cohort["stages"].values()) or 1
+    print("\nStage distribution:")
+    for stage in STAGE_ORDER + sorted(set(cohort["stages"]) - set(STAGE_ORDER)):
+        n = cohort["stages"].get(stage, 0)
+        if n:
+            print(f"  {stage:9s} {n:9d} {n / total:6.1%}")
+
+    # Templates with no answers have no accuracy, whatever --min-answers says.
+    rows = [(k, g) for k, g in cohort["templates"].items() if g["answered"] >= max(1, min_answers)]
+    print(f"\nAccuracy by template (lowest first, >= {min_answers} answers):")
+    for key, g in sorted(rows, key=lambda kv: kv[1]["accuracy"]):
+        stages = g["stages"]
+        mature = sum(stages.get(s, 0) for s in ("S3", "S4", "S5", "S6", "RETIRED"))
+        print(f"  {labels.get(key, key)[:38]:38s} {g['accuracy']:6.1%} of {g['answered']:8d}  "
+              f"{g['cards']:7d} cards, {mature / g['cards']:5.1%} S3+")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Cohort analytics over exported progress backups.")
+    ap.add_argument("backups", nargs="+", help="Backup JSON files or directories (searched for *.json)")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'schemas/' (default: current dir)")
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes parsing backups (default: 1, serial)")
+    ap.add_argument("--cache-file", default=None, help="Summary cache path (default: <root>/.cache/cohort_report.json)")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not update the summary cache")
+    ap.add_argument("--top", type=int, default=10, help="Mistake patterns listed per grouping (default: 10)")
+    ap.add_argument("--min-answers", type=int, default=20, help="Hide templates with fewer answers from the accuracy table (default: 20)")
+    ap.add_argument("--out", help="Write the full cohort JSON here")
+    args = ap.parse_args()
+    for flag, value in (("--top", args.top), ("--min-answers", args.min_answers)):
+        if value < 0:
+            ap.error(f"{flag} must be >= 0, got {value}")
+
+    root = find_project_root(Path(args.root))
+    verbs = load_jsonl(source_path(root, "verbs"))
+    verb_classes = {v.get("id"): v.get("verb_class") or "unknown" for v in verbs}
+    labels = {t.get("id"): t.get("label") or t.get("id") for t in load_json(source_path(root, "templates"))}
+    cache = SummaryCache(None if args.no_cache else Path(args.cache_file) if args.cache_file else root / DEFAULT_CACHE_PATH,
+                         analysis_digest(root))
+
+    paths = find_backups(args.backups)
+    digests: Dict[str, Path] = {}
+    duplicates = 0
+    for path in paths:
+        try:
+            digest = file_sha256(path)
+        except OSError as e:
+            print(f"[WARN ] {path}: {e}", file=sys.stderr)
+            continue
+        if digest in digests:
+            duplicates += 1
+        else:
+            digests[digest] = path
+    new = [(d, p) for d, p in digests.items() if d not in cache.entries]
+    by_path = {p: d for d, p in new}
+    try:
+        for path, summary in iter_summaries([p for _, p in new], max(1, args.jobs), verb_classes):
+            cache.store(by_path[path], summary)
+    finally:
+        cache.save()
+
+    summaries = []
+    errors = 0
+    for digest, path in digests.items():
+        summary = cache.entries[digest]
+        if "error" in summary:
+            errors += 1
+            print(f"[WARN ] {path}: {summary['error']}", file=sys.stderr)
+        else:
+            summaries.append(summary)
+    print(f"{len(paths)} backup files: {len(new)} parsed, {len(digests) - len(new)} from cache, "
+          f"{duplicates} duplicate, {errors} unreadable")
+    cohort = aggregate(summaries)
+    print_report(cohort, labels, args.top, args.min_answers)
+    if args.out:
+        Path(args.out).write_text(json.dumps(cohort, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
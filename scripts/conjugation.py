@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# conjugation.py
+#
+# Python port of `conjugate` / `conjugateAccepted` from src/core/index.js, plus
+# a builder for a precomputed verb x template answer table.
+#
+# The port must stay byte-for-byte equivalent to the JS engine (see
+# docs/CONJUGATION_SPEC.md). Every table build first replays
+# tests/conjugation_golden_tests.v1.json and v2.json and refuses to write
+# output if any case disagrees.
+#
+# Table layout (compact, indexed):
+#   {
+#     "format": 1,
+#     "verb_ids": [...],          # row index -> verb id (verbs file order)
+#     "template_ids": [...],      # column index -> template id (templates file order)
+#     "answers": [...],           # row-major; answers[row * len(template_ids) + col]
+#                                 # is the canonical kana, or null if unsupported
+#     "accepted": {"<flat>": [...]}  # only cells with more than one accepted answer
+#   }
+#
+# Usage:
+#   python scripts/conjugation.py --root . --check
+#   python scripts/conjugation.py --root . --out answers.json
+#   python scripts/conjugation.py --root . --verbs temp/big.jsonl --out /tmp/answers.json
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ANSWER_TABLE_FORMAT = 1
+
+VERBS_PATH = Path("data") / "verbs" / "verbs.v2.jsonl"
+TEMPLATES_PATH = Path("data") / "conjugations" / "conjugation_templates.v3.json"
+EXCEPTIONS_PATH = Path("data") / "exceptions" / "verb_exceptions.v1.json"
+GOLDEN_TEST_PATHS = [
+    Path("tests") / "conjugation_golden_tests.v1.json",
+    Path("tests") / "conjugation_golden_tests.v2.json",
+]
+
+class ConjugationError(ValueError):
+    """Raised where the JS engine throws (unsupported class/template/ending)."""
+
+A_ROW = {"う": "わ", "く": "か", "ぐ": "が", "す": "さ", "つ": "た", "ぬ": "な", "ぶ": "ば", "む": "ま", "る": "ら"}
+I_ROW = {"う": "い", "く": "き", "ぐ": "ぎ", "す": "し", "つ": "ち", "ぬ": "に", "ぶ": "び", "む": "み", "る": "り"}
+E_ROW = {"う": "え", "く": "け", "ぐ": "げ", "す": "せ", "つ": "て", "ぬ": "ね", "ぶ": "べ", "む": "め", "る": "れ"}
+
+IRREGULAR_TABLE: Dict[str, Dict[str, str]] = {
+    "する": {
+        "plain_dictionary": "する",
+        "plain_negative": "しない",
+        "plain_past": "した",
+        "plain_past_negative": "しなかった",
+        "plain_te_form": "して",
+        "polite_dictionary": "します",
+        "polite_negative": "しません",
+        "polite_past": "しました",
+        "polite_past_negative": "しませんでした",
+        "polite_te_form": "してください",
+    },
+    "くる": {
+        "plain_dictionary": "くる",
+        "plain_negative": "こない",
+        "plain_past": "きた",
+        "plain_past_negative": "こなかった",
+        "plain_te_form": "きて",
+        "polite_dictionary": "きます",
+        "polite_negative": "きません",
+        "polite_past": "きました",
+        "polite_past_negative": "きませんでした",
+        "polite_te_form": "きてください",
+    },
+    "ある": {
+        "plain_dictionary": "ある",
+        "plain_negative": "ない",
+        "plain_past": "あった",
+        "plain_past_negative": "なかった",
+        "plain_te_form": "あって",
+        "polite_dictionary": "あります",
+        "polite_negative": "ありません",
+        "polite_past": "ありました",
+        "polite_past_negative": "ありませんでした",
+        "polite_te_form": "あってください",
+    },
+}
+
+# Irregular forms that are spelled out per verb rather than derived.
+IRREGULAR_FIXED: Dict[str, Dict[str, str]] = {
+    "plain_passive": {"する": "される", "くる": "こられる", "ある": "あられる"},
+    "plain_causative": {"する": "させる", "くる": "こさせる", "ある": "あらせる"},
+    "plain_causative_passive": {"する": "させられる", "くる": "こさせられる", "ある": "あらせられる"},
+    "plain_ba_conditional": {"する": "すれば", "くる": "くれば", "ある": "あれば"},
+    "plain_imperative": {"する": "しろ", "くる": "こい", "ある": "あれ"},
+}
+IRREGULAR_STEMS = {"する": "し", "くる": "き", "ある": "あり"}
+
+TE_IRU_SUFFIXES = {
+    "plain_te_iru": "いる",
+    "polite_te_imasu": "います",
+    "polite_te_imasen": "いません",
+    "polite_te_imashita": "いました",
+    "polite_te_imasen_deshita": "いませんでした",
+}
+
+ICHIDAN_STEM_SUFFIXES = {
+    "plain_negative": "ない",
+    "plain_past": "た",
+    "plain_past_negative": "なかった",
+    "plain_te_form": "て",
+    "polite_dictionary": "ます",
+    "polite_negative": "ません",
+    "polite_past": "ました",
+    "polite_past_negative": "ませんでした",
+    "polite_te_form": "てください",
+    "plain_passive": "られる",
+    "plain_causative": "させる",
+    "plain_causative_passive": "させられる",
+    "plain_ba_conditional": "れば",
+    "plain_tara_conditional": "たら",
+    "plain_tari_sequence": "たりする",
+    "plain_imperative": "ろ",
+    "plain_te_oku": "ておく",
+    "plain_te_shimau": "てしまう",
+    "plain_nagara": "ながら",
+    "plain_yasui": "やすい",
+    "plain_nikui": "にくい",
+    "polite_nasai": "なさい",
+    "plain_nakereba_ikenai": "なければいけない",
+    "plain_nakute_mo_ii": "なくてもいい",
+}
+
+def _replace_nai(negative: str, suffix: str) -> str:
+    """JS `negative.replace(/ない$/, suffix)`."""
+    if negative.endswith("ない"):
+        return negative[:-2] + suffix
+    return negative
+
+def _row(row: Dict[str, str], last: str) -> str:
+    value = row.get(last)
+    if value is None:
+        raise ConjugationError(f"Unsupported godan ending: {last}")
+    return value
+
+def godan_past(base: str, last: str) -> str:
+    if last in ("う", "つ", "る"):
+        return base + "った"
+    if last in ("ぶ", "む", "ぬ"):
+        return base + "んだ"
+    if last == "く":
+        return base + "いた"
+    if last == "ぐ":
+        return base + "いだ"
+    if last == "す":
+        return base + "した"
+    raise ConjugationError(f"Unsupported godan ending for past: {last}")
+
+def godan_te(base: str, last: str) -> str:
+    if last in ("う", "つ", "る"):
+        return base + "って"
+    if last in ("ぶ", "む", "ぬ"):
+        return base + "んで"
+    if last == "く":
+        return base + "いて"
+    if last == "ぐ":
+        return base + "いで"
+    if last == "す":
+        return base + "して"
+    raise ConjugationError(f"Unsupported godan ending for te-form: {last}")
+
+def apply_special_case(template_id: str, kana: str, exceptions: Optional[Dict[str, Any]], generated: str) -> str:
+    special = (exceptions or {}).get("special_cases") or {}
+    if template_id == "plain_te_form":
+        return (special.get("te_form") or {}).get(kana) or generated
+    if template_id == "plain_past":
+        return (special.get("plain_past") or {}).get(kana) or generated
+    return generated
+
+def conjugate_ichidan(kana: str, template_id: str) -> str:
+    stem = kana[:-1]
+    if template_id == "plain_dictionary":
+        return kana
+    if template_id == "plain_prohibitive":
+        return kana + "な"
+    suffix = ICHIDAN_STEM_SUFFIXES.get(template_id)
+    if suffix is None:
+        raise ConjugationError(f"Unsupported template: {template_id}")
+    return stem + suffix
+
+def conjugate_godan(kana: str, template_id: str, exceptions: Optional[Dict[str, Any]]) -> str:
+    last = kana[-1:]
+    base = kana[:-1]
+
+    def te() -> str:
+        return apply_special_case("plain_te_form", kana, exceptions, godan_te(base, last))
+
+    def past() -> str:
+        return apply_special_case("plain_past", kana, exceptions, godan_past(base, last))
+
+    if template_id == "plain_dictionary":
+        return kana
+    if template_id == "plain_negative":
+        return base + _row(A_ROW, last) + "ない"
+    if template_id == "plain_past":
+        return past()
+    if template_id == "plain_past_negative":
+        return _replace_nai(base + _row(A_ROW, last) + "ない", "なかった")
+    if template_id == "plain_te_form":
+        return te()
+    if template_id == "polite_dictionary":
+        return base + _row(I_ROW, last) + "ます"
+    if template_id == "polite_negative":
+        return base + _row(I_ROW, last) + "ません"
+    if template_id == "polite_past":
+        return base + _row(I_ROW, last) + "ました"
+    if template_id == "polite_past_negative":
+        return base + _row(I_ROW, last) + "ませんでした"
+    if template_id == "polite_te_form":
+        return te() + "ください"
+    if template_id == "plain_passive":
+        return base + _row(A_ROW, last) + "れる"
+    if template_id == "plain_causative":
+        return base + _row(A_ROW, last) + "せる"
+    if template_id == "plain_causative_passive":
+        return base + _row(A_ROW, last) + "せられる"
+    if template_id == "plain_ba_conditional":
+        return base + _row(E_ROW, last) + "ば"
+    if template_id == "plain_tara_conditional":
+        return past() + "ら"
+    if template_id == "plain_tari_sequence":
+        return past() + "りする"
+    if template_id == "plain_imperative":
+        return base + _row(E_ROW, last)
+    if template_id == "plain_prohibitive":
+        return kana + "な"
+    if template_id == "plain_te_oku":
+        return te() + "おく"
+    if template_id == "plain_te_shimau":
+        return te() + "しまう"
+    if template_id == "plain_nagara":
+        return base + _row(I_ROW, last) + "ながら"
+    if template_id == "plain_yasui":
+        return base + _row(I_ROW, last) + "やすい"
+    if template_id == "plain_nikui":
+        return base + _row(I_ROW, last) + "にくい"
+    if template_id == "polite_nasai":
+        return base + _row(I_ROW, last) + "なさい"
+    if template_id == "plain_nakereba_ikenai":
+        return _replace_nai(base + _row(A_ROW, last) + "ない", "なければいけない")
+    if template_id == "plain_nakute_mo_ii":
+        return _replace_nai(base + _row(A_ROW, last) + "ない", "なくてもいい")
+    raise ConjugationError(f"Unsupported template: {template_id}")
+
+def conjugate_irregular(verb: Dict[str, Any], template_id: str, exceptions: Optional[Dict[str, Any]]) -> str:
+    kana = verb.get("kana")
+    table = IRREGULAR_TABLE.get(kana)
+    if table is None:
+        raise ConjugationError(f"Irregular table missing for kana: {kana}")
+    if template_id in table:
+        return table[template_id]
+
+    fixed = IRREGULAR_FIXED.get(template_id)
+    if fixed is not None and kana in fixed:
+        return fixed[kana]
+    if template_id == "plain_prohibitive":
+        return kana + "な"
+    if template_id in ("plain_tara_conditional", "plain_tari_sequence"):
+        past = conjugate(verb, "plain_past", exceptions)
+        return past + ("ら" if template_id == "plain_tara_conditional" else "りする")
+    if template_id in ("plain_te_oku", "plain_te_shimau"):
+        te = conjugate(verb, "plain_te_form", exceptions)
+        return te + ("おく" if template_id == "plain_te_oku" else "しまう")
+    if template_id in ("plain_nagara", "plain_yasui", "plain_nikui", "polite_nasai"):
+        stem = IRREGULAR_STEMS.get(kana)
+        if stem is None:
+            polite = conjugate(verb, "polite_dictionary", exceptions)
+            stem = polite[:-2] if polite.endswith("ます") else polite
+        return stem + {
+            "plain_nagara": "ながら",
+            "plain_yasui": "やすい",
+            "plain_nikui": "にくい",
+            "polite_nasai": "なさい",
+        }[template_id]
+    if template_id in ("plain_nakereba_ikenai", "plain_nakute_mo_ii"):
+        negative = conjugate(verb, "plain_negative", exceptions)
+        return _replace_nai(negative, "なければいけない" if template_id == "plain_nakereba_ikenai" else "なくてもいい")
+    raise ConjugationError(f"Unsupported template for irregular: {template_id}")
+
+def conjugate(verb: Optional[Dict[str, Any]], template_id: str, exceptions: Optional[Dict[str, Any]]) -> str:
+    """Canonical kana answer for (verb, template); mirrors Core.conjugate."""
+    if not verb:
+        raise ConjugationError("Missing verb record.")
+    kana = verb.get("kana")
+    verb_class = verb.get("verb_class")
+    manual = (verb.get("new_conjugations") or {}).get(template_id)
+    if isinstance(manual, str) and manual:
+        return manual
+
+    suffix = TE_IRU_SUFFIXES.get(template_id)
+    if suffix is not None:
+        return conjugate(verb, "plain_te_form", exceptions) + suffix
+
+    if verb_class == "irregular":
+        return conjugate_irregular(verb, template_id, exceptions)
+
+    if verb_class == "ichidan":
+        base = conjugate_ichidan(kana, template_id)
+        if template_id in ("plain_te_form", "plain_past"):
+            return apply_special_case(template_id, kana, exceptions, base)
+        if template_id == "polite_te_form":
+            te = apply_special_case("plain_te_form", kana, exceptions, conjugate_ichidan(kana, "plain_te_form"))
+            return te + "ください"
+        return base
+
+    if verb_class == "godan":
+        return conjugate_godan(kana, template_id, exceptions)
+
+    raise ConjugationError(f"Unsupported verb_class: {verb_class}")
+
+def unique_values(values: List[Any]) -> List[str]:
+    out: List[str] = []
+    for value in values:
+        if isinstance(value, str) and value and value not in out:
+            out.append(value)
+    return out
+
+def conjugate_accepted(verb: Optional[Dict[str, Any]], template_id: str, exceptions: Optional[Dict[str, Any]]) -> List[str]:
+    """All accepted answers, canonical first; mirrors Core.conjugateAccepted."""
+    canonical = conjugate(verb, template_id, exceptions)
+    if template_id != "plain_nakereba_ikenai":
+        return [canonical]
+    negative = conjugate(verb, "plain_negative", exceptions)
+    if not negative.endswith("ない"):
+        return [canonical]
+    stem = negative[:-2]
+    return unique_values([
+        canonical,
+        f"{stem}なければいけない",
+        f"{stem}なきゃいけない",
+        f"{stem}なくちゃいけない",
+    ])
+
+def build_answer_table(
+    verbs: List[Dict[str, Any]],
+    templates: List[Dict[str, Any]],
+    exceptions: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Precompute canonical/accepted answers for every (verb, template) pair."""
+    verb_ids = [v.get("id") for v in verbs]
+    template_ids = [t.get("id") for t in templates if isinstance(t.get("id"), str)]
+    answers: List[Optional[str]] = []
+    accepted: Dict[str, List[str]] = {}
+    for verb in verbs:
+        for template_id in template_ids:
+            try:
+                values = conjugate_accepted(verb, template_id, exceptions)
+            except ConjugationError:
+                answers.append(None)
+                continue
+            if len(values) > 1:
+                accepted[str(len(answers))] = values
+            answers.append(values[0])
+    return {
+        "format": ANSWER_TABLE_FORMAT,
+        "verb_ids": verb_ids,
+        "template_ids": template_ids,
+        "answers": answers,
+        "accepted": accepted,
+    }
+
+def load_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def load_jsonl(path: Path) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+def run_golden_tests(root: Path, verbs_by_id: Dict[str, Dict[str, Any]], exceptions: Dict[str, Any]) -> List[str]:
+    """Replay the golden conjugation cases; returns failure messages."""
+    failures: List[str] = []
+    for rel in GOLDEN_TEST_PATHS:
+        path = root / rel
+        if not path.exists():
+            continue
+        for case in load_json(path).get("cases", []):
+            verb = verbs_by_id.get(case.get("verb_id"))
+            if verb is None:
+                failures.append(f"{rel}: {case.get('case_id')} missing verb id: {case.get('verb_id')}")
+                continue
+            try:
+                actual = conjugate(verb, case["template_id"], exceptions)
+            except ConjugationError as e:
+                actual = f"<error: {e}>"
+            if actual != case.get("expected_kana"):
+                failures.append(f"{rel}: {case.get('case_id')} expected {case.get('expected_kana')}, got {actual}")
+    return failures
+
+def load_inputs(root: Path, verbs_path: Optional[Path] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+    verbs = load_jsonl(verbs_path or root / VERBS_PATH)
+    templates = load_json(root / TEMPLATES_PATH)
+    exceptions = load_json(root / EXCEPTIONS_PATH)
+    return verbs, templates, exceptions
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Check the Python conjugation port and build the answer table.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'tests/' (default: current dir)")
+    ap.add_argument("--verbs", help="Verbs JSONL to tabulate (default: data/verbs/verbs.v2.jsonl)")
+    ap.add_argument("--out", help="Write the answer table JSON here")
+    ap.add_argument("--check", action="store_true", help="Only run the golden tests")
+    args = ap.parse_args()
+
+    root = Path(args.root).resolve()
+    verbs, templates, exceptions = load_inputs(root)
+    failures = run_golden_tests(root, {v.get("id"): v for v in verbs}, exceptions)
+    for msg in failures:
+        print(f"[FAIL ] {msg}", file=sys.stderr)
+    if failures:
+        print(f"\nGolden tests: {len(failures)} failure(s); answer table not written.", file=sys.stderr)
+        return 1
+    print("Golden tests: PASS")
+    if args.check:
+        return 0
+
+    if args.verbs:
+        verbs = load_jsonl(Path(args.verbs))
+    start = time.perf_counter()
+    table = build_answer_table(verbs, templates, exceptions)
+    elapsed = time.perf_counter() - start
+    body = json.dumps(table, ensure_ascii=False, separators=(",", ":"))
+    unsupported = sum(1 for a in table["answers"] if a is None)
+    print(
+        f"Answer table: {len(table['verb_ids'])} verbs x {len(table['template_ids'])} templates, "
+        f"{unsupported} unsupported, {len(body.encode('utf-8'))} bytes, built in {elapsed:.3f}s"
+    )
+    if args.out:
+        Path(args.out).write_text(body, encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,35 @@
+# data_sources.py
+#
+# The app's startup datasets and how to read them, shared by the build and
+# analysis scripts (build_bundle.py, example_index.py, subset_fonts.py,
+# cohort_report.py) so none of them has to import another script's CLI module.
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, List, Tuple
+
+# (bundle key, source path relative to root, loader kind)
+SOURCES: List[Tuple[str, str, str]] = [
+    ("verbs", "data/verbs/verbs.v2.jsonl", "jsonl"),
+    ("templates", "data/conjugations/conjugation_templates.v3.json", "json"),
+    ("exceptions", "data/exceptions/verb_exceptions.v1.json", "json"),
+    ("rule_hints", "data/ui_text/rule_hints.v3.json", "json"),
+    ("example_sentences", "data/ui_text/example_sentences.v4.json", "json"),
+    ("furigana", "data/ui_text/furigana.verbs.v2.v1.json", "json"),
+    ("learning_path_guided", "data/learning_paths/learning_path.guided.v1.json", "json"),
+    ("learning_path_genki", "data/learning_paths/learning_path.genki_aligned.v1.json", "json"),
+]
+
+def source_path(root: Path, key: str) -> Path:
+    return root / next(rel for k, rel, _ in SOURCES if k == key)
+
+def load_jsonl(path: Path) -> List[Any]:
+    records: List[Any] = []
+    with path.open("r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# example_index.py
+#
+# Precompiles example-sentence selection into a flat (verb, template) index so
+# the app looks sentences up instead of scanning overrides and hashing on every
+# card render.
+#
+# What it does:
+# - Mirrors Core.resolveExampleSentence (src/core/index.js): the first override
+#   listing the verb replaces the verb-class list or disables examples; the
+#   example and each lexicon token are picked by FNV-1a (over UTF-16 code units,
+#   like charCodeAt) of `verb_id|template_id` (`|token`). {V} is left in place
+#   for the expected answer.
+# - Builds, for every verb x template (same order as the answer table):
+#     {"format": 1, "verb_ids": [...], "template_ids": [...],
+#      "texts": [unique resolved sentences], "sentences": [index | null | false]}
+#   where null means no example and false an override that disables it.
+#   build_bundle.py ships this as `example_index`.
+# - Reports every active-template combination without an example, by reason.
+#
+# tests/example_index_cases.v2.json is self-contained: a small fixture (example
+# data, verbs, template ids) and every verb x template case recorded from
+# Core.resolveExampleSentence on it. scripts/run_tests.js and `--check` both
+# replay it (the latter through the resolver and the compiled index), so the
+# check tests the port, not the shipped sentences. After a change to the JS
+# resolver, re-record with `node scripts/run_tests.js --record`.
+#
+# Usage:
+#   python scripts/example_index.py --root .
+#   python scripts/example_index.py --root . --check
+#   python scripts/example_index.py --root . --out /tmp/example_index.json --strict
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from data_sources import load_jsonl, source_path
+from validate_data import find_project_root, load_json
+
+INDEX_FORMAT = 1
+CASES_PATH = Path("tests") / "example_index_cases.v2.json"
+TOKEN_RE = re.compile(r"\{([A-Za-z0-9_]+)\}")
+
+# resolve_example_sentence statuses; everything but "ok" has no sentence.
+STATUS_OK = "ok"
+STATUS_DISABLED = "disabled"
+
+
+def fnv1a_32(text: str) -> int:
+    """FNV-1a over UTF-16 code units, equal to hashStringToUint32 in src/core/index.js."""
+    h = 2166136261
+    data = text.encode("utf-16-le", "surrogatepass")
+    for i in range(0, len(data), 2):
+        h ^= data[i] | (data[i + 1] << 8)
+        h = (h * 16777619) & 0xFFFFFFFF
+    return h
+
+
+def resolve_example_sentence(example_data: Any, verb: Dict[str, Any], template_id: str) -> Tuple[str, str]:
+    """(status, text with {V} kept) for one card; port of Core.resolveExampleSentence."""
+    if not verb or not template_id:
+        return "no_template", ""
+    verb_class = verb.get("verb_class")
+    if not verb_class:
+        return "no_verb_class", ""
+    templates = example_data.get("templates") if isinstance(example_data, dict) else None
+    if not templates:
+        return "no_template", ""
+    template_data = templates.get(template_id)
+    # JS treats an empty by_verb_class object as present.
+    if not isinstance(template_data, dict) or not isinstance(template_data.get("by_verb_class"), dict):
+        return "no_template", ""
+    lexicon = example_data.get("lexicon") or {}
+
+    examples = template_data["by_verb_class"].get(verb_class)
+    overrides = template_data.get("overrides") if isinstance(template_data.get("overrides"), list) else []
+    matched = next((ov for ov in overrides
+                    if isinstance(ov, dict) and isinstance(ov.get("verb_ids"), list) and verb.get("id") in ov["verb_ids"]), None)
+    if matched is not None and matched.get("disabled"):
+        return STATUS_DISABLED, ""
+    if matched is not None and isinstance(matched.get("examples"), list):
+        examples = matched["examples"]
+    if not isinstance(examples, list) or not examples:
+        return "no_examples", ""
+
+    key = f"{verb.get('id')}|{template_id}"
+    item = examples[fnv1a_32(key) % len(examples)]
+    text = item.get("text") if isinstance(item, dict) and isinstance(item.get("text"), str) else ""
+    if not text:
+        return "empty_text", ""
+
+    def fill(match: "re.Match[str]") -> str:
+        token = match.group(1)
+        if token == "V":
+            return match.group(0)
+        options = lexicon.get(token)
+        if not isinstance(options, list) or not options:
+            return ""
+        return options[fnv1a_32(f"{key}|{token}") % len(options)]
+
+    return STATUS_OK, TOKEN_RE.sub(fill, text)
+
+
+def build_example_index(verbs: List[Dict[str, Any]], templates: List[Dict[str, Any]], example_data: Any) -> Dict[str, Any]:
+    verb_ids = [v.get("id") for v in verbs]
+    template_ids = [t.get("id") for t in templates if isinstance(t.get("id"), str)]
+    texts: List[str] = []
+    text_index: Dict[str, int] = {}
+    sentences: List[Any] = []
+    for verb in verbs:
+        for template_id in template_ids:
+            status, text = resolve_example_sentence(example_data, verb, template_id)
+            if status == STATUS_OK:
+                if text not in text_index:
+                    text_index[text] = len(texts)
+                    texts.append(text)
+                sentences.append(text_index[text])
+            else:
+                sentences.append(False if status == STATUS_DISABLED else None)
+    return {
+        "format": INDEX_FORMAT,
+        "verb_ids": verb_ids,
+        "template_ids": template_ids,
+        "texts": texts,
+        "sentences": sentences,
+    }
+
+
+def lexicon_problems(example_data: Any) -> List[str]:
+    """Lexicon options must not contain placeholders: the app fills {V} after lookup."""
+    lexicon = example_data.get("lexicon") or {} if isinstance(example_data, dict) else {}
+    return [f"lexicon[{token!r}] option {opt!r} contains a placeholder"
+            for token, options in lexicon.items() if isinstance(options, list)
+            for opt in options if isinstance(opt, str) and TOKEN_RE.search(opt)]
+
+
+def coverage_report(verbs: List[Dict[str, Any]], templates: List[Dict[str, Any]], example_data: Any) -> Dict[str, Any]:
+    """Active-template combinations by status, with the verbs missing an example per template."""
+    statuses: Counter = Counter()
+    missing: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+    for template in templates:
+        template_id = template.get("id")
+        if not template.get("active") or not isinstance(template_id, str):
+            continue
+        for verb in verbs:
+            status, _ = resolve_example_sentence(example_data, verb, template_id)
+            statuses[status] += 1
+            if status != STATUS_OK:
+                missing[template_id][status].append(verb.get("id"))
+    return {"statuses": dict(statuses), "missing": {t: dict(v) for t, v in sorted(missing.items())}}
+
+
+def load_sources(root: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Any]:
+    return (load_jsonl(source_path(root, "verbs")),
+            load_json(source_path(root, "templates")),
+            load_json(source_path(root, "example_sentences")))
+
+
+def run_cases(root: Path) -> Tuple[int, List[str]]:
+    """Replay the JS-recorded cases on their fixture through the resolver and the compiled index."""
+    fixture = load_json(root / CASES_PATH)
+    example_data, verbs, cases = fixture["example_data"], fixture["verbs"], fixture["cases"]
+    verbs_by_id = {v.get("id"): v for v in verbs}
+    index = build_example_index(verbs, [{"id": t} for t in fixture["template_ids"]], example_data)
+    rows = {v: i for i, v in enumerate(index["verb_ids"])}
+    cols = {t: i for i, t in enumerate(index["template_ids"])}
+    width = len(index["template_ids"])
+    failures: List[str] = []
+    for case in cases:
+        status, text = resolve_example_sentence(example_data, verbs_by_id.get(case["verb_id"]), case["template_id"])
+        if status != case["status"] or text != case["text"]:
+            failures.append(f"{case['verb_id']}|{case['template_id']}: expected {case['status']} {case['text']!r}, "
+                            f"resolver gave {status} {text!r}")
+            continue
+        if case["verb_id"] not in rows or case["template_id"] not in cols:
+            failures.append(f"{case['verb_id']}|{case['template_id']}: verb or template is not in the fixture")
+            continue
+        entry = index["sentences"][rows[case["verb_id"]] * width + cols[case["template_id"]]]
+        if entry is False:
+            status, text = STATUS_DISABLED, ""
+        elif entry is None:
+            status, text = None, ""
+        else:
+            status, text = STATUS_OK, index["texts"][entry]
+        # The index only distinguishes ok / disabled / no example.
+        expected_status = case["status"] if case["status"] in (STATUS_OK, STATUS_DISABLED) else None
+        if status != expected_status or text != case["text"]:
+            failures.append(f"{case['verb_id']}|{case['template_id']}: expected {case['status']} {case['text']!r}, "
+                            f"index gave {status} {text!r}")
+    return len(cases), failures
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Precompile the example-sentence index and report missing examples.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'schemas/' (default: current dir)")
+    ap.add_argument("--out", help="Write the index JSON here")
+    ap.add_argument("--check", action="store_true", help=f"Replay {CASES_PATH.as_posix()} through the resolver and the compiled index")
+    ap.add_argument("--strict", action="store_true", help="Exit 1 if an active template lacks an example for some verb (disabled overrides excepted)")
+    ap.add_argument("--verbose", action="store_true", help="List every verb without an example")
+    args = ap.parse_args()
+
+    root = find_project_root(Path(args.root))
+    verbs, templates, example_data = load_sources(root)
+
+    problems = lexicon_problems(example_data)
+    for msg in problems:
+        print(f"[ERROR] {msg}", file=sys.stderr)
+    if problems:
+        return 1
+
+    index = build_example_index(verbs, templates, example_data)
+    if args.check:
+        total, failures = run_cases(root)
+        for msg in failures[:20]:
+            print(f"[FAIL ] {msg}", file=sys.stderr)
+        if failures:
+            print(f"{len(failures)} case(s) disagree with Core.resolveExampleSentence.", file=sys.stderr)
+            return 1
+        print(f"Example index port matches all {total} recorded cases.")
+
+    report = coverage_report(verbs, templates, example_data)
+    pairs = len(index["sentences"])
+    resolved = sum(1 for e in index["sentences"] if e is not None and e is not False)
+    print(f"{pairs} verb x template pairs: {resolved} with an example ({len(index['texts'])} distinct sentences), "
+          f"{sum(1 for e in index['sentences'] if e is False)} disabled by overrides")
+    print("active templates by status: " + ", ".join(f"{k} {v}" for k, v in sorted(report["statuses"].items())))
+    gaps = 0
+    for template_id, by_status in report["missing"].items():
+        for status, verb_ids in sorted(by_status.items()):
+            if status != STATUS_DISABLED:
+                gaps += len(verb_ids)
+            shown = ", ".join(verb_ids if args.verbose else verb_ids[:5])
+            more = "" if args.verbose or len(verb_ids) <= 5 else f", ... (+{len(verb_ids) - 5})"
+            print(f"  {template_id}: {status} x{len(verb_ids)}: {shown}{more}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 1 if args.strict and gaps else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1539 @@
+#!/usr/bin/env python3
+# lesson_sim.py
+#
+# Learning-path simulator built on a Python port of src/core/lesson_engine.js
+# (`evaluatePathAdvance`, `buildLessonQueue`, `computeCompositionWindow`,
+# `enforceIrregularPolicy` and the helpers they use).
+#
+# The port follows the JS line for line and returns dicts with the JS key
+# names (pathState, pathStatePatch, details, ...). Unseen pairs are
+# (verb_id, conjugation_id) tuples and queue items are
+# (verb_id, conjugation_id, source_bucket) tuples. With the same inputs and a
+# Mulberry32 RNG with the same seed (`createSeededRng` in the JS), both
+# produce the same queue. tests/lesson_engine_cases.v1.json was recorded from
+# the JS engine; `--check` replays it here and scripts/run_tests.js replays it
+# in node. The simulator refuses to run on a mismatch.
+# Dates are compared in UTC. The JS adds hold/stabilization days in local
+# time, which only differs by the hour around DST changes.
+#
+# Simulation model: one learner, one sitting a day, like startLessonsFlow.
+# - Lesson candidates are verbs x unlocked templates without a card. They are
+#   listed before the gate runs, so a stage's own templates first appear the
+#   day after it unlocks, as in the app.
+# - evaluatePathAdvance runs, then buildLessonQueue makes min(--daily-lessons,
+#   candidates) lessons.
+# - Lesson practice repeats a card until it is answered correctly. The card
+#   then starts at S1, due tomorrow.
+# - Each due review is scheduled on its first answer, using the rules from
+#   scripts/srs_sim.py. A miss is asked again until it is correct, without
+#   rescheduling.
+# - Every wrong answer counts towards mistakeCounts.templates.
+# - P(correct) = the profile's accuracy for the verb class + a stage bonus +
+#   a per-learner offset + a per-(learner, template) offset.
+# - `--skip-rate` of days are skipped entirely.
+# Each learner has its own seed (from --seed and its index), so results do
+# not depend on --jobs.
+#
+# Output:
+# - days spent in each stage and days to finish the path, per profile;
+# - gate stalls per stage and reason;
+# - composition drift: lessons delivered per bucket vs the composition
+#   window's plan, per stage.
+#
+# Usage:
+#   python scripts/lesson_sim.py --check
+#   python scripts/lesson_sim.py --path guided --learners 2000 --jobs 8
+#   python scripts/lesson_sim.py --path textbook_genki --path-file /tmp/genki_tuned.json --out /tmp/genki.json
+#
+# Requirements:
+#   none (numpy, if installed, speeds up the RNG draws for large shuffles)
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import srs_sim
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+CASES_PATH = Path("tests") / "lesson_engine_cases.v1.json"
+VERBS_PATH = srs_sim.VERBS_PATH
+TEMPLATES_PATH = srs_sim.TEMPLATES_PATH
+PATH_FILES = {
+    "guided": Path("data") / "learning_paths" / "learning_path.guided.v1.json",
+    "textbook_genki": Path("data") / "learning_paths" / "learning_path.genki_aligned.v1.json",
+}
+
+DAY_MS = 24 * 60 * 60 * 1000
+MAX_SAFE_INTEGER = 2**53 - 1
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+VERB_CLASSES = ("godan", "ichidan", "irregular")
+Pair = Tuple[str, str]
+QueueItem = Tuple[str, str, str]
+# conjugation_id -> verb class ("" if unknown) -> [success, failure], summed over cards.
+TemplateTotals = Dict[str, Dict[str, List[Any]]]
+
+_MISSING = object()  # JS `undefined`, where it behaves differently from null
+
+
+# ---------------------------------------------------------------------------
+# RNG
+# ---------------------------------------------------------------------------
+
+class Mulberry32:
+    """createSeededRng() in lesson_engine.js; `uniforms(n)` equals n successive calls."""
+
+    STEP = 0x6D2B79F5
+
+    def __init__(self, seed: int) -> None:
+        self.state = seed & 0xFFFFFFFF
+
+    def __call__(self) -> float:
+        self.state = a = (self.state + self.STEP) & 0xFFFFFFFF
+        t = ((a ^ (a >> 15)) * (a | 1)) & 0xFFFFFFFF
+        t = ((t + (((t ^ (t >> 7)) * (t | 61)) & 0xFFFFFFFF)) & 0xFFFFFFFF) ^ t
+        return ((t ^ (t >> 14)) & 0xFFFFFFFF) / 4294967296.0
+
+    def uniforms(self, n: int) -> Sequence[float]:
+        if np is None or n < 64:
+            return [self() for _ in range(n)]
+        # The state only ever advances by STEP, so the n states are known up front.
+        steps = np.arange(1, n + 1, dtype=np.uint64) * np.uint64(self.STEP)
+        a = ((np.uint64(self.state) + steps) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+        self.state = int(a[-1])
+        t = (a ^ (a >> np.uint32(15))) * (a | np.uint32(1))
+        t = (t + (t ^ (t >> np.uint32(7))) * (t | np.uint32(61))) ^ t
+        return (t ^ (t >> np.uint32(14))) / 4294967296.0
+
+
+def _shuffle(items: Sequence[Any], rng: Any) -> List[Any]:
+    """shuffle(): Fisher-Yates from the end, one draw per position (none for < 2 items)."""
+    arr = list(items)
+    n = len(arr)
+    if n < 2:
+        return arr
+    draws = rng.uniforms(n - 1) if hasattr(rng, "uniforms") else [rng() for _ in range(n - 1)]
+    if np is not None and isinstance(draws, np.ndarray):
+        js = (draws * np.arange(n, 1, -1)).astype(np.int64).tolist()
+    else:
+        js = [int(u * m) for u, m in zip(draws, range(n, 1, -1))]
+    for i, j in zip(range(n - 1, 0, -1), js):
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+
+# ---------------------------------------------------------------------------
+# JS value helpers
+# ---------------------------------------------------------------------------
+
+def _truthy(value: Any) -> bool:
+    """JS truthiness: unlike Python, empty dicts and lists are true."""
+    if isinstance(value, (dict, list)):
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    return bool(value)
+
+
+def _as_number(value: Any, fallback: Any) -> Any:
+    """asNumber(): Number(value), or `fallback` when that is NaN. Pass _MISSING for undefined."""
+    if value is _MISSING:
+        return fallback
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return fallback if value != value else value
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0
+        try:
+            return float(text)
+        except ValueError:
+            return fallback
+    return fallback
+
+
+def _number_or_zero(value: Any) -> Any:
+    """`Number(value) || 0`."""
+    if type(value) is int:
+        return value
+    number = _as_number(value, 0)
+    return number or 0
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _parse_ms(value: Any) -> Optional[int]:
+    """Milliseconds since the epoch, or None where `new Date(value)` is invalid. Naive times are UTC."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - EPOCH) // timedelta(milliseconds=1)
+
+
+def _iso_from_ms(ms: int) -> str:
+    return (EPOCH + timedelta(milliseconds=ms)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def to_iso(value: Any) -> str:
+    if not value:
+        return srs_sim.iso(datetime.now(timezone.utc))
+    if isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        return srs_sim.iso(value)
+    return _iso_from_ms(int(value))
+
+
+def _is_valid_iso(value: Any) -> bool:
+    return isinstance(value, str) and _parse_ms(value) is not None
+
+
+def day_diff_inclusive(start_iso: Any, now_iso: Any) -> int:
+    start, now = _parse_ms(start_iso), _parse_ms(now_iso)
+    if start is None or now is None:
+        return 1
+    return max(0, now - start) // DAY_MS + 1
+
+
+def _add_days_iso(iso: str, days: Any) -> str:
+    ms = _parse_ms(iso)
+    if ms is None:
+        return to_iso(None)
+    return _iso_from_ms(ms + int(days) * DAY_MS)
+
+
+@lru_cache(maxsize=None)
+def _locale_key(text: str) -> Tuple[Tuple[int, str], ...]:
+    """localeCompare() order for template ids: punctuation, then digits, then letters."""
+    return tuple((1, ch) if ch.isdigit() else (2, ch.lower()) if ch.isalpha() else (0, ch) for ch in text)
+
+
+def _verb_classes(verbs_by_id: Dict[str, Any]) -> Dict[str, str]:
+    """getVerbClassForItem() for every verb at once."""
+    return {vid: str((verb or {}).get("verb_class") or "").lower() for vid, verb in verbs_by_id.items()}
+
+
+# ---------------------------------------------------------------------------
+# Path state and gates
+# ---------------------------------------------------------------------------
+
+def normalize_path_state(path_state: Optional[Dict[str, Any]], now_iso: Any) -> Dict[str, Any]:
+    now = to_iso(now_iso)
+    merged = {
+        "stage_index": 0,
+        "stage_started_at": now,
+        "failed_gate_count": 0,
+        "hold_until": None,
+        "completed": False,
+        "lesson_session_count": 0,
+        "last_iku_session": 0,
+        "stabilization_until": None,
+        "relaxed_accuracy_mode": False,
+        **(path_state or {}),
+    }
+    if not merged["stage_started_at"]:
+        merged["stage_started_at"] = now
+    for key in ("stage_index", "failed_gate_count", "lesson_session_count", "last_iku_session"):
+        if not _is_number(merged[key]) or merged[key] < 0:
+            merged[key] = 0
+    for key in ("hold_until", "stabilization_until"):
+        if not _is_valid_iso(merged[key]):
+            merged[key] = None
+    merged["completed"] = bool(merged["completed"])
+    merged["relaxed_accuracy_mode"] = bool(merged["relaxed_accuracy_mode"])
+    return merged
+
+
+def _stages(path_config: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    stages = (path_config or {}).get("stages")
+    return stages if isinstance(stages, list) else []
+
+
+def _stage_position(path_state: Dict[str, Any], stage_count: int) -> int:
+    return min(max(0, int(path_state.get("stage_index") or 0)), stage_count - 1)
+
+
+def get_current_stage(path_config: Dict[str, Any], path_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    stages = _stages(path_config)
+    if not stages:
+        return None
+    return stages[_stage_position(path_state, len(stages))]
+
+
+def _collect_template_ids(stages: Sequence[Dict[str, Any]]) -> List[str]:
+    out: List[str] = []
+    seen = set()
+    for stage in stages:
+        template_ids = stage.get("template_ids")
+        for tid in template_ids if isinstance(template_ids, list) else []:
+            if tid not in seen:
+                seen.add(tid)
+                out.append(tid)
+    return out
+
+
+def get_unlocked_template_ids(path_config: Dict[str, Any], path_state: Dict[str, Any]) -> List[str]:
+    stages = _stages(path_config)
+    if not stages:
+        return []
+    return _collect_template_ids(stages[:_stage_position(path_state, len(stages)) + 1])
+
+
+def get_recent_template_ids(path_config: Dict[str, Any], path_state: Dict[str, Any], stage_window: int) -> List[str]:
+    stages = _stages(path_config)
+    if not stages:
+        return []
+    max_idx = _stage_position(path_state, len(stages))
+    min_idx = max(0, max_idx - stage_window + 1)
+    return _collect_template_ids(stages[min_idx:max_idx + 1])
+
+
+def _merge_gate_profile(base: Optional[Dict[str, Any]], overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    base = base or {}
+    overrides = overrides or {}
+    merged = {**base, **overrides}
+    merged["min_accuracy_by_class"] = {
+        **(base.get("min_accuracy_by_class") or {}),
+        **(overrides.get("min_accuracy_by_class") or {}),
+    }
+    return merged
+
+
+def resolve_gate_profile(path_config: Dict[str, Any], stage_index: Any) -> Dict[str, Any]:
+    gates = (path_config or {}).get("gates")
+    base = copy.deepcopy(gates) if _truthy(gates) else {}
+    stage_number = max(1, math.floor(stage_index or 0) + 1)
+    bands = (path_config or {}).get("gate_bands")
+    matched = None
+    for band in bands if isinstance(bands, list) else []:
+        if not isinstance(band, dict):
+            continue
+        min_stage = max(1, math.floor(_as_number(band.get("min_stage", _MISSING), 1)))
+        max_stage = max(min_stage, math.floor(_as_number(band.get("max_stage", _MISSING), min_stage)))
+        if min_stage <= stage_number <= max_stage:
+            matched = band
+            break
+
+    if matched is None:
+        return {**base, "band_id": None}
+
+    overrides = next((v for v in (matched.get("gates"), matched.get("overrides")) if _truthy(v)), {})
+    merged = _merge_gate_profile(base, overrides)
+    merged["band_id"] = matched.get("id") or None
+    merged["band_label"] = matched.get("label") or None
+    merged["band_range"] = {
+        "min_stage": max(1, math.floor(_as_number(matched.get("min_stage", _MISSING), 1))),
+        "max_stage": max(1, math.floor(_as_number(matched.get("max_stage", _MISSING), 1))),
+    }
+    return merged
+
+
+def _card_attempts(card: Optional[Dict[str, Any]]) -> Tuple[Any, Any]:
+    card = card or {}
+    return _number_or_zero(card.get("success_count_total")), _number_or_zero(card.get("failure_count_total"))
+
+
+def template_totals(cards_by_id: Optional[Dict[str, Any]], verbs_by_id: Optional[Dict[str, Any]]) -> TemplateTotals:
+    """Attempt totals per template and verb class, as evaluatePathAdvance and selectWeaknessTemplates sum them.
+
+    Every template with a card gets an entry, even if no card was answered. The
+    simulator keeps these up to date per answer instead of rescanning the cards.
+    """
+    verbs_by_id = verbs_by_id or {}
+    totals: TemplateTotals = {}
+    for card in (cards_by_id or {}).values():
+        tid = card.get("conjugation_id") if card else None
+        if not tid:
+            continue
+        s, f = _card_attempts(card)
+        verb = verbs_by_id.get(card.get("verb_id"))
+        verb_class = str(verb.get("verb_class") or "").lower() if verb else ""
+        cell = totals.setdefault(tid, {}).setdefault(verb_class, [0, 0])
+        cell[0] += s
+        cell[1] += f
+    return totals
+
+
+def evaluate_path_advance(path_config: Optional[Dict[str, Any]] = None, path_state: Optional[Dict[str, Any]] = None,
+                          cards_by_id: Optional[Dict[str, Any]] = None, verbs_by_id: Optional[Dict[str, Any]] = None,
+                          now_iso: Any = None, totals: Optional[TemplateTotals] = None) -> Dict[str, Any]:
+    """evaluatePathAdvance(); `totals` (see template_totals()) replaces the scan of `cards_by_id`."""
+    path_config = path_config or {}
+    now_iso = to_iso(now_iso)
+    state = normalize_path_state(path_state, now_iso)
+    stages = _stages(path_config)
+
+    if not stages:
+        return {
+            "pathState": {**state, "completed": True},
+            "advanced": False,
+            "completed": True,
+            "gate": {"passed": True, "reason": "no_stages", "failed_reasons": []},
+        }
+
+    stage_index = min(max(0, state["stage_index"]), len(stages) - 1)
+    template_ids = list(dict.fromkeys(stages[stage_index].get("template_ids") or []))
+    profile = resolve_gate_profile(path_config, stage_index)
+    min_answered = max(0, _as_number(profile.get("min_answered") or 0, math.nan))
+    min_accuracy = max(0, min(1, _as_number(profile.get("min_accuracy") or 0, math.nan)))
+    class_thresholds = profile.get("min_accuracy_by_class") or {}
+    hold_days_on_fail = max(0, _as_number(profile.get("hold_days_on_fail") or 0, math.nan))
+    max_days_in_stage = max(0, _as_number(profile.get("max_days_in_stage") or 0, math.nan))
+    min_days_in_stage = max(0, _as_number(profile.get("min_days_in_stage") or 0, math.nan))
+    stabilization_days = max(1, _as_number(profile.get("stabilization_days_on_stall") or 2, math.nan))
+    relaxed_delta = max(0, _as_number(profile.get("relaxed_accuracy_delta") or 0, math.nan))
+    days_in_stage = day_diff_inclusive(state["stage_started_at"], now_iso)
+    now_ms = _parse_ms(now_iso)
+
+    if state["stabilization_until"] and now_ms is not None and now_ms >= _parse_ms(state["stabilization_until"]):
+        state = {**state, "stabilization_until": None, "relaxed_accuracy_mode": True}
+
+    if state["hold_until"] and now_ms is not None and now_ms < _parse_ms(state["hold_until"]):
+        return {
+            "pathState": state,
+            "advanced": False,
+            "completed": False,
+            "gate": {
+                "passed": False,
+                "reason": "hold_active",
+                "failed_reasons": ["hold_active"],
+                "days_in_stage": days_in_stage,
+                "failed_gate_count": state["failed_gate_count"],
+                "profile": profile,
+                "class_accuracy": {},
+                "answered": 0,
+                "accuracy": 0,
+            },
+        }
+
+    if totals is None:
+        totals = template_totals(cards_by_id, verbs_by_id)
+    success = failure = 0
+    by_class = {verb_class: [0, 0] for verb_class in VERB_CLASSES}
+    # The JS skips unanswered cards; with non-negative counts they add nothing anyway.
+    for tid in template_ids:
+        for verb_class, (s, f) in totals.get(tid, {}).items():
+            success += s
+            failure += f
+            if verb_class in by_class:
+                by_class[verb_class][0] += s
+                by_class[verb_class][1] += f
+
+    answered = success + failure
+    accuracy = success / answered if answered > 0 else 0
+    effective_min_accuracy = max(0, min_accuracy - relaxed_delta) if state["relaxed_accuracy_mode"] else min_accuracy
+    class_accuracy: Dict[str, float] = {}
+    failed_reasons: List[str] = []
+
+    if answered < min_answered:
+        failed_reasons.append("min_answered")
+    if accuracy < effective_min_accuracy:
+        failed_reasons.append("min_accuracy")
+    if days_in_stage < min_days_in_stage:
+        failed_reasons.append("min_days_in_stage")
+
+    for verb_class, raw in class_thresholds.items():
+        threshold = _as_number(raw, math.nan)
+        if math.isnan(threshold):
+            continue
+        normalized = str(verb_class or "").lower()
+        s, f = by_class.get(normalized, (0, 0))
+        total = s + f
+        acc = s / total if total > 0 else 0
+        class_accuracy[normalized] = acc
+        if total <= 0 or acc < threshold:
+            failed_reasons.append(f"class_accuracy_{normalized}")
+
+    if not failed_reasons:
+        gate = {
+            "passed": True,
+            "reason": "passed",
+            "failed_reasons": [],
+            "answered": answered,
+            "accuracy": accuracy,
+            "class_accuracy": class_accuracy,
+            "days_in_stage": days_in_stage,
+            "failed_gate_count": 0,
+            "profile": profile,
+        }
+        if stage_index >= len(stages) - 1:
+            return {
+                "pathState": {
+                    **state,
+                    "stage_index": stage_index,
+                    "completed": True,
+                    "failed_gate_count": 0,
+                    "hold_until": None,
+                    "stabilization_until": None,
+                    "relaxed_accuracy_mode": False,
+                },
+                "advanced": False,
+                "completed": True,
+                "gate": gate,
+            }
+        return {
+            "pathState": {
+                **state,
+                "stage_index": stage_index + 1,
+                "stage_started_at": now_iso,
+                "failed_gate_count": 0,
+                "hold_until": None,
+                "completed": False,
+                "stabilization_until": None,
+                "relaxed_accuracy_mode": False,
+            },
+            "advanced": True,
+            "completed": False,
+            "gate": gate,
+        }
+
+    had_enough_answered = answered >= min_answered
+    next_failed = state["failed_gate_count"] + 1 if had_enough_answered else state["failed_gate_count"]
+    if had_enough_answered and hold_days_on_fail > 0:
+        hold_until = _add_days_iso(now_iso, hold_days_on_fail)
+    else:
+        hold_until = state["hold_until"] or None
+
+    stabilization_until = state["stabilization_until"] or None
+    if (max_days_in_stage > 0 and days_in_stage >= max_days_in_stage and not stabilization_until
+            and not state["relaxed_accuracy_mode"]):
+        stabilization_until = _add_days_iso(now_iso, stabilization_days)
+
+    return {
+        "pathState": {
+            **state,
+            "failed_gate_count": next_failed,
+            "hold_until": hold_until,
+            "completed": False,
+            "stabilization_until": stabilization_until,
+            "relaxed_accuracy_mode": state["relaxed_accuracy_mode"],
+        },
+        "advanced": False,
+        "completed": False,
+        "gate": {
+            "passed": False,
+            "reason": failed_reasons[0] if failed_reasons else "failed",
+            "failed_reasons": failed_reasons,
+            "answered": answered,
+            "accuracy": accuracy,
+            "class_accuracy": class_accuracy,
+            "days_in_stage": days_in_stage,
+            "failed_gate_count": next_failed,
+            "profile": profile,
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Composition window and weakness selection
+# ---------------------------------------------------------------------------
+
+def _clamp_counts(counts: Dict[str, Any], daily_count: int, min_by_key: Dict[str, Any]) -> Dict[str, int]:
+    out = {key: max(0, math.floor(value or 0)) for key, value in counts.items()}
+    keys = list(out)
+    total = sum(out.values())
+    while total > daily_count:
+        reduced = False
+        for key in ("previous", "recent", "weakness", "current"):
+            if total <= daily_count:
+                break
+            floor = max(0, math.floor(min_by_key.get(key) or 0))
+            if key in out and out[key] > floor:
+                out[key] -= 1
+                total -= 1
+                reduced = True
+        if not reduced:
+            for key in ("weakness", "current", "previous", "recent"):
+                if total <= daily_count:
+                    break
+                if key in out and out[key] > 0:
+                    out[key] -= 1
+                    total -= 1
+        if total > daily_count and all(out[key] <= 0 for key in keys):
+            break
+    return out
+
+
+def _derive_gate_boost(gate_diagnostics: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    out = {"weaknessExtra": 0, "classBias": {"godan": 0, "ichidan": 0, "irregular": 0}}
+    reasons = (gate_diagnostics or {}).get("failed_reasons")
+    for reason in reasons if isinstance(reasons, list) else []:
+        if reason == "min_accuracy":
+            out["weaknessExtra"] += 1
+        elif reason.startswith("class_accuracy_") and reason[len("class_accuracy_"):] in out["classBias"]:
+            out["weaknessExtra"] += 1
+            out["classBias"][reason[len("class_accuracy_"):]] += 2
+    return out
+
+
+def compute_composition_window(path_type: Optional[str] = None, path_config: Optional[Dict[str, Any]] = None,
+                               path_state: Optional[Dict[str, Any]] = None, daily_count: Any = None,
+                               now_iso: Any = None, current_stage: Optional[Dict[str, Any]] = None,
+                               gate_diagnostics: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    path_type = path_type or "guided"
+    path_config = path_config or {}
+    state = normalize_path_state(path_state, now_iso)
+    daily_count = max(1, math.floor(daily_count or 10))
+    days_in_stage = day_diff_inclusive(state["stage_started_at"], to_iso(now_iso))
+    windows = path_config.get("windows") or {}
+    unlocked_stage_count = max(1, (state["stage_index"] or 0) + 1)
+    template_ids = (current_stage or {}).get("template_ids")
+    stage_is_narrow = (len(template_ids) if isinstance(template_ids, list) else 0) <= 1
+
+    def window_counts(key: str, default: Dict[str, int]) -> Dict[str, Any]:
+        value = windows.get(key)
+        return dict(value if _truthy(value) else default)
+
+    if path_type == "guided" and unlocked_stage_count >= (windows.get("mid_course_unlocked_forms") or MAX_SAFE_INTEGER):
+        counts = window_counts("counts_mid_course", {"current": 2, "recent": 5, "weakness": 3})
+    elif days_in_stage <= (windows.get("intro_days") or 2):
+        counts = window_counts("counts_intro", {"current": 6, "previous": 3, "weakness": 1})
+    elif days_in_stage <= (windows.get("consolidation_days") or 6):
+        counts = window_counts("counts_consolidation", {"current": 4, "previous": 4, "weakness": 2})
+    else:
+        counts = window_counts("counts_maintenance", {"current": 3, "previous": 5, "weakness": 2})
+
+    boost = _derive_gate_boost(gate_diagnostics)
+    fail_boost = 1 if state["failed_gate_count"] > 0 else 0
+    counts["weakness"] = (counts.get("weakness") or 0) + fail_boost + boost["weaknessExtra"]
+
+    now_ms = _parse_ms(to_iso(now_iso))
+    until_ms = _parse_ms(state["stabilization_until"])
+    stabilization_active = now_ms is not None and until_ms is not None and now_ms < until_ms
+    if stabilization_active:
+        counts["weakness"] = (counts.get("weakness") or 0) + 2
+
+    min_by_key: Dict[str, int] = {}
+    if path_type == "guided" and stage_is_narrow and days_in_stage > 2:
+        min_by_key["recent" if "recent" in counts else "previous"] = math.ceil(daily_count * 0.5)
+
+    return {
+        "daysInStage": days_in_stage,
+        "unlockedStageCount": unlocked_stage_count,
+        "stageIsNarrow": stage_is_narrow,
+        "stabilizationActive": stabilization_active,
+        "boost": boost,
+        "counts": _clamp_counts(counts, daily_count, min_by_key),
+    }
+
+
+def select_weakness_templates(allowed_template_ids: Sequence[str], cards_by_id: Optional[Dict[str, Any]] = None,
+                              mistake_template_counts: Optional[Dict[str, Any]] = None, limit: Any = 3,
+                              totals: Optional[TemplateTotals] = None) -> List[str]:
+    """selectWeaknessTemplates(); `totals` (see template_totals()) replaces the scan of `cards_by_id`."""
+    allowed = set(allowed_template_ids or [])
+    if totals is None:
+        totals = template_totals(cards_by_id, None)
+    metrics: Dict[str, List[Any]] = {}  # tid -> [success, failure, attempts]
+    for tid, by_class in totals.items():
+        if tid not in allowed:
+            continue
+        m = metrics.setdefault(tid, [0, 0, 0])
+        for s, f in by_class.values():
+            m[0] += s
+            m[1] += f
+            m[2] += s + f
+    for tid, raw in (mistake_template_counts or {}).items():
+        if tid not in allowed:
+            continue
+        count = _number_or_zero(raw)
+        m = metrics.setdefault(tid, [0, 0, 0])
+        m[1] += count
+        m[2] += count
+
+    def score(item: Tuple[str, List[Any]]) -> Any:
+        s, f, attempts = item[1]
+        accuracy = s / attempts if attempts > 0 else 1
+        return f + max(0, 1 - accuracy) * 10
+
+    ranked = sorted(metrics.items(), key=lambda item: (-score(item), -item[1][1], _locale_key(item[0])))
+    return [tid for tid, _ in ranked[:max(0, math.floor(limit or 3))]]
+
+
+def apply_confusable_pair_boost(base_template_ids: Sequence[str], confusable_pairs: Sequence[Any],
+                                trigger_errors: Any, mistake_template_counts: Optional[Dict[str, Any]],
+                                allowed_template_ids: Sequence[str]) -> List[str]:
+    trigger = max(1, math.floor(trigger_errors or 2))
+    mistakes = mistake_template_counts or {}
+    allowed = set(allowed_template_ids or [])
+    boosted = list(dict.fromkeys(base_template_ids or []))
+    seen = set(boosted)
+    for pair in confusable_pairs or []:
+        if not isinstance(pair, list) or len(pair) != 2:
+            continue
+        first, second = pair
+        for errors_of, other in ((first, second), (second, first)):
+            if _as_number(mistakes.get(errors_of) or 0, math.nan) >= trigger and other in allowed and other not in seen:
+                seen.add(other)
+                boosted.append(other)
+    return boosted
+
+
+# ---------------------------------------------------------------------------
+# Queue building
+# ---------------------------------------------------------------------------
+
+def _pick_from_pool(queue: List[QueueItem], pool: Sequence[Pair], bucket: str, count: int,
+                    recent_verb_window: int, rng: Any) -> List[QueueItem]:
+    picked: List[QueueItem] = []
+    for verb_id, template_id in _shuffle(pool, rng):
+        if len(picked) >= count:
+            break
+        if any(entry[0] == verb_id for entry in queue[-recent_verb_window:]):
+            continue
+        if any(entry[0] == verb_id and entry[1] == template_id for entry in queue):
+            continue
+        item = (verb_id, template_id, bucket)
+        queue.append(item)
+        picked.append(item)
+    return picked
+
+
+def _build_class_targets(count: Any, class_bias: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    safe_count = max(0, math.floor(count or 0))
+    if safe_count == 0:
+        return {"godan": 0, "ichidan": 0, "irregular": 0}
+    bias = class_bias or {}
+    weights = {"godan": 0.6, "ichidan": 0.33, "irregular": 0.07}
+    for verb_class in weights:
+        weights[verb_class] += 0.08 * max(0, _as_number(bias.get(verb_class, _MISSING), 0))
+    weight_sum = weights["godan"] + weights["ichidan"] + weights["irregular"]
+    raw = {verb_class: (safe_count * weight) / weight_sum for verb_class, weight in weights.items()}
+    targets = {verb_class: math.floor(value) for verb_class, value in raw.items()}
+    remainder = safe_count - sum(targets.values())
+    for verb_class in sorted(raw, key=lambda c: -(raw[c] - math.floor(raw[c]))):
+        if remainder <= 0:
+            break
+        targets[verb_class] += 1
+        remainder -= 1
+    return targets
+
+
+def _pick_with_class_targets(queue: List[QueueItem], pool: Sequence[Pair], bucket: str, count: Any,
+                             recent_verb_window: int, rng: Any, classes: Dict[str, str],
+                             class_bias: Optional[Dict[str, Any]]) -> List[QueueItem]:
+    wanted = max(0, math.floor(count or 0))
+    if wanted <= 0:
+        return []
+    targets = _build_class_targets(wanted, class_bias)
+    picked: List[QueueItem] = []
+    for verb_class in VERB_CLASSES:
+        if targets[verb_class] <= 0:
+            continue
+        class_pool = [pair for pair in pool if classes.get(pair[0], "") == verb_class]
+        picked.extend(_pick_from_pool(queue, class_pool, bucket, targets[verb_class], recent_verb_window, rng))
+    if len(picked) < wanted:
+        picked.extend(_pick_from_pool(queue, pool, bucket, wanted - len(picked), recent_verb_window, rng))
+    return picked
+
+
+def _pick_with_class_bias(queue: List[QueueItem], pool: Sequence[Pair], bucket: str, count: Any,
+                          recent_verb_window: int, rng: Any, classes: Dict[str, str],
+                          class_bias: Optional[Dict[str, Any]]) -> List[QueueItem]:
+    wanted = max(0, math.floor(count or 0))
+    if wanted <= 0:
+        return []
+    bias = class_bias or {}
+    ordered = [(c, max(0, math.floor(_as_number(bias.get(c, _MISSING), 0)))) for c in ("irregular", "godan", "ichidan")]
+    ordered = sorted((entry for entry in ordered if entry[1] > 0), key=lambda entry: -entry[1])
+    picked: List[QueueItem] = []
+    for verb_class, amount in ordered:
+        if len(picked) >= wanted:
+            continue
+        class_pool = [pair for pair in pool if classes.get(pair[0], "") == verb_class]
+        picked.extend(_pick_from_pool(queue, class_pool, bucket, min(amount, wanted - len(picked)), recent_verb_window, rng))
+    if len(picked) < wanted:
+        picked.extend(_pick_from_pool(queue, pool, bucket, wanted - len(picked), recent_verb_window, rng))
+    return picked
+
+
+def _stage_current_template_ids(path_config: Dict[str, Any], current_stage: Optional[Dict[str, Any]],
+                                days_in_stage: int) -> List[str]:
+    raw = (current_stage or {}).get("template_ids")
+    template_ids = list(raw) if isinstance(raw, list) else []
+    if not current_stage or not path_config or not _truthy(path_config.get("stage_overrides")):
+        return template_ids
+    overrides = path_config["stage_overrides"].get(current_stage.get("id"))
+    if not isinstance(overrides, dict):
+        return template_ids
+    intro = overrides.get("intro_template_ids")
+    intro_templates = [tid for tid in intro if tid in template_ids] if isinstance(intro, list) else []
+    unlock_day = max(1, math.floor(_as_number(overrides.get("subphase_unlock_day", _MISSING), 0)))
+    if intro_templates and unlock_day > 1 and days_in_stage < unlock_day:
+        return intro_templates
+    return template_ids
+
+
+def _find_verb_ids_by_kana(verbs_by_id: Dict[str, Any], kana: str) -> List[str]:
+    return [vid for vid, verb in verbs_by_id.items() if verb and verb.get("kana") == kana]
+
+
+def _select_candidate(pool: Sequence[Pair], bucket: str, queue: List[QueueItem],
+                      predicate: Optional[Callable[[Pair], bool]], preferred_template_ids: Sequence[str],
+                      rng: Any) -> Optional[QueueItem]:
+    preferred_set = set(preferred_template_ids or [])
+    queued = {(entry[0], entry[1]) for entry in queue}
+    filtered = [pair for pair in pool if (predicate is None or predicate(pair)) and (pair[0], pair[1]) not in queued]
+    if not filtered:
+        return None
+    preferred = [pair for pair in filtered if pair[1] in preferred_set]
+    verb_id, template_id = _shuffle(preferred or filtered, rng)[0]
+    return (verb_id, template_id, bucket)
+
+
+def _find_replace_index_for_quota(queue: List[QueueItem], classes: Dict[str, str]) -> int:
+    for source in ("fallback", "previous", "recent", "weakness", "current"):
+        for index, item in enumerate(queue):
+            if classes.get(item[0], "") != "irregular" and (item[2] or "fallback") == source:
+                return index
+    return next((i for i, item in enumerate(queue) if classes.get(item[0], "") != "irregular"), -1)
+
+
+def _ensure_card_in_queue(queue: List[QueueItem], card: Optional[QueueItem], daily_count: int,
+                          classes: Dict[str, str]) -> bool:
+    if card is None:
+        return False
+    if any(item[0] == card[0] and item[1] == card[1] for item in queue):
+        return True
+    if len(queue) < daily_count:
+        queue.append(card)
+        return True
+    index = _find_replace_index_for_quota(queue, classes)
+    if index < 0:
+        return False
+    queue[index] = card
+    return True
+
+
+def _count_irregular(queue: List[QueueItem], classes: Dict[str, str]) -> int:
+    return sum(1 for item in queue if classes.get(item[0], "") == "irregular")
+
+
+def enforce_irregular_policy(policy: Optional[Dict[str, Any]], queue: List[QueueItem], daily_count: Any,
+                             unseen_pairs: Sequence[Pair], unlocked_template_ids: Sequence[str],
+                             current_template_ids: Sequence[str], verbs_by_id: Dict[str, Any],
+                             path_state: Optional[Dict[str, Any]], now_iso: Any, rng: Any,
+                             classes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    daily_count = max(1, math.floor(daily_count or len(queue) or 10))
+    unlocked = set(unlocked_template_ids or [])
+    classes = classes if classes is not None else _verb_classes(verbs_by_id)
+    state = normalize_path_state(path_state or {}, now_iso)
+    current_template_ids = list(current_template_ids or [])
+    patch: Dict[str, Any] = {"lesson_session_count": state["lesson_session_count"] + 1}
+
+    if not policy or policy.get("enabled") is False:
+        return {"queue": queue, "pathStatePatch": patch, "ikuInjected": False}
+
+    irregular_pool = [pair for pair in unseen_pairs if classes.get(pair[0], "") == "irregular" and pair[1] in unlocked]
+    min_irregular = max(0, math.floor(_as_number(policy.get("min_per_session", _MISSING), 2)))
+    primary_kana = policy.get("primary_kana") if isinstance(policy.get("primary_kana"), list) else ["する", "くる"]
+
+    if irregular_pool and min_irregular > 0:
+        irregular_count = _count_irregular(queue, classes)
+        for kana in primary_kana:
+            if irregular_count >= min_irregular:
+                break
+            verb_ids = set(_find_verb_ids_by_kana(verbs_by_id, kana))
+            if not verb_ids:
+                continue
+            candidate = _select_candidate(irregular_pool, "irregular_quota", queue,
+                                          lambda pair: pair[0] in verb_ids, current_template_ids, rng)
+            if _ensure_card_in_queue(queue, candidate, daily_count, classes):
+                irregular_count = _count_irregular(queue, classes)
+        while irregular_count < min_irregular:
+            candidate = _select_candidate(irregular_pool, "irregular_quota", queue, None, current_template_ids, rng)
+            if not _ensure_card_in_queue(queue, candidate, daily_count, classes):
+                break
+            irregular_count = _count_irregular(queue, classes)
+
+    special = policy.get("iku_special_templates")
+    iku_templates = list(dict.fromkeys(special if isinstance(special, list) else []))
+    requires_iku = any(tid in iku_templates for tid in current_template_ids)
+    iku_every = max(1, math.floor(_as_number(policy.get("iku_every_n_sessions", _MISSING), 2)))
+    session_count = patch["lesson_session_count"]
+    last_iku = max(0, math.floor(_as_number(state.get("last_iku_session", _MISSING), 0)))
+    iku_injected = False
+
+    if requires_iku and session_count - last_iku >= iku_every:
+        iku_verb_ids = set(_find_verb_ids_by_kana(verbs_by_id, "いく"))
+        if iku_verb_ids:
+            iku_pool = [pair for pair in unseen_pairs if pair[1] in unlocked and pair[0] in iku_verb_ids]
+            candidate = _select_candidate(iku_pool, "iku_quota", queue, None, iku_templates, rng)
+            iku_injected = _ensure_card_in_queue(queue, candidate, daily_count, classes)
+            if iku_injected:
+                patch["last_iku_session"] = session_count
+
+    return {"queue": queue, "pathStatePatch": patch, "ikuInjected": iku_injected}
+
+
+def _summarize_bucket_counts(queue: Sequence[QueueItem]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for item in queue:
+        key = item[2] or "fallback"
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def build_lesson_queue(path_type: Optional[str] = None, path_config: Optional[Dict[str, Any]] = None,
+                       path_state: Optional[Dict[str, Any]] = None, unseen_pairs: Sequence[Pair] = (),
+                       cards_by_id: Optional[Dict[str, Any]] = None, verbs_by_id: Optional[Dict[str, Any]] = None,
+                       mistake_template_counts: Optional[Dict[str, Any]] = None, daily_count: Any = None,
+                       gate_diagnostics: Optional[Dict[str, Any]] = None, now_iso: Any = None,
+                       rng: Any = None, totals: Optional[TemplateTotals] = None,
+                       classes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """buildLessonQueue(); `rng` is a Mulberry32 or any () -> float (default: a randomly seeded Mulberry32).
+
+    `totals` (see template_totals()) and `classes` (see _verb_classes()) save
+    recomputing them from `cards_by_id` and `verbs_by_id` on every call.
+    """
+    path_type = path_type or "guided"
+    path_config = path_config or {}
+    now_iso = to_iso(now_iso)
+    state = normalize_path_state(path_state, now_iso)
+    daily_count = max(1, math.floor(daily_count or 10))
+    rng = rng if rng is not None else Mulberry32(random.getrandbits(32))
+    verbs_by_id = verbs_by_id or {}
+    mistakes = mistake_template_counts or {}
+    classes = classes if classes is not None else _verb_classes(verbs_by_id)
+
+    current_stage = get_current_stage(path_config, state)
+    stage_index = max(0, math.floor(state["stage_index"] or 0))
+    days_in_stage = day_diff_inclusive(state["stage_started_at"], now_iso)
+    current_template_ids = (current_stage.get("template_ids") or []) if current_stage else []
+    active_current = _stage_current_template_ids(path_config, current_stage, days_in_stage)
+    active_set = set(active_current)
+    deferred = {tid for tid in current_template_ids if tid not in active_set}
+    effective_unlocked = [tid for tid in get_unlocked_template_ids(path_config, state) if tid not in deferred]
+    previous_template_ids = [tid for tid in effective_unlocked if tid not in active_set]
+    recent_template_ids = get_recent_template_ids(path_config, state, 5)
+
+    composition = compute_composition_window(
+        path_type=path_type,
+        path_config=path_config,
+        path_state=state,
+        daily_count=daily_count,
+        now_iso=now_iso,
+        current_stage=current_stage,
+        gate_diagnostics=gate_diagnostics,
+    )
+    counts = composition["counts"]
+    class_bias = composition["boost"]["classBias"]
+
+    weakness_base = select_weakness_templates(effective_unlocked, cards_by_id or {}, mistakes, 8, totals)
+    weakness_template_ids = apply_confusable_pair_boost(
+        weakness_base,
+        path_config.get("confusable_pairs") or [],
+        path_config.get("confusion_pair_trigger_errors") or 2,
+        mistakes,
+        effective_unlocked,
+    )
+
+    mid_course = (path_config.get("windows") or {}).get("mid_course_unlocked_forms") or MAX_SAFE_INTEGER
+    if path_type == "guided" and composition["unlockedStageCount"] >= mid_course:
+        source_for_previous = set(recent_template_ids)
+    else:
+        source_for_previous = set(previous_template_ids)
+
+    queue: List[QueueItem] = []
+    recent_verb_window = 5
+    weakness_set = set(weakness_template_ids)
+    unlocked_set = set(effective_unlocked)
+    current_pool = [pair for pair in unseen_pairs if pair[1] in active_set]
+    previous_pool = [pair for pair in unseen_pairs if pair[1] in source_for_previous]
+    weakness_pool = [pair for pair in unseen_pairs if pair[1] in weakness_set]
+    previous_bucket = "recent" if counts.get("recent") else "previous"
+
+    _pick_with_class_targets(queue, current_pool, "current", counts.get("current") or 0,
+                             recent_verb_window, rng, classes, class_bias)
+    if path_type == "guided" and counts.get("recent"):
+        previous_count = counts["recent"]
+    else:
+        previous_count = counts.get("previous") or 0
+    _pick_with_class_bias(queue, previous_pool, previous_bucket, previous_count,
+                          recent_verb_window, rng, classes, class_bias)
+    _pick_with_class_bias(queue, weakness_pool, "weakness", counts.get("weakness") or 0,
+                          recent_verb_window, rng, classes, class_bias)
+
+    if len(queue) < daily_count:
+        unlocked_pool = [pair for pair in unseen_pairs if pair[1] in unlocked_set]
+        _pick_from_pool(queue, unlocked_pool, "fallback", daily_count - len(queue), recent_verb_window, rng)
+
+    policy_result = enforce_irregular_policy(
+        policy=path_config.get("irregular_policy") or None,
+        queue=queue,
+        daily_count=daily_count,
+        unseen_pairs=unseen_pairs,
+        unlocked_template_ids=effective_unlocked,
+        current_template_ids=active_current,
+        verbs_by_id=verbs_by_id,
+        path_state=state,
+        now_iso=now_iso,
+        rng=rng,
+        classes=classes,
+    )
+    final_queue = policy_result["queue"][:daily_count]
+    policy = path_config.get("irregular_policy")
+
+    return {
+        "queue": final_queue,
+        "pathStatePatch": policy_result["pathStatePatch"] or None,
+        "details": {
+            "currentStageId": current_stage.get("id") if current_stage else None,
+            "currentStageIndex": stage_index,
+            "currentTemplateIds": current_template_ids,
+            "activeCurrentTemplateIds": active_current,
+            "unlockedTemplateIds": effective_unlocked,
+            "weaknessTemplateIds": weakness_template_ids,
+            "composition": composition,
+            "bucketCounts": _summarize_bucket_counts(final_queue),
+            "irregularPolicy": {
+                "enabled": bool(policy and policy.get("enabled") is not False),
+                "ikuInjected": bool(policy_result["ikuInjected"]),
+            },
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Data loading and recorded-case replay
+# ---------------------------------------------------------------------------
+
+def load_verbs(root: Path) -> List[Dict[str, Any]]:
+    with (root / VERBS_PATH).open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_lesson_template_ids(root: Path) -> List[str]:
+    """selectableTemplates() ids in table order: active, plain_dictionary excluded."""
+    templates = json.loads((root / TEMPLATES_PATH).read_text(encoding="utf-8"))
+    return [t["id"] for t in templates if t.get("active") and t.get("id") != "plain_dictionary"]
+
+
+def load_path_config(root: Path, path_type: str, path_file: Optional[str] = None) -> Dict[str, Any]:
+    source = Path(path_file) if path_file else root / PATH_FILES[path_type]
+    return json.loads(source.read_text(encoding="utf-8"))
+
+
+def lesson_candidates(pairs: Sequence[Pair], path_config: Dict[str, Any], path_state: Dict[str, Any],
+                      seen: Any) -> List[Pair]:
+    """startLessonsFlow candidates: verbs x unlocked templates (verb-major) without a card."""
+    unlocked = set(get_unlocked_template_ids(path_config, path_state))
+    return [pair for pair in pairs if pair[1] in unlocked and pair not in seen]
+
+
+def run_case_tests(root: Path) -> List[str]:
+    """Replay the recorded JS cases; returns failure messages."""
+    data = json.loads((root / CASES_PATH).read_text(encoding="utf-8"))
+    verbs = load_verbs(root)
+    verbs_by_id = {v["id"]: v for v in verbs}
+    pairs = [(v["id"], tid) for v in verbs for tid in load_lesson_template_ids(root)]
+    configs = {name: load_path_config(root, name) for name in PATH_FILES}
+    failures: List[str] = []
+
+    for case in data["cases"]:
+        config = configs[case["path"]]
+        cards = {}
+        for card_id, (success, failure) in case["cards"].items():
+            verb_id, template_id = card_id.split("::")
+            cards[card_id] = {"verb_id": verb_id, "conjugation_id": template_id,
+                              "success_count_total": success, "failure_count_total": failure}
+        seen = {(c["verb_id"], c["conjugation_id"]) for c in cards.values()}
+        unseen = lesson_candidates(pairs, config, normalize_path_state(case["path_state"], case["now_iso"]), seen)
+        gate = evaluate_path_advance(config, case["path_state"], cards, verbs_by_id, case["now_iso"])
+        built = build_lesson_queue(
+            path_type=case["path"],
+            path_config=config,
+            path_state=gate["pathState"],
+            unseen_pairs=unseen,
+            cards_by_id=cards,
+            verbs_by_id=verbs_by_id,
+            mistake_template_counts=case["mistake_template_counts"],
+            daily_count=min(case["daily_count"], len(unseen)),
+            gate_diagnostics=gate["gate"],
+            now_iso=case["now_iso"],
+            rng=Mulberry32(case["seed"]),
+        )
+        g = gate["gate"]
+        composition = built["details"]["composition"]
+        actual = {
+            "gate": {
+                "passed": g["passed"],
+                "reason": g["reason"],
+                "failed_reasons": g["failed_reasons"],
+                "advanced": gate["advanced"],
+                "completed": gate["completed"],
+                "answered": g.get("answered"),
+                "accuracy": g.get("accuracy"),
+                "class_accuracy": g.get("class_accuracy"),
+                "days_in_stage": g.get("days_in_stage"),
+                "failed_gate_count": g.get("failed_gate_count"),
+                "band_id": g["profile"].get("band_id") if g.get("profile") else None,
+            },
+            "path_state": {**gate["pathState"], **(built["pathStatePatch"] or {})},
+            "composition": {key: composition[key] for key in
+                            ("daysInStage", "unlockedStageCount", "stageIsNarrow", "stabilizationActive", "boost", "counts")},
+            "active_current_template_ids": built["details"]["activeCurrentTemplateIds"],
+            "weakness_template_ids": built["details"]["weaknessTemplateIds"],
+            "queue": [list(item) for item in built["queue"]],
+            "bucket_counts": built["details"]["bucketCounts"],
+            "iku_injected": built["details"]["irregularPolicy"]["ikuInjected"],
+        }
+        for key, want in case["expected"].items():
+            if actual[key] != want:
+                failures.append(f"{case['case_id']} ({case['why']}): {key} expected {json.dumps(want, ensure_ascii=False)}, "
+                                f"got {json.dumps(actual[key], ensure_ascii=False)}")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+# P(correct) for a card in LEARNING, by verb class. Later SRS stages add STAGE_BONUS.
+PROFILES: Dict[str, Dict[str, float]] = {
+    "strong": {"godan": 0.93, "ichidan": 0.95, "irregular": 0.90},
+    "average": {"godan": 0.84, "ichidan": 0.87, "irregular": 0.80},
+    "struggling": {"godan": 0.72, "ichidan": 0.77, "irregular": 0.66},
+    "godan_weak": {"godan": 0.70, "ichidan": 0.88, "irregular": 0.82},
+    "irregular_weak": {"godan": 0.86, "ichidan": 0.88, "irregular": 0.60},
+}
+# srs_sim's default accuracy curve, relative to LEARNING (LEARNING, S1..S6, RETIRED).
+STAGE_BONUS = tuple(round(a - srs_sim.DEFAULT_ACCURACY[0], 4) for a in srs_sim.DEFAULT_ACCURACY) + (0.0,)
+SIM_START = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class SimContext:
+    """Everything a worker needs, in picklable form."""
+    path_type: str
+    path_config: Dict[str, Any]
+    verbs_by_id: Dict[str, Any]
+    pairs: Tuple[Pair, ...]
+    template_ids: Tuple[str, ...]
+    days: int
+    daily_lessons: int
+    accuracy_sd: float
+    template_sd: float
+    hint_rate: float
+    skip_rate: float
+    seed: int
+
+
+_TRANSITIONS: Dict[Tuple[str, Optional[int], int], Tuple[str, Optional[int], int]] = {}
+
+
+def review_transition(stage: str, step: Optional[int], outcome: int) -> Tuple[str, Optional[int], int]:
+    """(stage, learning_step, due in days or -1) after one scheduled answer; outcome 0 wrong, 1 correct, 2 hint."""
+    key = (stage, step, outcome)
+    if key not in _TRANSITIONS:
+        card = srs_sim.create_card("v", "t", SIM_START)
+        card.update(stage=stage, learning_step=step)
+        srs_sim.apply_review_result(card, outcome > 0, outcome == 2, SIM_START)
+        due = -1 if card["due_at"] is None else round((srs_sim.parse_iso(card["due_at"]) - SIM_START) / timedelta(days=1))
+        _TRANSITIONS[key] = (card["stage"], card["learning_step"], due)
+    return _TRANSITIONS[key]
+
+
+def _clip(p: float) -> float:
+    return 0.0 if p < 0.0 else 1.0 if p > 1.0 else p
+
+
+def simulate_learner(ctx: SimContext, index: int, profile: str) -> Dict[str, Any]:
+    """Run one learner through the path; returns per-stage days, gate stalls and composition drift."""
+    rand = random.Random(f"{ctx.seed}:{index}")
+    queue_rng = Mulberry32(rand.getrandbits(32))
+    accuracy = PROFILES[profile]
+    learner_offset = rand.gauss(0.0, ctx.accuracy_sd) if ctx.accuracy_sd > 0 else 0.0
+    template_offset = {tid: rand.gauss(0.0, ctx.template_sd) if ctx.template_sd > 0 else 0.0 for tid in ctx.template_ids}
+    classes = _verb_classes(ctx.verbs_by_id)
+    stage_code = {name: i for i, name in enumerate(srs_sim.STAGE_ORDER)}
+    stage_count = len(_stages(ctx.path_config))
+    start_ms = _parse_ms(srs_sim.iso(SIM_START))
+
+    cards: Dict[str, Dict[str, Any]] = {}
+    totals: TemplateTotals = {}
+    seen = set()
+    # Lesson candidates, in lesson_candidates() order. Rebuilt when the unlocked
+    # stages change; otherwise each lesson just removes its pair.
+    unseen: Dict[Pair, None] = {}
+    unseen_stage = None
+    due: Dict[int, List[str]] = {}
+    mistakes: Dict[str, int] = {}
+    path_state = normalize_path_state(None, _iso_from_ms(start_ms))
+    entered = [None] * stage_count
+    entered[0] = 0
+    stage_days: List[Optional[int]] = [None] * stage_count
+    stalls: List[Dict[str, int]] = [{} for _ in range(stage_count)]
+    holds = [0] * stage_count
+    stabilizations = [0] * stage_count
+    planned: List[Dict[str, int]] = [{} for _ in range(stage_count)]
+    delivered: List[Dict[str, int]] = [{} for _ in range(stage_count)]
+    sessions = [0] * stage_count
+    completed_day = None
+    study_days = reviews = lessons = 0
+
+    def answer(card: Dict[str, Any], stage: str) -> int:
+        p = _clip(card["p"] + STAGE_BONUS[stage_code[stage]])
+        u = rand.random()
+        outcome = (u < p) + (u < p * ctx.hint_rate)
+        if outcome == 0:
+            tid = card["conjugation_id"]
+            mistakes[tid] = mistakes.get(tid, 0) + 1
+        return outcome
+
+    for day in range(ctx.days):
+        if ctx.skip_rate > 0 and rand.random() < ctx.skip_rate:
+            if day in due:
+                due.setdefault(day + 1, []).extend(due.pop(day))
+            continue
+        study_days += 1
+        now_iso = _iso_from_ms(start_ms + day * DAY_MS)
+
+        listing_state = normalize_path_state(path_state, now_iso)
+        if _stage_position(listing_state, stage_count) != unseen_stage:
+            unseen_stage = _stage_position(listing_state, stage_count)
+            unseen = dict.fromkeys(lesson_candidates(ctx.pairs, ctx.path_config, listing_state, seen))
+        count = min(ctx.daily_lessons, len(unseen))
+        if count > 0:
+            stage_before = _stage_position(path_state, stage_count)
+            had_stabilization = bool(path_state.get("stabilization_until"))
+            gate = evaluate_path_advance(ctx.path_config, path_state, cards, ctx.verbs_by_id, now_iso, totals)
+            g = gate["gate"]
+            if not g["passed"]:
+                if g["reason"] == "hold_active":
+                    holds[stage_before] += 1
+                else:
+                    for reason in g["failed_reasons"]:
+                        stalls[stage_before][reason] = stalls[stage_before].get(reason, 0) + 1
+                if gate["pathState"]["stabilization_until"] and not had_stabilization:
+                    stabilizations[stage_before] += 1
+            if gate["advanced"] or gate["completed"]:
+                stage_days[stage_before] = day - entered[stage_before]
+                if gate["advanced"]:
+                    entered[stage_before + 1] = day
+            path_state = gate["pathState"]
+            if gate["completed"]:
+                completed_day = day
+                break
+
+            built = build_lesson_queue(
+                path_type=ctx.path_type,
+                path_config=ctx.path_config,
+                path_state=path_state,
+                unseen_pairs=list(unseen),
+                cards_by_id=cards,
+                verbs_by_id=ctx.verbs_by_id,
+                mistake_template_counts=mistakes,
+                daily_count=count,
+                gate_diagnostics=g,
+                now_iso=now_iso,
+                rng=queue_rng,
+                totals=totals,
+                classes=classes,
+            )
+            path_state = {**path_state, **(built["pathStatePatch"] or {})}
+            stage = built["details"]["currentStageIndex"]
+            sessions[stage] += 1
+            for bucket, n in built["details"]["composition"]["counts"].items():
+                planned[stage][bucket] = planned[stage].get(bucket, 0) + n
+            for bucket, n in built["details"]["bucketCounts"].items():
+                delivered[stage][bucket] = delivered[stage].get(bucket, 0) + n
+
+            # Lesson practice: repeat until correct, then the card starts at S1 due tomorrow.
+            for verb_id, template_id, _ in built["queue"]:
+                attempts = totals.setdefault(template_id, {}).setdefault(classes.get(verb_id, ""), [0, 0])
+                attempts[0] += 1
+                card = {
+                    "verb_id": verb_id,
+                    "conjugation_id": template_id,
+                    "success_count_total": 1,
+                    "failure_count_total": 0,
+                    "stage": "S1",
+                    "learning_step": None,
+                    "p": accuracy.get(classes.get(verb_id, ""), 0.0) + learner_offset + template_offset[template_id],
+                    "attempts": attempts,  # this card's cell in `totals`
+                }
+                for _ in range(srs_sim.MAX_SESSION_ROUNDS):
+                    if answer(card, "LEARNING") > 0:
+                        break
+                card_id = f"{verb_id}::{template_id}"
+                cards[card_id] = card
+                seen.add((verb_id, template_id))
+                unseen.pop((verb_id, template_id), None)
+                due.setdefault(day + 1, []).append(card_id)
+                lessons += 1
+
+        # Reviews: the first answer is scheduled; a miss is re-asked until correct.
+        for card_id in due.pop(day, []):
+            card = cards[card_id]
+            outcome = answer(card, card["stage"])
+            stage, step, delay = review_transition(card["stage"], card["learning_step"], outcome)
+            if outcome:
+                card["success_count_total"] += 1
+                card["attempts"][0] += 1
+            else:
+                card["failure_count_total"] += 1
+                card["attempts"][1] += 1
+                for _ in range(srs_sim.MAX_SESSION_ROUNDS - 1):
+                    if answer(card, card["stage"]) > 0:
+                        break
+            card["stage"], card["learning_step"] = stage, step
+            if delay >= 0:
+                due.setdefault(day + max(1, delay), []).append(card_id)
+            reviews += 1
+
+    return {
+        "profile": profile,
+        "completed_day": completed_day,
+        "final_stage": _stage_position(path_state, stage_count),
+        "study_days": study_days,
+        "lessons": lessons,
+        "reviews": reviews,
+        "stage_days": stage_days,
+        "stalls": stalls,
+        "holds": holds,
+        "stabilizations": stabilizations,
+        "sessions": sessions,
+        "planned": planned,
+        "delivered": delivered,
+    }
+
+
+def _simulate_learners_task(args: Tuple[SimContext, List[Tuple[int, str]]]) -> List[Dict[str, Any]]:
+    """Process-pool entry point."""
+    ctx, learners = args
+    return [simulate_learner(ctx, index, profile) for index, profile in learners]
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p90": None, "max": None}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        # Nearest rank.
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    return {"p50": at(0.5), "p90": at(0.9), "max": ordered[-1]}
+
+
+def summarize(ctx: SimContext, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    stages = _stages(ctx.path_config)
+    profiles: Dict[str, Any] = {}
+    for name in dict.fromkeys(r["profile"] for r in records):
+        group = [r for r in records if r["profile"] == name]
+        done = [r["completed_day"] + 1 for r in group if r["completed_day"] is not None]
+        profiles[name] = {
+            "learners": len(group),
+            "completed": len(done),
+            "days_to_complete": _percentiles(done),
+            "final_stage_p50": _percentiles([r["final_stage"] + 1 for r in group])["p50"],
+            "stage_days_p50": [_percentiles([r["stage_days"][i] for r in group if r["stage_days"][i] is not None])["p50"]
+                               for i in range(len(stages))],
+        }
+
+    stage_rows = []
+    for i, stage in enumerate(stages):
+        reached = [r for r in records if r["final_stage"] >= i]
+        days = [r["stage_days"][i] for r in records if r["stage_days"][i] is not None]
+        reasons: Dict[str, int] = {}
+        for r in records:
+            for reason, n in r["stalls"][i].items():
+                reasons[reason] = reasons.get(reason, 0) + n
+        sessions = sum(r["sessions"][i] for r in records)
+        planned: Dict[str, int] = {}
+        delivered: Dict[str, int] = {}
+        for r in records:
+            for bucket, n in r["planned"][i].items():
+                planned[bucket] = planned.get(bucket, 0) + n
+            for bucket, n in r["delivered"][i].items():
+                delivered[bucket] = delivered.get(bucket, 0) + n
+        per_session = {bucket: {"planned": round(planned.get(bucket, 0) / sessions, 2) if sessions else 0.0,
+                                "delivered": round(delivered.get(bucket, 0) / sessions, 2) if sessions else 0.0}
+                       for bucket in dict.fromkeys([*planned, *delivered])}
+        stage_rows.append({
+            "stage_id": stage.get("id"),
+            "reached": len(reached),
+            "passed": len(days),
+            "days": _percentiles(days),
+            "learners_stalled": sum(1 for r in records if r["stalls"][i]),
+            "stall_reasons": dict(sorted(reasons.items(), key=lambda kv: -kv[1])),
+            "hold_days": sum(r["holds"][i] for r in records),
+            "stabilizations": sum(r["stabilizations"][i] for r in records),
+            "sessions": sessions,
+            "composition_per_session": per_session,
+        })
+    done_all = [r["completed_day"] + 1 for r in records if r["completed_day"] is not None]
+    return {
+        "learners": len(records),
+        "completed": len(done_all),
+        "days_to_complete": _percentiles(done_all),
+        "lessons_per_learner": round(sum(r["lessons"] for r in records) / max(1, len(records)), 1),
+        "reviews_per_learner": round(sum(r["reviews"] for r in records) / max(1, len(records)), 1),
+        "profiles": profiles,
+        "stages": stage_rows,
+    }
+
+
+def simulate(ctx: SimContext, learners: int, profile_weights: Dict[str, float], jobs: int = 1) -> Dict[str, Any]:
+    """Assign profiles by weight (largest remainder), run every learner, summarize."""
+    total = sum(profile_weights.values())
+    raw = {name: learners * weight / total for name, weight in profile_weights.items()}
+    sizes = {name: math.floor(value) for name, value in raw.items()}
+    for name in sorted(raw, key=lambda n: -(raw[n] - sizes[n]))[:learners - sum(sizes.values())]:
+        sizes[name] += 1
+    assigned = [name for name, n in sizes.items() for _ in range(n)]
+    tasks = [(ctx, [(i, assigned[i]) for i in range(lo, min(learners, lo + 10))]) for lo in range(0, learners, 10)]
+
+    start = time.perf_counter()
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(_simulate_learners_task, tasks))
+    else:
+        parts = [_simulate_learners_task(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    result = summarize(ctx, [record for part in parts for record in part])
+    result.update({
+        "path": ctx.path_type,
+        "days": ctx.days,
+        "daily_lessons": ctx.daily_lessons,
+        "profiles_weights": profile_weights,
+        "accuracy_sd": ctx.accuracy_sd,
+        "template_sd": ctx.template_sd,
+        "hint_rate": ctx.hint_rate,
+        "skip_rate": ctx.skip_rate,
+        "seed": ctx.seed,
+        "elapsed_s": round(elapsed, 3),
+    })
+    return result
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def print_summary(result: Dict[str, Any]) -> None:
+    done = result["days_to_complete"]
+    print(f"{result['learners']} learners on '{result['path']}', {result['daily_lessons']} lessons/day, "
+          f"{result['days']} days in {result['elapsed_s']:.2f} s")
+    print(f"completed {result['completed']}/{result['learners']}; days to complete p50 {_fmt(done['p50'])} "
+          f"p90 {_fmt(done['p90'])}; {result['lessons_per_learner']} lessons and "
+          f"{result['reviews_per_learner']} reviews per learner")
+    print(f"\n{'profile':<16} {'learners':>8} {'done':>6} {'days p50':>9} {'p90':>6} {'stage p50':>10}")
+    for name, row in result["profiles"].items():
+        print(f"{name:<16} {row['learners']:>8} {row['completed']:>6} {_fmt(row['days_to_complete']['p50']):>9} "
+              f"{_fmt(row['days_to_complete']['p90']):>6} {_fmt(row['final_stage_p50']):>10}")
+    print(f"\n{'stage':<28} {'reached':>7} {'passed':>6} {'days p50':>9} {'p90':>5} {'max':>5} {'holds':>6}  "
+          f"stalls (learner-days by reason) | lessons/session planned->delivered")
+    for row in result["stages"]:
+        days = row["days"]
+        stalls = ", ".join(f"{reason} {n}" for reason, n in row["stall_reasons"].items()) or "-"
+        mix = " ".join(f"{bucket} {c['planned']:g}->{c['delivered']:g}" for bucket, c in row["composition_per_session"].items())
+        print(f"{str(row['stage_id'])[:28]:<28} {row['reached']:>7} {row['passed']:>6} {_fmt(days['p50']):>9} "
+              f"{_fmt(days['p90']):>5} {_fmt(days['max']):>5} {row['hold_days']:>6}  {stalls} | {mix or '-'}")
+
+
+def parse_profiles(raw: Optional[str]) -> Dict[str, float]:
+    if not raw:
+        return {name: 1.0 for name in PROFILES}
+    weights: Dict[str, float] = {}
+    for part in raw.split(","):
+        name, _, weight = part.strip().partition(":")
+        if name not in PROFILES:
+            raise ValueError(f"unknown profile '{name}' (choices: {', '.join(PROFILES)})")
+        weights[name] = float(weight) if weight else 1.0
+    if sum(weights.values()) <= 0:
+        raise ValueError("--profiles weights must add up to more than 0")
+    return weights
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Simulate learners through a learning path with the rules from src/core/lesson_engine.js.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'tests/' (default: current dir)")
+    ap.add_argument("--check", action="store_true", help="Only replay the recorded JS cases")
+    ap.add_argument("--path", choices=sorted(PATH_FILES), default="guided", help="Path type (default: guided)")
+    ap.add_argument("--path-file", help="Path config JSON to simulate instead of the shipped one (e.g. a tuned copy)")
+    ap.add_argument("--learners", type=int, default=1000)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--daily-lessons", type=int, default=10, help="Lessons per day, clamped to 1..20 like the app (default: 10)")
+    ap.add_argument("--profiles", help=f"Learner mix as name:weight pairs, e.g. average:3,struggling:1 (default: all of {', '.join(PROFILES)})")
+    ap.add_argument("--accuracy-sd", type=float, default=0.04, help="Per-learner accuracy spread (default: 0.04)")
+    ap.add_argument("--template-sd", type=float, default=0.05, help="Per-learner, per-template accuracy spread (default: 0.05)")
+    ap.add_argument("--hint-rate", type=float, default=0.1, help="P(hint) on a correct answer (default: 0.1)")
+    ap.add_argument("--skip-rate", type=float, default=0.0, help="P(no study on a given day) (default: 0)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes (default: 1, serial)")
+    ap.add_argument("--out", help="Write the full result JSON here")
+    args = ap.parse_args()
+
+    root = Path(args.root).resolve()
+    failures = run_case_tests(root)
+    for msg in failures:
+        print(f"[FAIL ] {msg}", file=sys.stderr)
+    if failures:
+        print(f"\nLesson engine port disagrees with {CASES_PATH.as_posix()}; not simulating.", file=sys.stderr)
+        return 1
+    if args.check:
+        print(f"Lesson engine cases: PASS ({CASES_PATH.as_posix()})")
+        return 0
+
+    try:
+        weights = parse_profiles(args.profiles)
+        path_config = load_path_config(root, args.path, args.path_file)
+    except (ValueError, OSError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+
+    verbs = load_verbs(root)
+    template_ids = load_lesson_template_ids(root)
+    ctx = SimContext(
+        path_type=args.path,
+        path_config=path_config,
+        verbs_by_id={v["id"]: v for v in verbs},
+        pairs=tuple((v["id"], tid) for v in verbs for tid in template_ids),
+        template_ids=tuple(template_ids),
+        days=args.days,
+        daily_lessons=min(20, max(1, args.daily_lessons)),
+        accuracy_sd=args.accuracy_sd,
+        template_sd=args.template_sd,
+        hint_rate=args.hint_rate,
+        skip_rate=args.skip_rate,
+        seed=args.seed,
+    )
+    result = simulate(ctx, max(1, args.learners), weights, max(1, args.jobs))
+    print_summary(result)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# romaji.py
+#
+# Python reference for the romaji -> kana transducer in src/core/index.js
+# (romajiToKana / normalizeAnswer), plus a builder for its table.
+#
+# The conversion is one declarative mapping compiled into a longest-match DFA:
+# - ROMAJI_MAP: syllables and small kana (kept identical to ROMAJI_MAP in
+#   src/core/index.js; --check fails if they drift apart)
+# - ROMAJI_RULES: ん handling (docs/ROMAJI_INPUT_SPEC.md 2.4): a lone n, nn,
+#   n', "n " and a literal n for ny without a vowel
+# - SOKUON_CONSONANTS: a run of two or more of the same consonant is one っ
+#   (2.3); the doubled state loops, so kittta is きった.
+# Each accepting state emits kana and may hand matched characters back (keep),
+# which is how っ leaves the consonant for the next syllable.
+#
+# Table layout (compact JSON, same as Core's compiled table):
+#   {
+#     "format": 1,
+#     "alphabet": " 'ab...",   # symbol index -> character
+#     "next": [...],           # next[state * len(alphabet) + symbol]; 0 = no edge
+#     "emit": [...],           # kana per state, null if not accepting
+#     "keep": [...]            # matched characters handed back per state
+#   }
+#
+# --check replays tests/romaji_to_kana_tests.v1.json and fuzzes the table
+# against scan_romaji_to_kana, a rule-by-rule reading of the spec.
+# scripts/bench/romaji.py measures throughput on long inputs.
+#
+# Usage:
+#   python scripts/romaji.py --root . --check
+#   python scripts/romaji.py --root . --out /tmp/romaji_table.json
+#   python scripts/romaji.py --root . --fuzz 200000
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from validate_data import find_project_root, load_json
+
+ROMAJI_TABLE_FORMAT = 1
+CASES_PATH = Path("tests") / "romaji_to_kana_tests.v1.json"
+CORE_PATH = Path("src") / "core" / "index.js"
+
+ROMAJI_MAP: Dict[str, str] = {
+    "a": "あ", "i": "い", "u": "う", "e": "え", "o": "お",
+    "ka": "か", "ki": "き", "ku": "く", "ke": "け", "ko": "こ",
+    "sa": "さ", "shi": "し", "si": "し", "su": "す", "se": "せ", "so": "そ",
+    "ta": "た", "chi": "ち", "ti": "ち", "tsu": "つ", "tu": "つ", "te": "て", "to": "と",
+    "na": "な", "ni": "に", "nu": "ぬ", "ne": "ね", "no": "の",
+    "ha": "は", "hi": "ひ", "fu": "ふ", "hu": "ふ", "he": "へ", "ho": "ほ",
+    "ma": "ま", "mi": "み", "mu": "む", "me": "め", "mo": "も",
+    "ya": "や", "yu": "ゆ", "yo": "よ",
+    "ra": "ら", "ri": "り", "ru": "る", "re": "れ", "ro": "ろ",
+    "wa": "わ", "wo": "を",
+    "ga": "が", "gi": "ぎ", "gu": "ぐ", "ge": "げ", "go": "ご",
+    "za": "ざ", "ji": "じ", "zi": "じ", "zu": "ず", "ze": "ぜ", "zo": "ぞ",
+    "da": "だ", "di": "ぢ", "du": "づ", "de": "で", "do": "ど",
+    "ba": "ば", "bi": "び", "bu": "ぶ", "be": "べ", "bo": "ぼ",
+    "pa": "ぱ", "pi": "ぴ", "pu": "ぷ", "pe": "ぺ", "po": "ぽ",
+    "kya": "きゃ", "kyu": "きゅ", "kyo": "きょ",
+    "sha": "しゃ", "shu": "しゅ", "sho": "しょ",
+    "cha": "ちゃ", "chu": "ちゅ", "cho": "ちょ",
+    "nya": "にゃ", "nyu": "にゅ", "nyo": "にょ",
+    "hya": "ひゃ", "hyu": "ひゅ", "hyo": "ひょ",
+    "mya": "みゃ", "myu": "みゅ", "myo": "みょ",
+    "rya": "りゃ", "ryu": "りゅ", "ryo": "りょ",
+    "gya": "ぎゃ", "gyu": "ぎゅ", "gyo": "ぎょ",
+    "ja": "じゃ", "ju": "じゅ", "jo": "じょ",
+    "bya": "びゃ", "byu": "びゅ", "byo": "びょ",
+    "pya": "ぴゃ", "pyu": "ぴゅ", "pyo": "ぴょ",
+    "xa": "ぁ", "xi": "ぃ", "xu": "ぅ", "xe": "ぇ", "xo": "ぉ",
+    "la": "ぁ", "li": "ぃ", "lu": "ぅ", "le": "ぇ", "lo": "ぉ",
+    "xya": "ゃ", "xyu": "ゅ", "xyo": "ょ",
+    "lya": "ゃ", "lyu": "ゅ", "lyo": "ょ",
+    "xtsu": "っ", "ltsu": "っ",
+}
+
+# (key, kana, matched characters left for the next match); mirrors ROMAJI_RULES in core.
+ROMAJI_RULES: List[Tuple[str, str, int]] = [
+    ("n", "ん", 0),
+    ("nn", "ん", 0),
+    ("n'", "ん", 0),
+    ("n ", "ん", 0),
+    ("ny", "n", 1),
+]
+
+SOKUON_CONSONANTS = "bcdfghjklmpqrstvwxyz"
+VOWELS = "aiueo"
+
+# Characters JS /\s/ matches (str.isspace differs on a few).
+JS_WHITESPACE = frozenset("\t\n\v\f\r \u00a0\u1680\u2028\u2029\u202f\u205f\u3000\ufeff"
+                          + "".join(chr(cp) for cp in range(0x2000, 0x200B)))
+JS_WHITESPACE_RE = re.compile("[" + re.escape("".join(sorted(JS_WHITESPACE))) + "]+")
+
+JS_MAP_RE = re.compile(r"const ROMAJI_MAP = \{(.*?)\n  \};", re.S)
+JS_ENTRY_RE = re.compile(r"^\s*\"?([a-z']+)\"?: \"([^\"]+)\",$", re.M)
+
+
+def is_hiragana(ch: str) -> bool:
+    return 0x3041 <= ord(ch) <= 0x309F
+
+
+def is_katakana(ch: str) -> bool:
+    return 0x30A1 <= ord(ch) <= 0x30FF
+
+
+def to_hiragana(text: str) -> str:
+    return "".join(chr(ord(ch) - 0x60) if is_katakana(ch) else ch for ch in text)
+
+
+def compile_romaji_table(mapping: Dict[str, str]) -> Dict[str, Any]:
+    """The DFA for `mapping` + ROMAJI_RULES + sokuon runs; state numbering matches Core."""
+    entries = [(key, kana, 0) for key, kana in mapping.items()] + ROMAJI_RULES
+    alphabet = "".join(sorted(set("".join(key for key, _, _ in entries) + SOKUON_CONSONANTS)))
+    width = len(alphabet)
+    symbols = {ch: i for i, ch in enumerate(alphabet)}
+    nxt: List[int] = []
+    emit: List[Optional[str]] = []
+    keep: List[int] = []
+
+    def add_state() -> int:
+        nxt.extend([0] * width)
+        emit.append(None)
+        keep.append(0)
+        return len(emit) - 1
+
+    def step(state: int, ch: str) -> int:
+        slot = state * width + symbols[ch]
+        if not nxt[slot]:
+            nxt[slot] = add_state()
+        return nxt[slot]
+
+    add_state()
+    for key, kana, kept in entries:
+        state = 0
+        for ch in key:
+            state = step(state, ch)
+        emit[state] = kana
+        keep[state] = kept
+    for ch in SOKUON_CONSONANTS:
+        doubled = step(step(0, ch), ch)
+        emit[doubled] = "っ"
+        keep[doubled] = 1
+        nxt[doubled * width + symbols[ch]] = doubled
+    return {"format": ROMAJI_TABLE_FORMAT, "alphabet": alphabet, "next": nxt, "emit": emit, "keep": keep}
+
+
+class RomajiTransducer:
+    """Runs a compiled table; romaji_to_kana equals Core.romajiToKana."""
+
+    def __init__(self, table: Dict[str, Any]) -> None:
+        self.width = len(table["alphabet"])
+        self.symbols = {ch: i for i, ch in enumerate(table["alphabet"])}
+        self.next = table["next"]
+        self.emit = table["emit"]
+        self.keep = table["keep"]
+
+    def romaji_to_kana(self, text: Optional[str]) -> str:
+        if text is None:
+            return ""
+        lower = str(text).lower()
+        symbols, width, nxt, emit, keep = self.symbols, self.width, self.next, self.emit, self.keep
+        out: List[str] = []
+        i, n = 0, len(lower)
+        while i < n:
+            ch = lower[i]
+            if is_hiragana(ch):
+                out.append(ch)
+                i += 1
+                continue
+            if is_katakana(ch):
+                out.append(to_hiragana(ch))
+                i += 1
+                continue
+            if ch in JS_WHITESPACE:
+                out.append(" ")
+                i += 1
+                continue
+            if ch == "'":
+                i += 1
+                continue
+            state = matched = 0
+            end = i
+            for j in range(i, n):
+                symbol = symbols.get(lower[j])
+                if symbol is None:
+                    break
+                state = nxt[state * width + symbol]
+                if not state:
+                    break
+                if emit[state] is not None:
+                    matched, end = state, j + 1
+            if matched:
+                out.append(emit[matched])
+                i = end - keep[matched]
+                continue
+            out.append(ch)
+            i += 1
+        return "".join(out)
+
+    def normalize_answer(self, text: Optional[str]) -> str:
+        """Equal to Core.normalizeAnswer."""
+        if text is None:
+            return ""
+        text = re.sub(r"[.,!?]", " ", str(text))
+        text = JS_WHITESPACE_RE.sub(" ", text).strip(" ")
+        kana = to_hiragana(self.romaji_to_kana(text.lower()))
+        return "".join(ch for ch in kana if ch not in JS_WHITESPACE)
+
+
+def scan_romaji_to_kana(text: str) -> str:
+    """The spec's rules applied one character at a time (no table); the fuzz oracle."""
+    lower = text.lower()
+    longest = max(len(key) for key in ROMAJI_MAP)
+    out: List[str] = []
+    i = 0
+    while i < len(lower):
+        ch = lower[i]
+        nxt = lower[i + 1] if i + 1 < len(lower) else ""
+        if is_hiragana(ch):
+            out.append(ch)
+        elif is_katakana(ch):
+            out.append(to_hiragana(ch))
+        elif ch in JS_WHITESPACE:
+            out.append(" ")
+        elif ch == "'":
+            pass
+        elif not ("a" <= ch <= "z"):
+            out.append(ch)
+        elif ch == "n" and nxt in ("'", " ", "n"):
+            out.append("ん")
+            i += 2
+            continue
+        elif ch == "n" and (not nxt or (nxt not in VOWELS and nxt != "y")):
+            out.append("ん")
+        elif ch in SOKUON_CONSONANTS and nxt == ch:
+            run = len(lower[i:]) - len(lower[i:].lstrip(ch))
+            out.append("っ")
+            i += run - 1
+            continue
+        else:
+            for size in range(longest, 0, -1):
+                if lower[i:i + size] in ROMAJI_MAP:
+                    out.append(ROMAJI_MAP[lower[i:i + size]])
+                    i += size
+                    break
+            else:
+                out.append(ch)
+                i += 1
+            continue
+        i += 1
+    return "".join(out)
+
+
+def core_map_problems(root: Path) -> List[str]:
+    """Differences between ROMAJI_MAP here and in src/core/index.js (order included)."""
+    match = JS_MAP_RE.search((root / CORE_PATH).read_text(encoding="utf-8"))
+    if not match:
+        return [f"ROMAJI_MAP not found in {CORE_PATH.as_posix()}"]
+    js_entries = JS_ENTRY_RE.findall(match.group(1))
+    py_entries = list(ROMAJI_MAP.items())
+    if js_entries == py_entries:
+        return []
+    js_map = dict(js_entries)
+    problems = [f"{key!r}: core {js_map.get(key)!r}, romaji.py {kana!r}"
+                for key, kana in py_entries if js_map.get(key) != kana]
+    problems += [f"{key!r}: only in core" for key, _ in js_entries if key not in ROMAJI_MAP]
+    return problems or ["ROMAJI_MAP entries are in a different order than in core"]
+
+
+def run_cases(root: Path, transducer: RomajiTransducer) -> Tuple[int, List[str]]:
+    cases = load_json(root / CASES_PATH)["cases"]
+    failures = []
+    for case in cases:
+        got = transducer.romaji_to_kana(case["input"])
+        normalized = transducer.normalize_answer(case["input"])
+        if got != case["expected_kana"] or normalized != case["expected_kana"]:
+            failures.append(f"{case['case_id']} {case['input']!r}: expected {case['expected_kana']!r}, "
+                            f"got {got!r} (normalized {normalized!r})")
+    return len(cases), failures
+
+
+def fuzz(transducer: RomajiTransducer, count: int, seed: int = 0) -> List[str]:
+    """Random short inputs where the table and scan_romaji_to_kana disagree."""
+    rng = random.Random(seed)
+    pool = "aiueo" + "nnn" + SOKUON_CONSONANTS + "' \t-.Aカあー"
+    failures = []
+    for _ in range(count):
+        text = "".join(rng.choice(pool) for _ in range(rng.randint(1, 10)))
+        got, want = transducer.romaji_to_kana(text), scan_romaji_to_kana(text)
+        if got != want:
+            failures.append(f"{text!r}: table {got!r}, spec {want!r}")
+    return failures
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build and check the romaji -> kana transducer table.")
+    ap.add_argument("--root", default=".", help="Project root containing 'src/' and 'tests/' (default: current dir)")
+    ap.add_argument("--out", help="Write the compiled table JSON here")
+    ap.add_argument("--check", action="store_true", help="Only run the checks (map sync, test cases, fuzz)")
+    ap.add_argument("--fuzz", type=int, default=20000, help="Random inputs compared against the spec rules (default: 20000)")
+    args = ap.parse_args()
+
+    root = find_project_root(Path(args.root))
+    problems = core_map_problems(root)
+    for msg in problems:
+        print(f"[ERROR] ROMAJI_MAP differs from {CORE_PATH.as_posix()}: {msg}", file=sys.stderr)
+    if problems:
+        return 1
+
+    table = compile_romaji_table(ROMAJI_MAP)
+    transducer = RomajiTransducer(table)
+    total, failures = run_cases(root, transducer)
+    failures += fuzz(transducer, args.fuzz)
+    for msg in failures[:20]:
+        print(f"[FAIL ] {msg}", file=sys.stderr)
+    if failures:
+        print(f"{len(failures)} romaji check(s) failed.", file=sys.stderr)
+        return 1
+    states = len(table["emit"])
+    print(f"Romaji table: {states} states x {len(table['alphabet'])} symbols, "
+          f"{sum(1 for e in table['emit'] if e is not None)} accepting; "
+          f"{total} test cases and {args.fuzz} fuzz inputs pass")
+
+    if args.out and not args.check:
+        Path(args.out).write_text(json.dumps(table, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out} ({Path(args.out).stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,10 @@ const core = require("../src/core/index.js");
 const lessonEngine = require("../src/core/lesson_engine.js");
 
 const root = path.resolve(__dirname, "..");
+// `node scripts/run_tests.js --record` rewrites the expected outputs of the
+// recorded case files (tests/*_cases.v1.json) from the current engine instead
+// of checking them; review the diff before committing.
+const record = process.argv.includes("--record");
 
 function loadJson(relPath) {
   const full = path.join(root, relPath);
@@ -20,6 +24,38 @@ function loadJsonl(relPath) {
     .map((line) => JSON.parse(line));
 }
 
+function stringifyInlineArrays(value) {
+  // Like JSON.stringify(value, null, 2), with arrays of scalars kept on one line.
+  return JSON.stringify(value, null, 2).replace(/\[[^[\]{}]*?\]/g, (match) =>
+    match.replace(/\s*\n\s*/g, " ").replace("[ ", "[").replace(/ \]$/, "]")
+  );
+}
+
+function stringifyOneCasePerLine(tests) {
+  // Like JSON.stringify(tests, null, 2), with each flat case on one line.
+  const { cases, ...head } = tests;
+  const lines = cases.map(
+    (testCase) =>
+      `    { ${Object.keys(testCase)
+        .map((key) => `${JSON.stringify(key)}: ${JSON.stringify(testCase[key])}`)
+        .join(", ")} }`
+  );
+  return `${JSON.stringify(head, null, 2).slice(0, -2)},\n  "cases": [\n${lines.join(",\n")}\n  ]\n}`;
+}
+
+function writeRecordedCases(relPath, tests, label, stringify = (value) => JSON.stringify(value, null, 2)) {
+  const full = path.join(root, relPath);
+  const before = fs.readFileSync(full, "utf8");
+  let body = `${stringify(tests)}\n`;
+  if (body !== before) {
+    tests.generated_on = new Date().toISOString().slice(0, 10);
+    body = `${stringify(tests)}\n`;
+    fs.writeFileSync(full, body);
+  }
+  console.log(`${label}: RECORDED (${body === before ? "unchanged" : `${relPath} updated`})`);
+  return 0;
+}
+
 function runConjugationTests() {
   const tests = loadJson("tests/conjugation_golden_tests.v1.json");
   const verbs = loadJsonl("data/verbs/verbs.v2.jsonl");
@@ -274,6 +310,66 @@ function runStorageRecoveryTests() {
   return failures;
 }
 
+function runProgressSyncTests() {
+  let failures = 0;
+  if (typeof core.buildProgressPatch !== "function" || typeof core.applyProgressSnapshot !== "function") {
+    console.error("Progress sync tests: missing core.buildProgressPatch / core.applyProgressSnapshot");
+    return 1;
+  }
+
+  const cards = {
+    "a::x": { card_id: "a::x", stage: "S1" },
+    "b::x": { card_id: "b::x", stage: "S2" },
+  };
+  const delta = core.buildProgressPatch({
+    cards,
+    dirtyIds: ["a::x", "gone::x", "a::x"],
+    events: [{ card_id: "a::x", correct: true }],
+  });
+  if (
+    JSON.stringify(Object.keys(delta.cards)) !== JSON.stringify(["a::x", "gone::x"]) ||
+    delta.cards["a::x"] !== cards["a::x"] ||
+    delta.cards["gone::x"] !== null ||
+    delta.events.length !== 1 ||
+    delta.replace !== false
+  ) {
+    console.error("Progress sync mismatch: delta patch should carry dirty cards only, null for deleted.");
+    failures += 1;
+  }
+
+  const full = core.buildProgressPatch({ cards, dirtyIds: ["a::x"], replace: true });
+  if (!full.replace || Object.keys(full.cards).length !== 2 || full.events.length !== 0) {
+    console.error("Progress sync mismatch: replace patch should carry every card.");
+    failures += 1;
+  }
+
+  const merged = core.applyProgressSnapshot(cards, {
+    revision: 5,
+    full: false,
+    cards: { "c::x": { card_id: "c::x", stage: "S1" } },
+    deleted: ["b::x"],
+  });
+  if (JSON.stringify(Object.keys(merged).sort()) !== JSON.stringify(["a::x", "c::x"]) || !cards["b::x"]) {
+    console.error("Progress sync mismatch: delta snapshot should add/remove cards without mutating the input.");
+    failures += 1;
+  }
+
+  const replaced = core.applyProgressSnapshot(cards, { revision: 6, full: true, cards: { "c::x": {} }, deleted: [] });
+  if (JSON.stringify(Object.keys(replaced)) !== JSON.stringify(["c::x"])) {
+    console.error("Progress sync mismatch: full snapshot should replace the store.");
+    failures += 1;
+  }
+  if (core.applyProgressSnapshot(cards, { error: "nope" }) !== cards) {
+    console.error("Progress sync mismatch: invalid snapshot should leave the store unchanged.");
+    failures += 1;
+  }
+
+  if (failures === 0) {
+    console.log("Progress sync tests: PASS");
+  }
+  return failures;
+}
+
 function runSrsDemotionTests() {
   let failures = 0;
   const now = new Date("2020-01-01T00:00:00Z");
@@ -309,6 +405,257 @@ function runSrsDemotionTests() {
   return failures;
 }
 
+function runSrsReviewCaseTests() {
+  const relPath = "tests/srs_review_cases.v1.json";
+  const full = path.join(root, relPath);
+  if (!fs.existsSync(full)) {
+    console.log("SRS review case tests: SKIP (no file present)");
+    return 0;
+  }
+  const tests = loadJson(relPath);
+  const dayMs = 86400000;
+  const base = new Date("2020-01-01T00:00:00Z").getTime();
+  const at = (day) => new Date(base + Math.round(day * dayMs));
+  let failures = 0;
+
+  tests.cases.forEach((testCase) => {
+    const card = core.createCard("verb_srs", "plain_past", at(0));
+    Object.assign(card, testCase.card);
+    testCase.steps.forEach((step, index) => {
+      const now = at(step.day);
+      const result = core.applyReviewResult(card, { correct: step.correct, hintUsed: step.hint_used, now });
+      const actual = {
+        stage: card.stage,
+        learning_step: card.learning_step,
+        // Whole days, so the check holds across DST changes in the local zone.
+        due_in_days: card.due_at === null ? null : Math.round((new Date(card.due_at) - now) / dayMs),
+        requeue_after: result.requeueAfter,
+        is_leech: card.is_leech,
+        success_count_total: card.success_count_total,
+        failure_count_total: card.failure_count_total,
+      };
+      if (record) {
+        testCase.expected[index] = actual;
+        return;
+      }
+      const expected = testCase.expected[index];
+      Object.keys(expected).forEach((key) => {
+        if (actual[key] !== expected[key]) {
+          console.error(
+            `SRS case mismatch ${testCase.case_id} step ${index + 1}: ${key} expected ${expected[key]}, got ${actual[key]}`
+          );
+          failures += 1;
+        }
+      });
+    });
+  });
+
+  tests.queue_cases.forEach((testCase) => {
+    const now = at(10);
+    const cards = testCase.due_in_days.map((offset, index) => {
+      const card = core.createCard(`v${index}`, "plain_past", now);
+      card.due_at = offset === null ? null : at(10 + offset).toISOString();
+      return card;
+    });
+    const order = core.buildDailyReviewQueue(cards, now).map((card) => Number(card.verb_id.slice(1)));
+    if (record) {
+      testCase.expected_order = order;
+    } else if (order.join(",") !== testCase.expected_order.join(",")) {
+      console.error(
+        `SRS queue mismatch ${testCase.case_id}: expected [${testCase.expected_order}], got [${order}]`
+      );
+      failures += 1;
+    }
+  });
+
+  if (record) {
+    return writeRecordedCases(relPath, tests, "SRS review case tests");
+  }
+  if (failures === 0) {
+    console.log("SRS review case tests: PASS");
+  }
+  return failures;
+}
+
+function runLessonEngineCaseTests() {
+  const relPath = "tests/lesson_engine_cases.v1.json";
+  const full = path.join(root, relPath);
+  if (!fs.existsSync(full)) {
+    console.log("Lesson engine case tests: SKIP (no file present)");
+    return 0;
+  }
+  const tests = loadJson(relPath);
+  const verbs = loadJsonl("data/verbs/verbs.v2.jsonl");
+  const verbsById = {};
+  verbs.forEach((verb) => {
+    verbsById[verb.id] = verb;
+  });
+  const templateIds = loadJson("data/conjugations/conjugation_templates.v3.json")
+    .filter((tpl) => tpl.active && tpl.id !== "plain_dictionary")
+    .map((tpl) => tpl.id);
+  const paths = {
+    guided: loadJson("data/learning_paths/learning_path.guided.v1.json"),
+    textbook_genki: loadJson("data/learning_paths/learning_path.genki_aligned.v1.json"),
+  };
+  // Recorded in UTC: hold/stabilization dates add local calendar days, which
+  // differ by an hour across DST changes in other zones.
+  const savedTz = process.env.TZ;
+  process.env.TZ = "UTC";
+  let failures = 0;
+
+  try {
+    tests.cases.forEach((testCase) => {
+      const pathConfig = paths[testCase.path];
+      const cardsById = {};
+      Object.keys(testCase.cards).forEach((cardId) => {
+        const [verbId, templateId] = cardId.split("::");
+        const [success, failure] = testCase.cards[cardId];
+        cardsById[cardId] = {
+          verb_id: verbId,
+          conjugation_id: templateId,
+          success_count_total: success,
+          failure_count_total: failure,
+        };
+      });
+      // Same candidate list as startLessonsFlow: verbs x unlocked templates without a card.
+      const pathState = lessonEngine.normalizePathState(testCase.path_state, testCase.now_iso);
+      const unlocked = new Set(lessonEngine.getUnlockedTemplateIds(pathConfig, pathState));
+      const lessonTemplateIds = templateIds.filter((templateId) => unlocked.has(templateId));
+      const unseenPairs = [];
+      verbs.forEach((verb) => {
+        lessonTemplateIds.forEach((templateId) => {
+          if (!cardsById[`${verb.id}::${templateId}`]) {
+            unseenPairs.push({ verb_id: verb.id, conjugation_id: templateId });
+          }
+        });
+      });
+      const gate = lessonEngine.evaluatePathAdvance({
+        pathConfig,
+        pathState: testCase.path_state,
+        cardsById,
+        verbsById,
+        nowIso: testCase.now_iso,
+      });
+      const built = lessonEngine.buildLessonQueue({
+        pathType: testCase.path,
+        pathConfig,
+        pathState: gate.pathState,
+        unseenPairs,
+        cardsById,
+        verbsById,
+        mistakeTemplateCounts: testCase.mistake_template_counts,
+        dailyCount: Math.min(testCase.daily_count, unseenPairs.length),
+        gateDiagnostics: gate.gate,
+        nowIso: testCase.now_iso,
+        rng: lessonEngine.createSeededRng(testCase.seed),
+      });
+      const composition = built.details.composition;
+      const actual = {
+        gate: {
+          passed: gate.gate.passed,
+          reason: gate.gate.reason,
+          failed_reasons: gate.gate.failed_reasons,
+          advanced: gate.advanced,
+          completed: gate.completed,
+          answered: gate.gate.answered,
+          accuracy: gate.gate.accuracy,
+          class_accuracy: gate.gate.class_accuracy,
+          days_in_stage: gate.gate.days_in_stage,
+          failed_gate_count: gate.gate.failed_gate_count,
+          band_id: gate.gate.profile ? gate.gate.profile.band_id : null,
+        },
+        path_state: { ...gate.pathState, ...built.pathStatePatch },
+        composition: {
+          daysInStage: composition.daysInStage,
+          unlockedStageCount: composition.unlockedStageCount,
+          stageIsNarrow: composition.stageIsNarrow,
+          stabilizationActive: Boolean(composition.stabilizationActive),
+          boost: composition.boost,
+          counts: composition.counts,
+        },
+        active_current_template_ids: built.details.activeCurrentTemplateIds,
+        weakness_template_ids: built.details.weaknessTemplateIds,
+        queue: built.queue.map((item) => [item.verb_id, item.conjugation_id, item.source_bucket]),
+        bucket_counts: built.details.bucketCounts,
+        iku_injected: built.details.irregularPolicy.ikuInjected,
+      };
+      if (record) {
+        testCase.expected = actual;
+        return;
+      }
+      Object.keys(testCase.expected).forEach((key) => {
+        const want = JSON.stringify(testCase.expected[key]);
+        const got = JSON.stringify(actual[key]);
+        if (want !== got) {
+          console.error(`Lesson engine case mismatch ${testCase.case_id} (${testCase.why}): ${key}`);
+          console.error(`  expected ${want}`);
+          console.error(`  got      ${got}`);
+          failures += 1;
+        }
+      });
+    });
+  } finally {
+    if (savedTz === undefined) {
+      delete process.env.TZ;
+    } else {
+      process.env.TZ = savedTz;
+    }
+  }
+
+  if (record) {
+    return writeRecordedCases(relPath, tests, "Lesson engine case tests", stringifyInlineArrays);
+  }
+  if (failures === 0) {
+    console.log("Lesson engine case tests: PASS");
+  }
+  return failures;
+}
+
+function runExampleIndexCaseTests() {
+  const relPath = "tests/example_index_cases.v2.json";
+  const full = path.join(root, relPath);
+  if (!fs.existsSync(full)) {
+    console.log("Example index case tests: SKIP (no file present)");
+    return 0;
+  }
+  // Self-contained: the cases run on the fixture in the file, not the shipped
+  // sentences, so editing example_sentences.v4.json never invalidates them.
+  const tests = loadJson(relPath);
+  const exampleData = tests.example_data;
+  const verbsById = {};
+  tests.verbs.forEach((verb) => {
+    verbsById[verb.id] = verb;
+  });
+  let failures = 0;
+
+  if (record) {
+    tests.cases = [];
+    tests.verbs.forEach((verb) => {
+      tests.template_ids.forEach((templateId) => {
+        const result = core.resolveExampleSentence(exampleData, verb, templateId);
+        tests.cases.push({ verb_id: verb.id, template_id: templateId, status: result.status, text: result.text });
+      });
+    });
+    return writeRecordedCases(relPath, tests, "Example index case tests", stringifyOneCasePerLine);
+  }
+
+  tests.cases.forEach((testCase) => {
+    const actual = core.resolveExampleSentence(exampleData, verbsById[testCase.verb_id], testCase.template_id);
+    if (actual.status !== testCase.status || actual.text !== testCase.text) {
+      console.error(
+        `Example index case mismatch ${testCase.verb_id}|${testCase.template_id}: ` +
+          `expected ${testCase.status} "${testCase.text}", got ${actual.status} "${actual.text}"`
+      );
+      failures += 1;
+    }
+  });
+
+  if (failures === 0) {
+    console.log("Example index case tests: PASS");
+  }
+  return failures;
+}
+
 function runNewConjugationTests() {
   const verbs = loadJsonl("data/verbs/verbs.v2.jsonl");
   const exceptions = loadJson("data/exceptions/verb_exceptions.v1.json");
@@ -785,7 +1132,11 @@ const failures =
   runLessonPracticeOutcomeTests() +
   runUnlockContextTests() +
   runStorageRecoveryTests() +
+  runProgressSyncTests() +
   runSrsDemotionTests() +
+  runSrsReviewCaseTests() +
+  runLessonEngineCaseTests() +
+  runExampleIndexCaseTests() +
   runNewConjugationTests() +
   runObligationAliasTests() +
   runLessonEngineTests() +
@@ -3,22 +3,1315 @@
 Local static file server with better MIME types than `python -m http.server`.
 
 This fixes font loading in some browsers (e.g. .woff2 served as octet-stream).
+It also answers conditional requests (ETag / Last-Modified -> 304) and serves
+gzip (and brotli, if the `brotli` package is installed) variants of
+compressible files, built once per file version and kept in a byte-bounded
+LRU cache (`--cache-mb`, invalidated by mtime and size).
+Uncompressed bodies are sent with sendfile(2) where available, single and
+multi-range `Range` requests are honored (206 / 416), and connections are
+kept alive (HTTP/1.1). Content-hashed build outputs (see scripts/build_bundle.py)
+are sent with an immutable, one-year Cache-Control; HTML gets a short max-age
+(`--html-max-age`). scripts/build_assets.py builds such a tree (dist/) with
+every asset renamed to its content hash; serve it with `--directory dist`.
+
+With `--progress-db`, it also serves a small progress API backed by SQLite
+(WAL mode), so the app can sync changed cards instead of rewriting the whole
+card store in localStorage:
+
+  GET   /api/progress?profile=P[&since=REV]   snapshot (or changes after REV)
+  PATCH /api/progress?profile=P               {"cards": {id: card|null}, "events": [...], "replace": bool}
+  GET   /api/progress/events?profile=P[&after=ID][&limit=N]
+
+Every PATCH is one transaction and bumps the profile's revision. Cards are
+last-write-wins; deletions are kept as tombstones so `since` can report them.
+
+Both engines count requests, body bytes and latency (fixed-bucket histograms)
+per path and per content type, plus status codes and file cache hits/misses,
+and expose them in the Prometheus text format at /__metrics. `--access-log`
+writes one JSON line per request.
+
+`--engine asyncio` serves the same responses from a single asyncio event
+loop instead of a thread per connection, which holds up better with many
+idle keep-alive clients; small files are also served from the LRU cache.
+Compare the two with scripts/bench/engines.py.
+
 Run from repo root:
   python scripts/serve.py 8000
+  python scripts/serve.py 8000 --progress-db .cache/progress.sqlite3
+  python scripts/serve.py 8000 --engine asyncio --cache-mb 128
+  python scripts/serve.py 8000 --access-log .cache/access.jsonl
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import bisect
+import contextvars
+import email.utils
+import functools
+import gzip
+import io
+import json
 import mimetypes
+import os
+import posixpath
+import queue
+import re
+import sqlite3
+import stat
 import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
 
+try:
+    import brotli  # optional: pip install brotli
+except Exception:
+    brotli = None
 
-def main() -> int:
-    port = 8000
-    if len(sys.argv) > 1:
-        port = int(sys.argv[1])
+# Content types worth compressing. Fonts in .woff2/.woff are already compressed.
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+    "font/ttf",
+    "font/otf",
+}
+# Below this size the encoding overhead outweighs the savings.
+MIN_COMPRESS_BYTES = 512
+# Build outputs named with a content hash (e.g. data/bundle/app_data.<hex16>.json)
+# never change in place, so clients may keep them forever without revalidating.
+FINGERPRINTED_RE = re.compile(r"\.[0-9a-f]{16}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# HTML entry points (index.html) name the hashed assets, so they get a short
+# TTL instead: inside it a repeat visit makes no requests at all. 0 = no-cache.
+HTML_MAX_AGE = 60
+# More ranges than this in one request is treated as abuse; the full body is sent.
+MAX_RANGES = 16
+# In-memory file cache (identity and compressed bodies); --cache-mb overrides.
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# asyncio engine: request heads larger than this get 431.
+MAX_HEADER_BYTES = 64 * 1024
+
+# Request metrics (Prometheus text format at METRICS_PATH). Histogram bounds in seconds.
+METRICS_PATH = "/__metrics"
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Distinct path labels kept; later paths are counted under "(other)" so scans can't grow memory.
+MAX_METRIC_PATHS = 256
+
+# Progress API limits. A full-store replace of every verb x template card is
+# a few MB; single-review deltas are a few hundred bytes.
+PROGRESS_API_PATH = "/api/progress"
+MAX_PROGRESS_BODY = 16 * 1024 * 1024
+MAX_EVENTS_PAGE = 5000
+PROFILE_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+MAX_CARD_ID_LENGTH = 200
+
+# A send plan is a list of literal byte chunks and (offset, length) file segments.
+SendPlan = List[object]
+
+
+def file_etag(st: os.stat_result, encoding: str = "") -> str:
+    """Strong validator derived from mtime + size (+ content-coding)."""
+    tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    if encoding:
+        tag += f"-{encoding}"
+    return f'"{tag}"'
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map content-coding -> q value for an Accept-Encoding header."""
+    result: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        result[token] = q
+    return result
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match."""
+    if header.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def parse_range_header(header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a `bytes=` Range header into sorted, merged (start, end) pairs.
+
+    Returns None when the header is malformed (the Range is then ignored, as
+    RFC 9110 14.2 allows) and an empty list when no range is satisfiable.
+    """
+    unit, sep, spec = header.partition("=")
+    if not sep or unit.strip().lower() != "bytes":
+        return None
+    ranges: List[Tuple[int, int]] = []
+    parts = [p.strip() for p in spec.split(",") if p.strip()]
+    if not parts or len(parts) > MAX_RANGES:
+        return None
+    for part in parts:
+        first, dash, last = part.partition("-")
+        if not dash:
+            return None
+        first, last = first.strip(), last.strip()
+        try:
+            if not first:
+                # Suffix range: the final N bytes.
+                length = int(last)
+                if length <= 0:
+                    continue
+                start, end = max(0, size - length), size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and start > end:
+                    return None
+                end = min(end, size - 1)
+        except ValueError:
+            return None
+        if start < 0:
+            return None
+        if start < size:
+            ranges.append((start, end))
+
+    ranges.sort()
+    merged: List[Tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def encode_body(raw: bytes, encoding: str) -> Optional[bytes]:
+    """`raw` in the given content-coding ("" = identity); None if the coding is unavailable."""
+    if encoding == "":
+        return raw
+    if encoding == "br":
+        return brotli.compress(raw) if brotli is not None else None
+    if encoding == "gzip":
+        # mtime=0 keeps the output byte-identical across rebuilds.
+        return gzip.compress(raw, compresslevel=9, mtime=0)
+    return None
+
+
+class LruFileCache:
+    """Thread-safe, byte-bounded LRU of file bodies keyed by (path, content-coding).
+
+    "" is the identity body, "gzip"/"br" the compressed variants. Each entry
+    remembers the (mtime_ns, size) it was built from, so an edited file is
+    re-read on its next request and stale bodies are never served. Bodies over
+    `max_entry_bytes` are not kept. The least recently used entries are evicted
+    once the total passes `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, max_entry_bytes: Optional[int] = None) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else self.max_bytes // 8
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, int, bytes]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def peek(self, path: str, st: os.stat_result, encoding: str) -> Optional[bytes]:
+        """The cached body for this file version, or None. Never touches the disk."""
+        key = (path, encoding)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+        return None
+
+    def load(self, path: str, st: os.stat_result, encoding: str) -> Optional[bytes]:
+        """Read (and encode) the file and cache the body if it fits.
+
+        Returns None when the coding is unavailable, or for identity bodies
+        too large to cache (callers stream those from disk instead).
+        """
+        if encoding == "" and st.st_size > self.max_entry_bytes:
+            return None
+        with open(path, "rb") as f:
+            raw = f.read()
+        body = encode_body(raw, encoding)
+        if body is None:
+            return None
+        with self._lock:
+            self.misses += 1
+            if len(body) > self.max_entry_bytes:
+                return body
+            old = self._entries.pop((path, encoding), None)
+            if old is not None:
+                self.size -= len(old[2])
+            self._entries[(path, encoding)] = (st.st_mtime_ns, st.st_size, body)
+            self.size += len(body)
+            while self.size > self.max_bytes and self._entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+        return body
+
+    def get(self, path: str, st: os.stat_result, encoding: str) -> Optional[bytes]:
+        body = self.peek(path, st, encoding)
+        return body if body is not None else self.load(path, st, encoding)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+# -- request logic shared by both engines --------------------------------------
+
+def available_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: str, ctype: str, size: int) -> str:
+    if ctype.split(";")[0] not in COMPRESSIBLE_TYPES or size < MIN_COMPRESS_BYTES:
+        return ""
+    accepted = parse_accept_encoding(accept_encoding)
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return ""
+
+
+def not_modified(headers: Any, etag: str, st: os.stat_result) -> bool:
+    inm = headers.get("If-None-Match")
+    if inm is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+        return etag_matches(inm, etag)
+    ims = headers.get("If-Modified-Since")
+    if ims is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(ims)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        if since is None:
+            return False
+        return int(st.st_mtime) <= int(since.timestamp())
+    return False
+
+
+def range_applies(headers: Any, etag: str, st: os.stat_result) -> bool:
+    """Honor If-Range: only serve a partial body of the current version."""
+    if_range = headers.get("If-Range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Weak validators never match for If-Range.
+        return if_range == etag
+    try:
+        since = email.utils.parsedate_to_datetime(if_range)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+    return since is not None and int(st.st_mtime) == int(since.timestamp())
+
+
+def cache_control_for(path: str, html_max_age: int = HTML_MAX_AGE) -> str:
+    if FINGERPRINTED_RE.search(os.path.basename(path)):
+        return IMMUTABLE_CACHE_CONTROL
+    if html_max_age > 0 and path.endswith((".html", ".htm")):
+        return f"public, max-age={html_max_age}"
+    # Always revalidate: cheap 304s, never stale data during development.
+    return "no-cache"
 
+
+def multipart_ranges(ctype: str, size: int, ranges: List[Tuple[int, int]]) -> Tuple[str, int, SendPlan]:
+    """Content-Type, Content-Length and send plan of a multipart/byteranges body."""
+    boundary = uuid.uuid4().hex
+    plan: SendPlan = []
+    length = 0
+    for start, end in ranges:
+        part_head = (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("latin-1")
+        plan.append(part_head)
+        plan.append((start, end - start + 1))
+        length += len(part_head) + end - start + 1
+    tail = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    plan.append(tail)
+    length += len(tail)
+    return f"multipart/byteranges; boundary={boundary}", length, plan
+
+
+@functools.lru_cache(maxsize=1024)
+def http_date(timestamp: int) -> str:
+    """RFC 9110 IMF-fixdate; memoized because Last-Modified repeats per file version."""
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+def guess_type(path: str) -> str:
+    """SimpleHTTPRequestHandler.guess_type() without a handler instance."""
+    extensions_map = SimpleHTTPRequestHandler.extensions_map
+    _, ext = posixpath.splitext(path)
+    if ext in extensions_map:
+        return extensions_map[ext]
+    if ext.lower() in extensions_map:
+        return extensions_map[ext.lower()]
+    guess, _ = mimetypes.guess_type(path)
+    return guess or "application/octet-stream"
+
+
+@functools.lru_cache(maxsize=4096)
+def translate_path(directory: str, url_path: str) -> str:
+    """SimpleHTTPRequestHandler.translate_path() for an explicit document root (pure, so memoized)."""
+    path = url_path.split("?", 1)[0].split("#", 1)[0]
+    trailing_slash = path.rstrip().endswith("/")
+    try:
+        path = unquote(path, errors="surrogatepass")
+    except UnicodeDecodeError:
+        path = unquote(path)
+    path = posixpath.normpath(path)
+    result = directory
+    for word in filter(None, path.split("/")):
+        if os.path.dirname(word) or word in (os.curdir, os.pardir):
+            continue
+        result = os.path.join(result, word)
+    if trailing_slash:
+        result += "/"
+    return result
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Request counters and latency histograms for both engines, plus an optional access log.
+
+    Series are kept per URL path and per content type as
+    [requests, body bytes, seconds, bucket counts...]; render() adds the file
+    cache counters and writes the Prometheus text exposition format.
+    """
+
+    def __init__(self, cache: Optional[LruFileCache] = None, access_log: Optional[TextIO] = None) -> None:
+        self.cache = cache
+        self.access_log = access_log
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.paths: Dict[str, List[Any]] = {}
+        self.types: Dict[str, List[Any]] = {}
+        self.statuses: Dict[int, int] = {}
+
+    def observe(self, method: str, path: str, ctype: str, status: int, nbytes: int, seconds: float) -> None:
+        bucket = 3 + bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        ctype = ctype.split(";", 1)[0].strip() if ctype else "none"
+        label = "(not found)" if status == HTTPStatus.NOT_FOUND else path
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            series = self.paths.get(label)
+            if series is None:
+                if len(self.paths) >= MAX_METRIC_PATHS:
+                    label = "(other)"
+                series = self.paths.setdefault(label, [0, 0, 0.0] + [0] * (len(LATENCY_BUCKETS) + 1))
+            series[0] += 1
+            series[1] += nbytes
+            series[2] += seconds
+            series[bucket] += 1
+            series = self.types.get(ctype)
+            if series is None:
+                series = self.types.setdefault(ctype, [0, 0, 0.0] + [0] * (len(LATENCY_BUCKETS) + 1))
+            series[0] += 1
+            series[1] += nbytes
+            series[2] += seconds
+            series[bucket] += 1
+            if self.access_log is not None:
+                self.access_log.write(json.dumps({
+                    "ts": round(time.time(), 3), "method": method, "path": path, "status": status,
+                    "content_type": ctype, "bytes": nbytes, "ms": round(seconds * 1000, 3),
+                }, separators=(",", ":")) + "\n")
+
+    def render(self) -> bytes:
+        out: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            groups = [("path", {k: list(v) for k, v in self.paths.items()}),
+                      ("content_type", {k: list(v) for k, v in self.types.items()})]
+            statuses = dict(self.statuses)
+        for label, table in groups:
+            prefix = f"serve_{label}"
+            family(f"{prefix}_requests_total", "counter", f"Requests by {label.replace('_', ' ')}.")
+            out += [f'{prefix}_requests_total{{{label}="{_label(k)}"}} {v[0]}' for k, v in sorted(table.items())]
+            family(f"{prefix}_response_bytes_total", "counter", f"Response body bytes by {label.replace('_', ' ')}.")
+            out += [f'{prefix}_response_bytes_total{{{label}="{_label(k)}"}} {v[1]}' for k, v in sorted(table.items())]
+            family(f"{prefix}_request_duration_seconds", "histogram", "Time from request line to last body byte written.")
+            for k, v in sorted(table.items()):
+                key = f'{label}="{_label(k)}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS + (None,), v[3:]):
+                    cumulative += n
+                    le = "+Inf" if bound is None else repr(bound)
+                    out.append(f'{prefix}_request_duration_seconds_bucket{{{key},le="{le}"}} {cumulative}')
+                out.append(f"{prefix}_request_duration_seconds_sum{{{key}}} {v[2]:.6f}")
+                out.append(f"{prefix}_request_duration_seconds_count{{{key}}} {v[0]}")
+        family("serve_responses_total", "counter", "Responses by status code.")
+        out += [f'serve_responses_total{{code="{code}"}} {n}' for code, n in sorted(statuses.items())]
+        if self.cache is not None:
+            stats = self.cache.stats()
+            lookups = stats["hits"] + stats["misses"]
+            family("serve_file_cache_hits_total", "counter", "File cache lookups answered from memory.")
+            out.append(f"serve_file_cache_hits_total {stats['hits']}")
+            family("serve_file_cache_misses_total", "counter", "File cache lookups that read (and encoded) the file.")
+            out.append(f"serve_file_cache_misses_total {stats['misses']}")
+            family("serve_file_cache_evictions_total", "counter", "Entries evicted to stay under the byte limit.")
+            out.append(f"serve_file_cache_evictions_total {stats['evictions']}")
+            family("serve_file_cache_hit_ratio", "gauge", "hits / (hits + misses) since start.")
+            out.append(f"serve_file_cache_hit_ratio {stats['hits'] / lookups if lookups else 0.0:.6f}")
+            family("serve_file_cache_bytes", "gauge", "Bytes held by the file cache.")
+            out.append(f"serve_file_cache_bytes {stats['bytes']}")
+            family("serve_file_cache_entries", "gauge", "Bodies held by the file cache.")
+            out.append(f"serve_file_cache_entries {stats['entries']}")
+        family("serve_start_time_seconds", "gauge", "Unix time the server started.")
+        out.append(f"serve_start_time_seconds {self.started:.3f}")
+        return ("\n".join(out) + "\n").encode("utf-8")
+
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ProgressError(ValueError):
+    """A request the progress API rejects; carries the HTTP status to send."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ProgressStore:
+    """Per-profile card store and review-event log in one SQLite database.
+
+    The database runs in WAL mode, so snapshot reads never wait for a writer.
+    Writers are serialized with a lock in front of SQLite. That queues them
+    fairly, instead of letting them poll SQLite's busy handler. Connections
+    are pooled because the HTTP server starts a thread per connection.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            profile TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS cards (
+            profile TEXT NOT NULL,
+            card_id TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            data TEXT,
+            PRIMARY KEY (profile, card_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS cards_by_revision ON cards (profile, revision);
+        CREATE TABLE IF NOT EXISTS review_events (
+            id INTEGER PRIMARY KEY,
+            profile TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            card_id TEXT,
+            received_at TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS review_events_by_profile ON review_events (profile, id);
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._pool: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._write_lock = threading.Lock()
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly.
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30)
+        # NORMAL is durable across application crashes in WAL mode; only a power
+        # loss can drop the last few commits.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def revision(self, conn: sqlite3.Connection, profile: str) -> int:
+        row = conn.execute("SELECT revision FROM profiles WHERE profile = ?", (profile,)).fetchone()
+        return row[0] if row else 0
+
+    def snapshot_json(self, profile: str, since: Optional[int] = None) -> bytes:
+        """The profile's cards as a JSON document, built from the stored card text without re-parsing it."""
+        with self.connection() as conn:
+            # One read transaction so the revision and the rows agree.
+            conn.execute("BEGIN")
+            try:
+                revision = self.revision(conn, profile)
+                if since is None:
+                    rows = conn.execute(
+                        "SELECT card_id, data FROM cards WHERE profile = ? AND data IS NOT NULL", (profile,)
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT card_id, data FROM cards WHERE profile = ? AND revision > ?", (profile, since)
+                    ).fetchall()
+            finally:
+                conn.execute("COMMIT")
+        cards = ",".join(f"{json.dumps(card_id, ensure_ascii=False)}:{data}" for card_id, data in rows if data is not None)
+        deleted = [card_id for card_id, data in rows if data is None]
+        head = {"profile": profile, "revision": revision, "full": since is None}
+        text = json.dumps(head, ensure_ascii=False, separators=(",", ":"))[:-1]
+        text += f',"cards":{{{cards}}},"deleted":{json.dumps(deleted, ensure_ascii=False)}}}'
+        return text.encode("utf-8")
+
+    def apply_patch(self, profile: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one PATCH body in a single transaction; returns the new revision and counts."""
+        cards = patch.get("cards", {})
+        events = patch.get("events", [])
+        replace = patch.get("replace", False)
+        if not isinstance(cards, dict) or not isinstance(events, list) or not isinstance(replace, bool):
+            raise ProgressError(HTTPStatus.BAD_REQUEST, "expected {cards: object, events: array, replace: bool}")
+        rows: List[Tuple[str, Optional[str]]] = []
+        for card_id, card in cards.items():
+            if not card_id or len(card_id) > MAX_CARD_ID_LENGTH:
+                raise ProgressError(HTTPStatus.BAD_REQUEST, f"invalid card id: {card_id[:40]!r}")
+            if card is not None and not isinstance(card, dict):
+                raise ProgressError(HTTPStatus.BAD_REQUEST, f"card {card_id!r} must be an object or null")
+            rows.append((card_id, None if card is None else json.dumps(card, ensure_ascii=False, separators=(",", ":"))))
+        for event in events:
+            if not isinstance(event, dict):
+                raise ProgressError(HTTPStatus.BAD_REQUEST, "events must be objects")
+            # card_id is bound as a column; the rest of the event is stored as JSON text.
+            event_card_id = event.get("card_id")
+            if event_card_id is not None and (not isinstance(event_card_id, str) or len(event_card_id) > MAX_CARD_ID_LENGTH):
+                raise ProgressError(HTTPStatus.BAD_REQUEST,
+                                    f"event card_id must be null or a string of at most {MAX_CARD_ID_LENGTH} characters")
+        received_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        with self._write_lock, self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                revision = self.revision(conn, profile) + 1
+                conn.execute(
+                    "INSERT INTO profiles (profile, revision) VALUES (?, ?) "
+                    "ON CONFLICT (profile) DO UPDATE SET revision = excluded.revision",
+                    (profile, revision),
+                )
+                conn.executemany(
+                    "INSERT INTO cards (profile, card_id, revision, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (profile, card_id) DO UPDATE SET revision = excluded.revision, data = excluded.data",
+                    [(profile, card_id, revision, data) for card_id, data in rows],
+                )
+                if replace:
+                    # Everything the client did not send is gone on its side.
+                    conn.execute(
+                        "UPDATE cards SET data = NULL, revision = ? WHERE profile = ? AND revision < ? AND data IS NOT NULL",
+                        (revision, profile, revision),
+                    )
+                conn.executemany(
+                    "INSERT INTO review_events (profile, revision, card_id, received_at, data) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (profile, revision, event.get("card_id"), received_at,
+                         json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+                        for event in events
+                    ],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return {"profile": profile, "revision": revision, "cards": len(rows), "events": len(events), "replace": replace}
+
+    def events_json(self, profile: str, after: int, limit: int) -> bytes:
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, revision, received_at, data FROM review_events WHERE profile = ? AND id > ? ORDER BY id LIMIT ?",
+                (profile, after, limit),
+            ).fetchall()
+        items = ",".join(
+            f'{{"id":{row_id},"revision":{revision},"received_at":{json.dumps(received_at)},"event":{data}}}'
+            for row_id, revision, received_at, data in rows
+        )
+        last_id = rows[-1][0] if rows else after
+        return f'{{"profile":{json.dumps(profile)},"last_id":{last_id},"events":[{items}]}}'.encode("utf-8")
+
+
+def progress_route(store: Optional[ProgressStore], target: str) -> Optional[Tuple[str, Dict[str, List[str]]]]:
+    """(route, query) for progress API requests when the API is enabled, else None."""
+    if store is None:
+        return None
+    parts = urlsplit(target)
+    if parts.path not in (PROGRESS_API_PATH, PROGRESS_API_PATH + "/events"):
+        return None
+    return parts.path, parse_qs(parts.query)
+
+
+def query_profile(query: Dict[str, List[str]]) -> str:
+    profile = query.get("profile", ["default"])[0]
+    if not PROFILE_RE.match(profile):
+        raise ProgressError(HTTPStatus.BAD_REQUEST, "profile must match [A-Za-z0-9_-]{1,64}")
+    return profile
+
+
+def query_int(query: Dict[str, List[str]], name: str, default: Optional[int]) -> Optional[int]:
+    if name not in query:
+        return default
+    try:
+        value = int(query[name][0])
+    except ValueError:
+        raise ProgressError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+    if value < 0:
+        raise ProgressError(HTTPStatus.BAD_REQUEST, f"{name} must be >= 0")
+    return value
+
+
+def request_body_length(headers: Any) -> int:
+    """Content-Length of a progress API body; raises ProgressError if it is missing or too large."""
+    if "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+        raise ProgressError(HTTPStatus.LENGTH_REQUIRED, "chunked bodies are not supported")
+    try:
+        length = int(headers.get("Content-Length") or "")
+    except ValueError:
+        raise ProgressError(HTTPStatus.LENGTH_REQUIRED, "Content-Length is required") from None
+    if length < 0 or length > MAX_PROGRESS_BODY:
+        raise ProgressError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"body over {MAX_PROGRESS_BODY} bytes")
+    return length
+
+
+def progress_response(store: ProgressStore, method: str, route: str, query: Dict[str, List[str]],
+                      body: bytes = b"") -> Tuple[HTTPStatus, bytes]:
+    """Run one progress API request; returns the status and JSON body. Blocks on SQLite."""
+    try:
+        profile = query_profile(query)
+        if method == "PATCH":
+            if route != PROGRESS_API_PATH:
+                raise ProgressError(HTTPStatus.METHOD_NOT_ALLOWED, "events are written through PATCH /api/progress")
+            try:
+                patch = json.loads(body)
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise ProgressError(HTTPStatus.BAD_REQUEST, f"invalid JSON: {e}") from None
+            if not isinstance(patch, dict):
+                raise ProgressError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+            result = store.apply_patch(profile, patch)
+            return HTTPStatus.OK, json.dumps(result, separators=(",", ":")).encode("utf-8")
+        if route == PROGRESS_API_PATH:
+            return HTTPStatus.OK, store.snapshot_json(profile, query_int(query, "since", None))
+        after = query_int(query, "after", 0)
+        limit = min(MAX_EVENTS_PAGE, query_int(query, "limit", MAX_EVENTS_PAGE) or 1)
+        return HTTPStatus.OK, store.events_json(profile, after, limit)
+    except ProgressError as e:
+        return e.status, json.dumps({"error": str(e)}).encode("utf-8")
+    except sqlite3.Error as e:
+        print(f"progress store error: {e}", file=sys.stderr)
+        return HTTPStatus.SERVICE_UNAVAILABLE, json.dumps({"error": "progress store unavailable"}).encode("utf-8")
+
+
+def encode_json_response(accept_encoding: str, body: bytes) -> Tuple[str, bytes]:
+    """(content-coding, body) for an API response; API bodies are small or one-off, so cheaper levels."""
+    encoding = choose_encoding(accept_encoding, "application/json", len(body))
+    if encoding == "gzip":
+        return encoding, gzip.compress(body, compresslevel=6)
+    if encoding == "br":
+        return encoding, brotli.compress(body, quality=5)
+    return "", body
+
+
+class CachingRequestHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler with validators, 304s, precompressed variants,
+    byte ranges and zero-copy file bodies."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and sendfile bodies are separate writes; avoid Nagle/delayed-ACK stalls.
+    disable_nagle_algorithm = True
+    variant_cache = LruFileCache()
+    send_plan: Optional[SendPlan] = None
+    # Set by main() when --progress-db is given; the API answers 404 otherwise.
+    progress_store: Optional[ProgressStore] = None
+    metrics: Optional[Metrics] = None
+    html_max_age = HTML_MAX_AGE
+    request_started: Optional[float] = None
+    response_status = 0
+    response_type = ""
+    response_length = 0
+
+    # -- metrics -------------------------------------------------------------
+
+    def handle_one_request(self):
+        self.request_started = None
+        super().handle_one_request()
+        if self.request_started is None or self.metrics is None:
+            return
+        nbytes = self.response_length
+        if self.command == "HEAD" or self.response_status in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            nbytes = 0
+        self.metrics.observe(self.command or "", urlsplit(self.path).path, self.response_type, self.response_status,
+                             nbytes, time.perf_counter() - self.request_started)
+
+    def parse_request(self):
+        self.request_started = time.perf_counter()
+        self.response_status = 0
+        self.response_type = ""
+        self.response_length = 0
+        return super().parse_request()
+
+    def send_header(self, keyword, value):
+        name = keyword.lower()
+        if name == "content-type":
+            self.response_type = value
+        elif name == "content-length":
+            self.response_length = int(value)
+        super().send_header(keyword, value)
+
+    def log_request(self, code="-", size="-"):
+        if isinstance(code, int):
+            self.response_status = int(code)
+        if self.metrics is None or self.metrics.access_log is None:
+            super().log_request(code, size)
+
+    def send_metrics(self) -> None:
+        body = self.metrics.render() if self.metrics is not None else b""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def available_encodings(self) -> List[str]:
+        return available_encodings()
+
+    def choose_encoding(self, ctype: str, size: int) -> str:
+        return choose_encoding(self.headers.get("Accept-Encoding", ""), ctype, size)
+
+    def not_modified(self, etag: str, st: os.stat_result) -> bool:
+        return not_modified(self.headers, etag, st)
+
+    def cache_control_for(self, path: str) -> str:
+        return cache_control_for(path, self.html_max_age)
+
+    def send_validators(self, etag: str, st: os.stat_result, path: str) -> None:
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(int(st.st_mtime)))
+        self.send_header("Cache-Control", self.cache_control_for(path))
+
+    def range_applies(self, etag: str, st: os.stat_result) -> bool:
+        return range_applies(self.headers, etag, st)
+
+    def send_partial(self, path: str, ctype: str, etag: str, st: os.stat_result, ranges: List[Tuple[int, int]], f):
+        """Send a 206 (one range) or multipart/byteranges (several) response."""
+        size = st.st_size
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_validators(etag, st, path)
+        self.send_header("Accept-Ranges", "bytes")
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_plan = [(start, end - start + 1)]
+        else:
+            content_type, length, plan = multipart_ranges(ctype, size, ranges)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(length))
+            self.send_plan = plan
+        self.end_headers()
+        return f
+
+    def copyfile(self, source, outputfile):
+        """Write the body, using sendfile(2) for on-disk segments."""
+        plan = self.send_plan
+        self.send_plan = None
+        if not hasattr(source, "fileno") or isinstance(source, io.BytesIO):
+            return super().copyfile(source, outputfile)
+        if plan is None:
+            plan = [(0, os.fstat(source.fileno()).st_size)]
+        for item in plan:
+            if isinstance(item, bytes):
+                outputfile.write(item)
+            else:
+                offset, count = item
+                self.connection.sendfile(source, offset, count)
+
+    # -- progress API ------------------------------------------------------
+
+    def progress_route(self) -> Optional[Tuple[str, Dict[str, List[str]]]]:
+        return progress_route(self.progress_store, self.path)
+
+    def send_json(self, status: HTTPStatus, body: bytes) -> None:
+        encoding = ""
+        if self.command != "HEAD":
+            encoding, body = encode_json_response(self.headers.get("Accept-Encoding", ""), body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def handle_progress(self, route: str, query: Dict[str, List[str]]) -> None:
+        body = b""
+        if self.command == "PATCH":
+            try:
+                body = self.rfile.read(request_body_length(self.headers))
+            except ProgressError as e:
+                # The body was not read, so the connection cannot be reused.
+                self.close_connection = True
+                self.send_json(e.status, json.dumps({"error": str(e)}).encode("utf-8"))
+                return
+        self.send_json(*progress_response(self.progress_store, self.command, route, query, body))
+
+    def do_GET(self):
+        api = self.progress_route()
+        if api is not None:
+            return self.handle_progress(*api)
+        if urlsplit(self.path).path == METRICS_PATH:
+            return self.send_metrics()
+        return super().do_GET()
+
+    def do_HEAD(self):
+        api = self.progress_route()
+        if api is not None:
+            return self.handle_progress(*api)
+        if urlsplit(self.path).path == METRICS_PATH:
+            return self.send_metrics()
+        return super().do_HEAD()
+
+    def do_PATCH(self):
+        api = self.progress_route()
+        if api is None:
+            self.send_error(HTTPStatus.METHOD_NOT_ALLOWED, "PATCH is only supported on the progress API")
+            return
+        self.handle_progress(*api)
+
+    # -- static files --------------------------------------------------------
+
+    def send_head(self):
+        self.send_plan = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index):
+                # Redirects and directory listings stay with the base class.
+                return super().send_head()
+            path = index
+        if path.endswith("/") or not os.path.isfile(path):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        ctype = self.guess_type(path)
+        range_header = self.headers.get("Range")
+        # Ranges address the identity representation, so skip compression.
+        encoding = "" if range_header else self.choose_encoding(ctype, st.st_size)
+        etag = file_etag(st, encoding)
+
+        if self.not_modified(etag, st):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_validators(etag, st, path)
+            if ctype.split(";")[0] in COMPRESSIBLE_TYPES:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return None
+
+        if range_header and self.command == "GET" and self.range_applies(etag, st):
+            ranges = parse_range_header(range_header, st.st_size)
+            if ranges == []:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{st.st_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            if ranges:
+                try:
+                    f = open(path, "rb")
+                except OSError:
+                    self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+                    return None
+                return self.send_partial(path, ctype, etag, st, ranges, f)
+
+        body: Optional[bytes] = None
+        if encoding:
+            body = self.variant_cache.get(path, st, encoding)
+            if body is None:
+                encoding = ""
+                etag = file_etag(st)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", ctype)
+        self.send_validators(etag, st, path)
+        self.send_header("Accept-Ranges", "bytes")
+        if ctype.split(";")[0] in COMPRESSIBLE_TYPES:
+            self.send_header("Vary", "Accept-Encoding")
+        if body is not None:
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            return io.BytesIO(body)
+
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        self.send_header("Content-Length", str(st.st_size))
+        self.end_headers()
+        return f
+
+
+class ThreadedServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer with a listen backlog sized for a few hundred clients."""
+
+    request_queue_size = 1024
+
+
+# asyncio engine: the response being written by the current connection task
+# ([method, path, status, content type, body bytes]), filled in by head_bytes().
+_RESPONSE: contextvars.ContextVar[List[Any]] = contextvars.ContextVar("response")
+
+
+class _Headers(dict):
+    """Request headers keyed by lowercase name; get() is case-insensitive like email.message."""
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return super().get(name.lower(), default)
+
+
+class AsyncioServer:
+    """`--engine asyncio`: one event loop for every connection, stdlib only.
+
+    Serves the same responses as CachingRequestHandler (validators, 304,
+    compressed variants, ranges, progress API) without a thread per
+    keep-alive connection. Bodies come from the shared LruFileCache; disk
+    reads, compression and SQLite run in the loop's default executor, and
+    identity bodies too large for the cache go out with loop.sendfile().
+    """
+
+    server_version = f"{SimpleHTTPRequestHandler.server_version} {SimpleHTTPRequestHandler.sys_version}"
+
+    def __init__(self, directory: str, cache: LruFileCache, progress_store: Optional[ProgressStore] = None,
+                 metrics: Optional[Metrics] = None, html_max_age: int = HTML_MAX_AGE) -> None:
+        self.directory = directory
+        self.html_max_age = html_max_age
+        self.cache = cache
+        self.progress_store = progress_store
+        self.metrics = metrics
+        self._date: Tuple[int, str] = (0, "")
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024, limit=MAX_HEADER_BYTES)
+        async with server:
+            await server.serve_forever()
+
+    def date_header(self) -> str:
+        now = int(time.time())
+        if now != self._date[0]:
+            self._date = (now, http_date(now))
+        return self._date[1]
+
+    def head_bytes(self, status: HTTPStatus, headers: List[Tuple[str, str]], keep_alive: bool) -> bytes:
+        response = _RESPONSE.get(None)
+        if response is not None:
+            response[2] = int(status)
+            for name, value in headers:
+                if name == "Content-Type":
+                    response[3] = value
+                elif name == "Content-Length":
+                    response[4] = int(value)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Server: {self.server_version}", f"Date: {self.date_header()}"]
+        lines += [f"{name}: {value}" for name, value in headers]
+        if not keep_alive:
+            lines.append("Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        response: List[Any] = []
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
+                    self.send_error(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, False)
+                    await writer.drain()
+                    return
+                started = time.perf_counter()
+                response = ["", "", 0, "", 0]
+                _RESPONSE.set(response)
+                keep_alive = await self.handle_request(head, reader, writer)
+                await writer.drain()
+                if self.metrics is not None and response[2]:
+                    method, path, status, ctype, nbytes = response
+                    if method == "HEAD" or status in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+                        nbytes = 0
+                    self.metrics.observe(method, path, ctype, status, nbytes, time.perf_counter() - started)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception:
+            # Like the threaded engine: log the traceback and drop the
+            # connection, answering 500 unless a status line already went out.
+            traceback.print_exc()
+            if not (response and response[2]):
+                self.send_error(writer, HTTPStatus.INTERNAL_SERVER_ERROR, False)
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Answer one request; returns whether the connection stays open."""
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            self.send_error(writer, HTTPStatus.BAD_REQUEST, False)
+            return False
+        method, target, version = parts
+        response = _RESPONSE.get(None)
+        if response is not None:
+            response[0] = method
+            response[1] = urlsplit(target).path
+        headers = _Headers()
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                self.send_error(writer, HTTPStatus.BAD_REQUEST, False)
+                return False
+            key = name.strip().lower()
+            headers[key] = f"{headers[key]}, {value.strip()}" if key in headers else value.strip()
+        connection = headers.get("Connection", "").lower()
+        keep_alive = "keep-alive" in connection if version == "HTTP/1.0" else "close" not in connection
+
+        api = progress_route(self.progress_store, target)
+        if api is not None and method in ("GET", "HEAD", "PATCH"):
+            return await self.handle_progress(method, api, headers, reader, writer, keep_alive)
+
+        # Static requests carry no meaningful body; discard one if sent.
+        if "chunked" in headers.get("Transfer-Encoding", "").lower():
+            self.send_error(writer, HTTPStatus.LENGTH_REQUIRED, False)
+            return False
+        try:
+            length = int(headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_PROGRESS_BODY:
+            self.send_error(writer, HTTPStatus.BAD_REQUEST, False)
+            return False
+        if length:
+            await reader.readexactly(length)
+
+        if method in ("GET", "HEAD") and urlsplit(target).path == METRICS_PATH:
+            body = self.metrics.render() if self.metrics is not None else b""
+            headers_out = [("Content-Type", METRICS_CONTENT_TYPE), ("Cache-Control", "no-store"),
+                           ("Content-Length", str(len(body)))]
+            writer.write(self.head_bytes(HTTPStatus.OK, headers_out, keep_alive))
+            if method == "GET":
+                writer.write(body)
+        elif method == "PATCH":
+            self.send_error(writer, HTTPStatus.METHOD_NOT_ALLOWED, keep_alive, "PATCH is only supported on the progress API")
+        elif method not in ("GET", "HEAD"):
+            self.send_error(writer, HTTPStatus.NOT_IMPLEMENTED, keep_alive, f"Unsupported method ({method!r})")
+        else:
+            await self.send_file(method, target, headers, writer, keep_alive)
+        return keep_alive
+
+    def send_error(self, writer: asyncio.StreamWriter, status: HTTPStatus, keep_alive: bool, message: Optional[str] = None) -> None:
+        body = SimpleHTTPRequestHandler.error_message_format % {
+            "code": status.value, "message": message or status.phrase, "explain": status.description,
+        }
+        data = body.encode("utf-8", "replace")
+        headers = [("Content-Type", SimpleHTTPRequestHandler.error_content_type), ("Content-Length", str(len(data)))]
+        writer.write(self.head_bytes(status, headers, keep_alive) + data)
+
+    async def handle_progress(self, method: str, api: Tuple[str, Dict[str, List[str]]], headers: _Headers,
+                              reader: asyncio.StreamReader, writer: asyncio.StreamWriter, keep_alive: bool) -> bool:
+        route, query = api
+        body = b""
+        if method == "PATCH":
+            try:
+                body = await reader.readexactly(request_body_length(headers))
+            except ProgressError as e:
+                # The body was not read, so the connection cannot be reused.
+                self.send_json(writer, method, e.status, "", json.dumps({"error": str(e)}).encode("utf-8"), False)
+                return False
+        accept = headers.get("Accept-Encoding", "")
+
+        def respond() -> Tuple[HTTPStatus, str, bytes]:
+            status, payload = progress_response(self.progress_store, method, route, query, body)
+            encoding, payload = ("", payload) if method == "HEAD" else encode_json_response(accept, payload)
+            return status, encoding, payload
+
+        status, encoding, payload = await asyncio.get_running_loop().run_in_executor(None, respond)
+        self.send_json(writer, method, status, encoding, payload, keep_alive)
+        return keep_alive
+
+    def send_json(self, writer: asyncio.StreamWriter, method: str, status: HTTPStatus, encoding: str,
+                  body: bytes, keep_alive: bool) -> None:
+        headers = [("Content-Type", "application/json; charset=utf-8"), ("Cache-Control", "no-store"),
+                   ("Vary", "Accept-Encoding")]
+        if encoding:
+            headers.append(("Content-Encoding", encoding))
+        headers.append(("Content-Length", str(len(body))))
+        writer.write(self.head_bytes(status, headers, keep_alive))
+        if method != "HEAD":
+            writer.write(body)
+
+    async def send_file(self, method: str, target: str, headers: _Headers, writer: asyncio.StreamWriter,
+                        keep_alive: bool) -> None:
+        path = translate_path(self.directory, target)
+        try:
+            st = os.stat(path)
+            if stat.S_ISDIR(st.st_mode):
+                url = urlsplit(target)
+                if not url.path.endswith("/"):
+                    location = url.path + "/" + (f"?{url.query}" if url.query else "")
+                    headers_out = [("Location", location), ("Content-Length", "0")]
+                    writer.write(self.head_bytes(HTTPStatus.MOVED_PERMANENTLY, headers_out, keep_alive))
+                    return
+                # No directory listings: only index.html is served.
+                path = os.path.join(path, "index.html")
+                st = os.stat(path)
+        except (OSError, ValueError):
+            # ValueError: a %00 in the URL puts a null byte in the path.
+            self.send_error(writer, HTTPStatus.NOT_FOUND, keep_alive, "File not found")
+            return
+        if path.endswith("/") or not stat.S_ISREG(st.st_mode):
+            self.send_error(writer, HTTPStatus.NOT_FOUND, keep_alive, "File not found")
+            return
+
+        ctype = guess_type(path)
+        vary = ctype.split(";")[0] in COMPRESSIBLE_TYPES
+        range_header = headers.get("Range")
+        # Ranges address the identity representation, so skip compression.
+        encoding = "" if range_header else choose_encoding(headers.get("Accept-Encoding", ""), ctype, st.st_size)
+        etag = file_etag(st, encoding)
+
+        def validators(etag: str) -> List[Tuple[str, str]]:
+            out = [("ETag", etag), ("Last-Modified", http_date(int(st.st_mtime))),
+                   ("Cache-Control", cache_control_for(path, self.html_max_age))]
+            return out + [("Vary", "Accept-Encoding")] if vary else out
+
+        if not_modified(headers, etag, st):
+            writer.write(self.head_bytes(HTTPStatus.NOT_MODIFIED, validators(etag), keep_alive))
+            return
+
+        if range_header and method == "GET" and range_applies(headers, etag, st):
+            ranges = parse_range_header(range_header, st.st_size)
+            if ranges == []:
+                headers_out = [("Content-Range", f"bytes */{st.st_size}"), ("Content-Length", "0")]
+                writer.write(self.head_bytes(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers_out, keep_alive))
+                return
+            if ranges:
+                headers_out = validators(etag)[:3] + [("Accept-Ranges", "bytes")]
+                if len(ranges) == 1:
+                    start, end = ranges[0]
+                    headers_out += [("Content-Type", ctype), ("Content-Range", f"bytes {start}-{end}/{st.st_size}"),
+                                    ("Content-Length", str(end - start + 1))]
+                    plan: SendPlan = [(start, end - start + 1)]
+                else:
+                    content_type, length, plan = multipart_ranges(ctype, st.st_size, ranges)
+                    headers_out += [("Content-Type", content_type), ("Content-Length", str(length))]
+                writer.write(self.head_bytes(HTTPStatus.PARTIAL_CONTENT, headers_out, keep_alive))
+                await self.send_plan(writer, path, plan)
+                return
+
+        loop = asyncio.get_running_loop()
+        body: Optional[bytes] = None
+        if encoding:
+            body = self.cache.peek(path, st, encoding)
+            if body is None:
+                body = await loop.run_in_executor(None, self.cache.load, path, st, encoding)
+            if body is None:
+                encoding = ""
+                etag = file_etag(st)
+        if body is None and method == "GET" and st.st_size <= self.cache.max_entry_bytes:
+            body = self.cache.peek(path, st, "")
+            if body is None:
+                body = await loop.run_in_executor(None, self.cache.load, path, st, "")
+
+        headers_out = [("Content-Type", ctype)] + validators(etag) + [("Accept-Ranges", "bytes")]
+        if encoding:
+            headers_out.append(("Content-Encoding", encoding))
+        headers_out.append(("Content-Length", str(len(body) if body is not None else st.st_size)))
+        writer.write(self.head_bytes(HTTPStatus.OK, headers_out, keep_alive))
+        if method == "HEAD":
+            return
+        if body is not None:
+            writer.write(body)
+        else:
+            await self.send_plan(writer, path, [(0, st.st_size)])
+
+    async def send_plan(self, writer: asyncio.StreamWriter, path: str, plan: SendPlan) -> None:
+        """Write literal chunks and stream file segments with loop.sendfile()."""
+        loop = asyncio.get_running_loop()
+        with open(path, "rb") as f:
+            for item in plan:
+                if isinstance(item, bytes):
+                    writer.write(item)
+                else:
+                    offset, count = item
+                    await writer.drain()
+                    await loop.sendfile(writer.transport, f, offset, count)
+
+
+def register_mime_types() -> None:
     # Ensure common web/font types are served with correct Content-Type.
     mimetypes.add_type("text/css", ".css")
     mimetypes.add_type("application/javascript", ".js")
@@ -30,15 +1323,57 @@ def main() -> int:
     mimetypes.add_type("font/ttf", ".ttf")
     mimetypes.add_type("font/otf", ".otf")
 
-    handler = SimpleHTTPRequestHandler
-    httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
-    print(f"Serving on http://127.0.0.1:{port} (Ctrl+C to stop)")
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local static file server for the app (run from repo root).")
+    ap.add_argument("port", type=int, nargs="?", default=8000, help="Port to listen on (default: 8000)")
+    ap.add_argument("--progress-db", help="Enable the progress API, storing cards and review events in this SQLite file")
+    ap.add_argument("--engine", choices=["threaded", "asyncio"], default="threaded",
+                    help="threaded: a thread per connection (default); asyncio: one event loop for all connections")
+    ap.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / (1024 * 1024),
+                    help="In-memory file cache size in MiB (default: %(default)g)")
+    ap.add_argument("--directory", default=".", help="Document root, e.g. dist/ from build_assets.py (default: current dir)")
+    ap.add_argument("--html-max-age", type=int, default=HTML_MAX_AGE,
+                    help="Cache-Control max-age for HTML in seconds; 0 sends no-cache (default: %(default)s)")
+    ap.add_argument("--access-log", metavar="PATH",
+                    help="Write one JSON line per request to PATH ('-' for stderr) instead of the plain request log")
+    args = ap.parse_args()
+
+    register_mime_types()
+    directory = os.path.abspath(args.directory)
+    cache = LruFileCache(int(args.cache_mb * 1024 * 1024))
+    store = ProgressStore(args.progress_db) if args.progress_db else None
+    access_log: Optional[TextIO] = None
+    if args.access_log == "-":
+        access_log = sys.stderr
+    elif args.access_log:
+        access_log = open(args.access_log, "a", encoding="utf-8", buffering=1)
+    metrics = Metrics(cache, access_log)
+    print(f"Serving on http://127.0.0.1:{args.port} ({args.engine} engine, Ctrl+C to stop)")
+    if args.progress_db:
+        print(f"Progress API at {PROGRESS_API_PATH} (store: {args.progress_db})")
+    print(f"Metrics at {METRICS_PATH}")
+
+    if args.engine == "asyncio":
+        server = AsyncioServer(directory, cache, store, metrics, args.html_max_age)
+        try:
+            asyncio.run(server.serve("127.0.0.1", args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    handler = CachingRequestHandler
+    handler.variant_cache = cache
+    handler.progress_store = store
+    handler.metrics = metrics
+    handler.html_max_age = args.html_max_age
+    httpd = ThreadedServer(("127.0.0.1", args.port), functools.partial(handler, directory=directory))
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         return 0
+    return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+# srs_sim.py
+#
+# Review-load simulator for the SRS scheduling rules in src/core/index.js
+# (`applyReviewResult`, `buildDailyReviewQueue`).
+#
+# Two implementations of the same rules:
+# - apply_review_result / build_daily_review_queue: a scalar port working on
+#   card dicts, line for line with the JS.
+# - review_batch: the same rules on NumPy arrays (one element per card), used
+#   by the simulator.
+# Both replay tests/srs_review_cases.v1.json (recorded from the JS engine; the
+# same file is replayed by scripts/run_tests.js) before anything is simulated.
+#
+# Simulation model:
+# - every learner studies `--new-per-day` new cards a day (verbs x active
+#   templates, in table order) and clears their whole due queue every day;
+# - in-session requeues (requeueAfter > 0) are answered again the same day,
+#   up to MAX_SESSION_ROUNDS times, then carried to the next day;
+# - each answer is correct with a per-stage probability (shifted per learner),
+#   and correct answers use a hint with probability `--hint-rate`.
+# Days are whole calendar days; the JS adds days in local time, which only
+# differs by the hour around DST changes.
+#
+# Output: daily due-queue sizes (total and per-learner percentiles), reviews,
+# failures, the stage distribution at the end of each day and the workload
+# peaks, printed weekly and optionally written as JSON.
+#
+# Usage:
+#   python scripts/srs_sim.py --check
+#   python scripts/srs_sim.py --learners 10000 --days 365 --out /tmp/srs.json
+#   python scripts/srs_sim.py --intervals 1,2,5,12,30,90 --hint-factor 0.25
+#
+# Requirements:
+#   pip install numpy
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+CASES_PATH = Path("tests") / "srs_review_cases.v1.json"
+VERBS_PATH = Path("data") / "verbs" / "verbs.v2.jsonl"
+TEMPLATES_PATH = Path("data") / "conjugations" / "conjugation_templates.v3.json"
+
+# Mirrors of the constants in src/core/index.js.
+STAGE_ORDER = ["LEARNING", "S1", "S2", "S3", "S4", "S5", "S6", "RETIRED"]
+STAGE_INTERVALS_DAYS = {"S1": 1, "S2": 3, "S3": 7, "S4": 14, "S5": 30, "S6": 60}
+REQUEUE_SHORT = 8
+REQUEUE_LONG = 18
+LEECH_THRESHOLD_TOTAL = 4
+
+# Array encoding: stage code = index in STAGE_ORDER; NEW marks cards a learner
+# has not been introduced to yet. learning_step null is stored as -1.
+NEW = -1
+LEARNING = 0
+S1 = 1
+S6 = 6
+RETIRED = 7
+STAGE_NAMES = ["NEW"] + STAGE_ORDER
+NEVER = np.iinfo(np.int32).max if np is not None else 2**31 - 1
+
+MAX_SESSION_ROUNDS = 8
+DEFAULT_ACCURACY = (0.80, 0.85, 0.88, 0.90, 0.92, 0.94, 0.95)  # LEARNING, S1..S6
+
+
+@dataclass(frozen=True)
+class SchedulerParams:
+    """The tunable scheduling rules; defaults match src/core/index.js."""
+    intervals: Tuple[int, ...] = tuple(STAGE_INTERVALS_DAYS.values())  # S1..S6, days
+    hint_factor: float = 0.5      # correct-with-hint interval multiplier (floored, min 1 day)
+    relearn_drop: int = 2         # stages dropped on a miss above S1
+    lapse_days: int = 1           # delay after a miss in S1..S6
+    requeue_short: int = REQUEUE_SHORT
+    requeue_long: int = REQUEUE_LONG
+    leech_threshold: int = LEECH_THRESHOLD_TOTAL
+
+    def interval(self, stage: str) -> int:
+        # `STAGE_INTERVALS_DAYS[stage] || 1` in the JS.
+        if stage.startswith("S") and stage[1:].isdigit() and 1 <= int(stage[1:]) <= len(self.intervals):
+            return self.intervals[int(stage[1:]) - 1]
+        return 1
+
+    def interval_table(self) -> "np.ndarray":
+        """Interval by stage code (LEARNING and RETIRED fall back to 1 day)."""
+        return np.array([1, *self.intervals, 1], dtype=np.int32)
+
+
+# ---------------------------------------------------------------------------
+# Scalar port
+# ---------------------------------------------------------------------------
+
+def add_days(ts: datetime, days: int) -> datetime:
+    return ts + timedelta(days=days)
+
+
+def iso(ts: datetime) -> str:
+    return ts.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def create_card(verb_id: str, conjugation_id: str, now: datetime) -> Dict[str, Any]:
+    return {
+        "card_id": f"{verb_id}::{conjugation_id}",
+        "verb_id": verb_id,
+        "conjugation_id": conjugation_id,
+        "stage": "LEARNING",
+        "learning_step": 0,
+        "due_at": iso(now),
+        "last_reviewed_at": None,
+        "success_count_total": 0,
+        "failure_count_total": 0,
+        "hint_used_last": False,
+        "is_leech": False,
+    }
+
+
+def next_stage(stage: str) -> str:
+    if stage not in STAGE_ORDER or stage == STAGE_ORDER[-1]:
+        return stage
+    return STAGE_ORDER[STAGE_ORDER.index(stage) + 1]
+
+
+def apply_review_result(card: Dict[str, Any], correct: bool, hint_used: bool, now: datetime,
+                        params: SchedulerParams = SchedulerParams()) -> int:
+    """Update `card` in place like the JS; returns requeueAfter."""
+    now_iso = iso(now)
+    card["last_reviewed_at"] = now_iso
+    card["hint_used_last"] = bool(hint_used)
+
+    if correct:
+        card["success_count_total"] = (card.get("success_count_total") or 0) + 1
+        if hint_used:
+            if card["stage"] == "LEARNING":
+                card["due_at"] = now_iso
+                return params.requeue_short
+            new_interval = max(1, int(params.interval(card["stage"]) * params.hint_factor))
+            card["due_at"] = iso(add_days(now, new_interval))
+            return 0
+
+        if card["stage"] == "LEARNING":
+            step = card.get("learning_step") or 0
+            if step < 2:
+                card["learning_step"] = step + 1
+                card["due_at"] = now_iso
+                return params.requeue_short if card["learning_step"] == 1 else params.requeue_long
+            card["stage"] = "S1"
+            card["learning_step"] = None
+            card["due_at"] = iso(add_days(now, params.intervals[0]))
+            return 0
+
+        if card["stage"] == "S6":
+            card["stage"] = "RETIRED"
+            card["due_at"] = None
+            return 0
+
+        if card["stage"].startswith("S"):
+            card["stage"] = next_stage(card["stage"])
+            card["due_at"] = iso(add_days(now, params.interval(card["stage"])))
+            return 0
+
+        return 0
+
+    card["failure_count_total"] = (card.get("failure_count_total") or 0) + 1
+    if card["failure_count_total"] >= params.leech_threshold:
+        card["is_leech"] = True
+    if card.get("stage") and card["stage"].startswith("S"):
+        if card["stage"] != "S1" and card["stage"][1:].isdigit():
+            card["stage"] = f"S{max(1, int(card['stage'][1:]) - params.relearn_drop)}"
+        card["learning_step"] = None
+        card["due_at"] = iso(add_days(now, params.lapse_days))
+        return 0
+
+    card["stage"] = "LEARNING"
+    card["learning_step"] = 0
+    card["due_at"] = iso(add_days(now, params.intervals[0]))
+    return params.requeue_short
+
+
+def build_daily_review_queue(cards: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+    due = [c for c in cards if c.get("due_at") and parse_iso(c["due_at"]) <= now]
+    return sorted(due, key=lambda c: parse_iso(c["due_at"]))
+
+
+# ---------------------------------------------------------------------------
+# Vectorized rules
+# ---------------------------------------------------------------------------
+
+def review_batch(stage: "np.ndarray", step: "np.ndarray", failures: "np.ndarray", due: "np.ndarray",
+                 day: int, correct: "np.ndarray", hint: "np.ndarray", params: SchedulerParams,
+                 intervals: Optional["np.ndarray"] = None) -> "np.ndarray":
+    """
+    Apply one answer to each card, updating the arrays in place.
+    `due` holds absolute days (NEVER once retired). Returns requeueAfter per card.
+    """
+    if intervals is None:
+        intervals = params.interval_table()
+    requeue = np.zeros(stage.shape, dtype=np.int16)
+    learning = stage == LEARNING
+    in_s = (stage >= S1) & (stage <= S6)
+    wrong = ~correct
+
+    # Correct with hint: LEARNING stays put and is requeued; others get a shortened interval.
+    m = correct & hint & learning
+    due[m] = day
+    requeue[m] = params.requeue_short
+    m = correct & hint & ~learning
+    due[m] = day + np.maximum(1, np.floor(intervals[stage[m]] * params.hint_factor).astype(np.int32))
+
+    plain = correct & ~hint
+    # LEARNING steps 0 -> 1 -> 2 inside the session, then S1.
+    early = step < 2
+    m = plain & learning & early
+    step[m] = np.maximum(step[m], 0) + 1
+    due[m] = day
+    requeue[m] = np.where(step[m] == 1, params.requeue_short, params.requeue_long)
+    m = plain & learning & ~early
+    stage[m] = S1
+    step[m] = -1
+    due[m] = day + params.intervals[0]
+    m = plain & (stage == S6)
+    stage[m] = RETIRED
+    due[m] = NEVER
+    m = plain & in_s & (stage != RETIRED)
+    stage[m] += 1
+    due[m] = day + intervals[stage[m]]
+
+    failures[wrong] += 1
+    m = wrong & in_s
+    stage[m] = np.where(stage[m] == S1, S1, np.maximum(S1, stage[m] - params.relearn_drop))
+    step[m] = -1
+    due[m] = day + params.lapse_days
+    m = wrong & ~in_s
+    stage[m] = LEARNING
+    step[m] = 0
+    due[m] = day + params.intervals[0]
+    requeue[m] = params.requeue_short
+    return requeue
+
+
+# ---------------------------------------------------------------------------
+# Recorded-case replay
+# ---------------------------------------------------------------------------
+
+CASE_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def run_case_tests(root: Path, params: SchedulerParams = SchedulerParams()) -> List[str]:
+    """Replay the recorded JS cases through both implementations; returns failure messages."""
+    if np is None:
+        return ["numpy is not installed (pip install numpy)"]
+    data = json.loads((root / CASES_PATH).read_text(encoding="utf-8"))
+    failures: List[str] = []
+    code = {name: i for i, name in enumerate(STAGE_ORDER)}
+
+    for case in data["cases"]:
+        card = create_card("verb_srs", "plain_past", CASE_EPOCH)
+        card.update(case["card"])
+        v_stage = np.array([code[card["stage"]]], dtype=np.int8)
+        v_step = np.array([-1 if card["learning_step"] is None else card["learning_step"]], dtype=np.int8)
+        v_fail = np.array([card["failure_count_total"]], dtype=np.int16)
+        v_due = np.array([0], dtype=np.int32)
+        for n, (st, expected) in enumerate(zip(case["steps"], case["expected"]), start=1):
+            now = CASE_EPOCH + timedelta(days=st["day"])
+            requeue = apply_review_result(card, st["correct"], st["hint_used"], now, params)
+            scalar = {
+                "stage": card["stage"],
+                "learning_step": card["learning_step"],
+                "due_in_days": None if card["due_at"] is None else round((parse_iso(card["due_at"]) - now) / timedelta(days=1)),
+                "requeue_after": requeue,
+                "is_leech": card["is_leech"],
+                "success_count_total": card["success_count_total"],
+                "failure_count_total": card["failure_count_total"],
+            }
+            v_requeue = review_batch(v_stage, v_step, v_fail, v_due, st["day"],
+                                     np.array([st["correct"]]), np.array([st["hint_used"]]), params)
+            vector = {
+                "stage": STAGE_ORDER[int(v_stage[0])],
+                "learning_step": None if v_step[0] < 0 else int(v_step[0]),
+                "due_in_days": None if v_due[0] == NEVER else int(v_due[0]) - st["day"],
+                "requeue_after": int(v_requeue[0]),
+                "is_leech": bool(v_fail[0] >= params.leech_threshold),
+                "failure_count_total": int(v_fail[0]),
+            }
+            for key, want in expected.items():
+                if scalar[key] != want:
+                    failures.append(f"{case['case_id']} step {n}: {key} expected {want!r}, scalar port got {scalar[key]!r}")
+                if key in vector and vector[key] != want:
+                    failures.append(f"{case['case_id']} step {n}: {key} expected {want!r}, vectorized got {vector[key]!r}")
+
+    for case in data.get("queue_cases", []):
+        now = CASE_EPOCH + timedelta(days=10)
+        cards = []
+        for i, offset in enumerate(case["due_in_days"]):
+            c = create_card(f"v{i}", "plain_past", now)
+            c["due_at"] = None if offset is None else iso(now + timedelta(days=offset))
+            cards.append(c)
+        order = [int(c["verb_id"][1:]) for c in build_daily_review_queue(cards, now)]
+        if order != case["expected_order"]:
+            failures.append(f"{case['case_id']}: queue order expected {case['expected_order']}, got {order}")
+    return failures
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+def percentiles(values: "np.ndarray", qs: Tuple[int, ...] = (50, 90, 99)) -> List[float]:
+    return [float(x) for x in np.percentile(values, qs)] if values.size else [0.0] * len(qs)
+
+
+# Packed card state for the simulator: stage * 4 + (learning_step + 1).
+STEP_SLOTS = 4
+STATE_COUNT = len(STAGE_ORDER) * STEP_SLOTS
+OUTCOMES = 3  # 0 = wrong, 1 = correct, 2 = correct with hint
+
+
+@dataclass(frozen=True)
+class TransitionTables:
+    """review_batch evaluated once for every (state, outcome); indexed by state * OUTCOMES + outcome."""
+    state: "np.ndarray"    # next packed state
+    delay: "np.ndarray"    # days until due (-1 = retired)
+    requeue: "np.ndarray"  # requeueAfter
+    stage: "np.ndarray"    # stage code of each packed state
+    leech_threshold: int
+
+
+def transition_tables(params: SchedulerParams) -> TransitionTables:
+    keys = np.arange(STATE_COUNT * OUTCOMES)
+    state, outcome = np.divmod(keys, OUTCOMES)
+    stage = (state // STEP_SLOTS).astype(np.int8)
+    step = (state % STEP_SLOTS - 1).astype(np.int8)
+    due = np.zeros(keys.size, dtype=np.int32)
+    requeue = review_batch(stage, step, np.zeros(keys.size, dtype=np.int16), due, 0,
+                           outcome > 0, outcome == 2, params)
+    return TransitionTables(
+        state=(stage.astype(np.int16) * STEP_SLOTS + step + 1).astype(np.uint8),
+        delay=np.where(due == NEVER, -1, due).astype(np.int16),
+        requeue=requeue,
+        stage=np.repeat(np.arange(len(STAGE_ORDER), dtype=np.int8), STEP_SLOTS),
+        leech_threshold=params.leech_threshold,
+    )
+
+
+def simulate_chunk(learners: int, cards: int, days: int, new_per_day: int, accuracy: "np.ndarray",
+                   hint_rate: float, learner_offsets: "np.ndarray", tables: TransitionTables,
+                   rng: "np.random.Generator") -> Dict[str, Any]:
+    """
+    Simulate `learners` independent learners; returns daily totals plus queue sizes (days x learners).
+
+    Cards are interchangeable (accuracy depends on learner and stage only), so
+    no per-card table is kept: each due-day bucket holds the owner, packed
+    state and failure count of the cards due that day.
+    """
+    # P(correct) per (learner, packed state), flattened: index owner * STATE_COUNT + state.
+    p_correct = np.clip(accuracy[np.minimum(tables.stage, S6)][None, :] + learner_offsets[:, None], 0.0, 1.0)
+    p_correct = p_correct.astype(np.float32).ravel()
+    # Stage distribution deltas per transition key, as a (keys x stages) matrix.
+    keys = np.arange(tables.state.size)
+    key_delta = np.zeros((keys.size, len(STAGE_ORDER)), dtype=np.int64)
+    np.add.at(key_delta, (keys, tables.stage[keys // OUTCOMES]), -1)
+    np.add.at(key_delta, (keys, tables.stage[tables.state]), 1)
+    stage_counts = np.zeros(len(STAGE_NAMES), dtype=np.int64)
+    stage_counts[0] = learners * cards
+    totals: Dict[str, Any] = {
+        "due": np.zeros(days, dtype=np.int64),
+        "new": np.zeros(days, dtype=np.int64),
+        "reviews": np.zeros(days, dtype=np.int64),
+        "failures": np.zeros(days, dtype=np.int64),
+        "stages": np.zeros((days, len(STAGE_NAMES)), dtype=np.int64),
+        "queue_sizes": np.zeros((days, learners), dtype=np.int32),
+        "leeches": 0,
+    }
+    buckets: Dict[int, List[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]]] = {}
+    owner_type = np.int16 if learners < 2**15 else np.int32
+    fresh_state = LEARNING * STEP_SLOTS + 1  # LEARNING, step 0
+
+    def schedule(day: int, delay: "np.ndarray", *columns: "np.ndarray") -> None:
+        if not delay.size:
+            return
+        order = np.argsort(delay, kind="stable")
+        delay = delay[order]
+        columns = tuple(c[order] for c in columns)
+        bounds = np.flatnonzero(np.diff(delay)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, delay.size]):
+            d = int(delay[lo])
+            if d >= 0 and day + d < days:
+                buckets.setdefault(day + d, []).append(tuple(c[lo:hi] for c in columns))
+
+    for day in range(days):
+        per_learner = min((day + 1) * new_per_day, cards) - min(day * new_per_day, cards)
+        parts = buckets.pop(day, [])
+        totals["due"][day] = sum(p[0].size for p in parts)
+        totals["new"][day] = learners * per_learner
+        parts.append((
+            np.repeat(np.arange(learners, dtype=owner_type), per_learner),
+            np.full(learners * per_learner, fresh_state, dtype=np.uint8),
+            np.zeros(learners * per_learner, dtype=np.int16),
+        ))
+        owner, state, failures = (np.concatenate(c) for c in zip(*parts))
+        stage_counts[0] -= learners * per_learner
+        stage_counts[1 + LEARNING] += learners * per_learner
+        totals["queue_sizes"][day] = np.bincount(owner, minlength=learners)
+
+        for round_no in range(MAX_SESSION_ROUNDS):
+            if not owner.size:
+                break
+            p = p_correct[owner.astype(np.intp) * STATE_COUNT + state]
+            u = rng.random(owner.size, dtype=np.float32)
+            # One draw per answer: u < p is correct; given that, u / p is uniform, so u < p * hint_rate is a hint.
+            outcome = (u < p).astype(np.intp) + (u < p * hint_rate)
+            key = state * OUTCOMES + outcome
+            state = tables.state[key]
+            wrong = outcome == 0
+            failures = failures + wrong
+            totals["leeches"] += int(np.count_nonzero(wrong & (failures == tables.leech_threshold)))
+            stage_counts[1:] += np.bincount(key, minlength=keys.size) @ key_delta
+            totals["reviews"][day] += owner.size
+            totals["failures"][day] += int(np.count_nonzero(wrong))
+
+            again = tables.requeue[key] > 0
+            delay = tables.delay[key]
+            if round_no == MAX_SESSION_ROUNDS - 1:
+                # Session over: anything still requeued comes back tomorrow.
+                delay = np.where(again, np.maximum(delay, 1), delay)
+                again[:] = False
+            done = ~again
+            schedule(day, delay[done], owner[done], state[done], failures[done])
+            owner, state, failures = owner[again], state[again], failures[again]
+
+        totals["stages"][day] = stage_counts
+    return totals
+
+
+def _simulate_chunk_task(args: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Process-pool entry point: rebuilds the tables and the chunk's RNG from plain arguments."""
+    learners, cards, days, new_per_day, accuracy, hint_rate, offsets, params, seed = args
+    return simulate_chunk(learners, cards, days, new_per_day, accuracy, hint_rate, offsets,
+                          transition_tables(params), np.random.default_rng(seed))
+
+
+def simulate(learners: int, cards: int, days: int, new_per_day: int, accuracy: Tuple[float, ...],
+             accuracy_sd: float, hint_rate: float, params: SchedulerParams, seed: int, chunk: int,
+             jobs: int = 1) -> Dict[str, Any]:
+    """
+    Simulate `learners` learners in chunks of `chunk`. Each chunk has its own
+    RNG stream (seeded from `seed` and its first learner), so results depend
+    on seed and chunk size but not on `jobs`.
+    """
+    rng = np.random.default_rng(seed)
+    acc = np.asarray(accuracy, dtype=np.float64)
+    offsets = rng.normal(0.0, accuracy_sd, learners) if accuracy_sd > 0 else np.zeros(learners)
+    tasks = [
+        (min(learners, lo + chunk) - lo, cards, days, new_per_day, acc, hint_rate,
+         offsets[lo:lo + chunk], params, [seed, lo])
+        for lo in range(0, learners, chunk)
+    ]
+    start = time.perf_counter()
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(_simulate_chunk_task, tasks))
+    else:
+        parts = [_simulate_chunk_task(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    totals = {key: sum(part[key] for part in parts) for key in ("due", "new", "reviews", "failures", "stages", "leeches")}
+    queue_sizes = np.concatenate([part["queue_sizes"] for part in parts], axis=1)
+    per_learner = [percentiles(queue_sizes[d]) for d in range(days)]
+    queue_max = queue_sizes.max(axis=1)
+    reviews = totals["reviews"]
+    return {
+        "learners": learners,
+        "cards_per_learner": cards,
+        "days": days,
+        "new_per_day": new_per_day,
+        "accuracy": list(accuracy),
+        "accuracy_sd": accuracy_sd,
+        "hint_rate": hint_rate,
+        "seed": seed,
+        "chunk": chunk,
+        "params": {
+            "intervals": list(params.intervals),
+            "hint_factor": params.hint_factor,
+            "relearn_drop": params.relearn_drop,
+            "lapse_days": params.lapse_days,
+            "requeue_short": params.requeue_short,
+            "requeue_long": params.requeue_long,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "daily": {
+            "due": totals["due"].tolist(),
+            "new": totals["new"].tolist(),
+            "reviews": reviews.tolist(),
+            "failures": totals["failures"].tolist(),
+            "queue_p50": [p[0] for p in per_learner],
+            "queue_p90": [p[1] for p in per_learner],
+            "queue_p99": [p[2] for p in per_learner],
+            "queue_max": queue_max.tolist(),
+        },
+        "stages": {name: totals["stages"][:, i].tolist() for i, name in enumerate(STAGE_NAMES)},
+        "peaks": {
+            "reviews": int(reviews.max()) if days else 0,
+            "reviews_day": int(reviews.argmax()) if days else 0,
+            "reviews_per_learner": round(float(reviews.max()) / learners, 2) if days else 0.0,
+            "queue_p99": max((p[2] for p in per_learner), default=0.0),
+            "queue_max": int(queue_max.max()) if days else 0,
+            "queue_max_day": int(queue_max.argmax()) if days else 0,
+        },
+        "leeches": totals["leeches"],
+    }
+
+
+def print_summary(result: Dict[str, Any]) -> None:
+    daily, stages = result["daily"], result["stages"]
+    learners = result["learners"]
+    print(f"{result['learners']} learners x {result['cards_per_learner']} cards x {result['days']} days "
+          f"in {result['elapsed_s']:.2f} s (intervals {result['params']['intervals']})")
+    print(f"{'day':>5} {'due/learner':>12} {'reviews/learner':>16} {'queue p50':>10} {'p99':>7} {'max':>6}  stages (% of cards)")
+    total_cards = learners * result["cards_per_learner"]
+    for day in sorted(set(range(0, result["days"], 7)) | {result["days"] - 1}):
+        dist = " ".join(f"{name}:{stages[name][day] * 100 / total_cards:.0f}" for name in STAGE_NAMES)
+        print(f"{day:>5} {daily['due'][day] / learners:>12.1f} {daily['reviews'][day] / learners:>16.1f} "
+              f"{daily['queue_p50'][day]:>10.0f} {daily['queue_p99'][day]:>7.0f} {daily['queue_max'][day]:>6}  {dist}")
+    peaks = result["peaks"]
+    print(f"\nPeak: {peaks['reviews_per_learner']} reviews/learner on day {peaks['reviews_day']}; "
+          f"largest queue {peaks['queue_max']} (day {peaks['queue_max_day']}), worst p99 {peaks['queue_p99']:.0f}; "
+          f"leeches {result['leeches']}")
+
+
+def count_cards(root: Path) -> int:
+    """Verbs x active templates (plain_dictionary excluded, like normalizeEnabledForms)."""
+    with (root / VERBS_PATH).open("r", encoding="utf-8") as f:
+        verbs = sum(1 for line in f if line.strip())
+    templates = json.loads((root / TEMPLATES_PATH).read_text(encoding="utf-8"))
+    active = [t for t in templates if t.get("active") and t.get("id") != "plain_dictionary"]
+    return verbs * len(active)
+
+
+def parse_floats(raw: str, count: int, name: str) -> Tuple[float, ...]:
+    values = tuple(float(x) for x in raw.split(","))
+    if len(values) == 1:
+        values = values * count
+    if len(values) != count:
+        raise ValueError(f"{name} expects 1 or {count} comma-separated values")
+    return values
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Simulate SRS review load with the scheduling rules from src/core/index.js.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'tests/' (default: current dir)")
+    ap.add_argument("--check", action="store_true", help="Only replay the recorded JS cases")
+    ap.add_argument("--learners", type=int, default=1000)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--cards", type=int, help="Cards per learner (default: verbs x active templates)")
+    ap.add_argument("--new-per-day", type=int, default=10, help="New cards introduced per learner per day (default: 10)")
+    ap.add_argument("--accuracy", default=",".join(str(a) for a in DEFAULT_ACCURACY),
+                    help="P(correct) for LEARNING,S1..S6 (7 values, or 1 for all)")
+    ap.add_argument("--accuracy-sd", type=float, default=0.05, help="Per-learner accuracy spread (default: 0.05)")
+    ap.add_argument("--hint-rate", type=float, default=0.1, help="P(hint) on a correct answer (default: 0.1)")
+    ap.add_argument("--intervals", help="S1..S6 intervals in days, e.g. 1,3,7,14,30,60")
+    ap.add_argument("--hint-factor", type=float, help="Interval multiplier for correct-with-hint (default: 0.5)")
+    ap.add_argument("--relearn-drop", type=int, help="Stages dropped on a miss above S1 (default: 2)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--chunk", type=int, default=1000, help="Learners per independent batch (default: 1000)")
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes, one chunk each at a time (default: 1, serial)")
+    ap.add_argument("--out", help="Write the full result JSON here")
+    args = ap.parse_args()
+
+    if np is None:
+        print("ERROR: numpy is not installed. Install with: pip install numpy", file=sys.stderr)
+        return 2
+    root = Path(args.root).resolve()
+
+    failures = run_case_tests(root)
+    for msg in failures:
+        print(f"[FAIL ] {msg}", file=sys.stderr)
+    if failures:
+        print(f"\nSRS port disagrees with {CASES_PATH.as_posix()}; not simulating.", file=sys.stderr)
+        return 1
+    if args.check:
+        print(f"SRS review cases: PASS ({CASES_PATH.as_posix()})")
+        return 0
+
+    params = SchedulerParams()
+    try:
+        if args.intervals:
+            params = replace(params, intervals=tuple(int(x) for x in parse_floats(args.intervals, 6, "--intervals")))
+        accuracy = parse_floats(args.accuracy, len(DEFAULT_ACCURACY), "--accuracy")
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    if args.hint_factor is not None:
+        params = replace(params, hint_factor=args.hint_factor)
+    if args.relearn_drop is not None:
+        params = replace(params, relearn_drop=args.relearn_drop)
+
+    cards = args.cards if args.cards is not None else count_cards(root)
+    result = simulate(args.learners, cards, args.days, args.new_per_day, accuracy,
+                      args.accuracy_sd, args.hint_rate, params, args.seed, max(1, args.chunk), max(1, args.jobs))
+    print_summary(result)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
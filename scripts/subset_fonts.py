@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# subset_fonts.py
+#
+# Builds subset .woff2 files of the app's web fonts that contain only the
+# characters the app can actually display.
+#
+# What it does:
+# - Collects the code points of every string in the bundled datasets
+#   (data_sources.SOURCES: verbs, templates, exceptions, rule hints, example
+#   sentences, furigana, learning paths), the precomputed answer table, and
+#   index.html / src/app.js / src/core/*.js.
+# - Adds a fixed baseline that does not depend on data: printable ASCII,
+#   common punctuation, CJK punctuation, all hiragana and katakana (answers
+#   are typed, so any kana can appear) and the fullwidth ASCII forms.
+# - Subsets each font in FONTS (the faces declared in src/styles.css) to that
+#   set and writes:
+#   - public/fonts/subset/<name>.subset.woff2
+#   - public/fonts/subset/manifest.json (code points + per-font byte report)
+# - Prints the byte savings per face and in total.
+#
+# Coverage check:
+#   python scripts/subset_fonts.py --check
+# re-collects the code points and fails (exit 1) if any is missing from the
+# subset, listing each character and the files that use it. It only reads
+# the manifest, so it needs no font tooling; build_bundle.py runs the same
+# check before writing a bundle.
+#
+# Usage:
+#   python scripts/subset_fonts.py --root .
+#   python scripts/subset_fonts.py --root . --check
+#
+# Requirements (build only):
+#   pip install fonttools brotli
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from conjugation import build_answer_table
+from data_sources import SOURCES, load_jsonl
+from validate_data import find_project_root, load_json
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+except ImportError:  # only needed to build; --check works without it
+    ft_subset = None
+    TTFont = None
+
+SUBSET_DIR = Path("public") / "fonts" / "subset"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+# (family, weight, source font relative to root) for every @font-face in src/styles.css.
+FONTS: List[Tuple[str, int, str]] = [
+    ("Sora", 400, "public/fonts/Sora/static/Sora-Regular.woff2"),
+    ("Sora", 600, "public/fonts/Sora/static/Sora-SemiBold.woff2"),
+    ("Sora", 700, "public/fonts/Sora/static/Sora-Bold.woff2"),
+    ("Zen Kaku Gothic New", 400, "public/fonts/Zen_Kaku_Gothic_New/ZenKakuGothicNew-Regular.woff2"),
+    ("Zen Kaku Gothic New", 500, "public/fonts/Zen_Kaku_Gothic_New/ZenKakuGothicNew-Medium.woff2"),
+    ("Zen Kaku Gothic New", 700, "public/fonts/Zen_Kaku_Gothic_New/ZenKakuGothicNew-Bold.woff2"),
+]
+
+# Text files scanned in full (UI strings, inline markup, core-module messages).
+TEXT_SOURCES = ["index.html", "src/app.js", "src/core/*.js"]
+
+# Inclusive code point ranges kept regardless of what the data uses today.
+BASELINE_RANGES: List[Tuple[int, int]] = [
+    (0x0020, 0x007E),  # printable ASCII
+    (0x00A0, 0x00FF),  # Latin-1 punctuation and symbols (×, ·, «», accented romaji input)
+    (0x2010, 0x2027),  # dashes, quotes, bullets, ellipsis
+    (0x2190, 0x2193),  # arrows
+    (0x3000, 0x303F),  # CJK punctuation (、。「」〜)
+    (0x3041, 0x309F),  # hiragana
+    (0x30A0, 0x30FF),  # katakana
+    (0xFF01, 0xFF5E),  # fullwidth ASCII forms
+]
+
+# GSUB/GPOS features worth keeping for Japanese text on top of fontTools' defaults.
+EXTRA_LAYOUT_FEATURES = ["palt", "halt", "vert", "vrt2", "vkna", "ruby"]
+
+
+def iter_strings(value: Any) -> Iterable[str]:
+    """Every string (dict keys included) inside a parsed JSON value."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def displayable(cp: int) -> bool:
+    """Characters that need a glyph (controls, format chars and surrogates do not)."""
+    return unicodedata.category(chr(cp)) not in ("Cc", "Cf", "Cs") or cp == 0x00AD
+
+
+def collect_code_points(root: Path) -> Dict[int, Set[str]]:
+    """Map of code point -> the source files that use it (baseline excluded)."""
+    used: Dict[int, Set[str]] = {}
+
+    def add(text: str, where: str) -> None:
+        for ch in set(text):
+            cp = ord(ch)
+            if displayable(cp):
+                used.setdefault(cp, set()).add(where)
+
+    data: Dict[str, Any] = {}
+    for key, rel, kind in SOURCES:
+        path = root / rel
+        data[key] = load_jsonl(path) if kind == "jsonl" else load_json(path)
+        for s in iter_strings(data[key]):
+            add(s, rel)
+    answers = build_answer_table(data["verbs"], data["templates"], data["exceptions"])
+    for s in iter_strings(answers):
+        add(s, "answer table (conjugation.py)")
+    for pattern in TEXT_SOURCES:
+        for path in sorted(root.glob(pattern)):
+            add(path.read_text(encoding="utf-8"), path.relative_to(root).as_posix())
+    return used
+
+
+def baseline_code_points() -> Set[int]:
+    return {cp for lo, hi in BASELINE_RANGES for cp in range(lo, hi + 1) if displayable(cp)}
+
+
+def to_ranges(code_points: Iterable[int]) -> List[str]:
+    """Compact "XXXX-YYYY" / "XXXX" hex ranges for the manifest."""
+    out: List[str] = []
+    start = prev = None
+    for cp in sorted(code_points):
+        if prev is not None and cp == prev + 1:
+            prev = cp
+            continue
+        if start is not None:
+            out.append(f"{start:04X}" if start == prev else f"{start:04X}-{prev:04X}")
+        start = prev = cp
+    if start is not None:
+        out.append(f"{start:04X}" if start == prev else f"{start:04X}-{prev:04X}")
+    return out
+
+
+def from_ranges(ranges: Iterable[str]) -> Set[int]:
+    out: Set[int] = set()
+    for item in ranges:
+        lo, _, hi = item.partition("-")
+        out.update(range(int(lo, 16), int(hi or lo, 16) + 1))
+    return out
+
+
+def subset_font(source: Path, code_points: Set[int]) -> Tuple[bytes, int, int, Set[int]]:
+    """(woff2 bytes, glyphs before, glyphs after, code points the subset maps)."""
+    options = ft_subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = list(options.layout_features) + EXTRA_LAYOUT_FEATURES
+    options.name_IDs = ["*"]  # keep the license/copyright names (OFL)
+    options.notdef_outline = True
+    font = TTFont(str(source))
+    glyphs_before = len(font.getGlyphOrder())
+    subsetter = ft_subset.Subsetter(options=options)
+    subsetter.populate(unicodes=code_points)
+    subsetter.subset(font)
+    covered = set(font.getBestCmap())
+    buf = io.BytesIO()
+    ft_subset.save_font(font, buf, options)
+    return buf.getvalue(), glyphs_before, len(font.getGlyphOrder()), covered
+
+
+def build_subsets(root: Path) -> Dict[str, Any]:
+    used = collect_code_points(root)
+    wanted = baseline_code_points() | set(used)
+    out_dir = root / SUBSET_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    fonts: List[Dict[str, Any]] = []
+    covered_any: Set[int] = set()
+    for family, weight, rel in FONTS:
+        source = root / rel
+        body, glyphs_before, glyphs_after, covered = subset_font(source, wanted)
+        covered_any |= covered
+        name = f"{source.stem}.subset.woff2"
+        (out_dir / name).write_bytes(body)
+        ttf = source.with_suffix(".ttf")
+        fonts.append({
+            "family": family,
+            "weight": weight,
+            "source": rel,
+            "subset": (SUBSET_DIR / name).as_posix(),
+            "source_bytes": source.stat().st_size,
+            "source_ttf_bytes": ttf.stat().st_size if ttf.exists() else None,
+            "subset_bytes": len(body),
+            "glyphs_before": glyphs_before,
+            "glyphs_after": glyphs_after,
+        })
+
+    # Characters no face can draw fall back to system fonts; report, don't fail.
+    uncovered = sorted(cp for cp in used if cp not in covered_any and cp > 0x7F)
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "code_point_count": len(wanted),
+        "code_points": to_ranges(wanted),
+        "no_glyph_in_any_font": [f"U+{cp:04X} {chr(cp)}" for cp in uncovered],
+        "fonts": fonts,
+    }
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def check_font_coverage(root: Path) -> List[str]:
+    """Messages for characters the app uses that the font subset lacks ([] if none or not subset)."""
+    manifest_path = root / SUBSET_DIR / MANIFEST_NAME
+    if not manifest_path.exists():
+        return []
+    manifest = load_json(manifest_path)
+    have = from_ranges(manifest.get("code_points", []))
+    missing = {cp: where for cp, where in collect_code_points(root).items() if cp not in have}
+    return [
+        f"U+{cp:04X} {chr(cp)!r} ({unicodedata.name(chr(cp), 'unnamed')}) is not in the font subset; used in {', '.join(sorted(where))}"
+        for cp, where in sorted(missing.items())
+    ]
+
+
+def print_subset_report(manifest: Dict[str, Any]) -> None:
+    print(f"{manifest['code_point_count']} code points kept")
+    print(f"{'face':34s} {'source':>11s} {'subset':>10s} {'saved':>7s} {'glyphs':>13s}")
+    total_src = total_sub = 0
+    for f in manifest["fonts"]:
+        src, sub = f["source_bytes"], f["subset_bytes"]
+        total_src += src
+        total_sub += sub
+        label = f"{f['family']} {f['weight']}"
+        print(f"{label:34s} {src:11,d} {sub:10,d} {1 - sub / src:6.1%} {f['glyphs_before']:6d}->{f['glyphs_after']:<6d}")
+    print(f"{'total (woff2)':34s} {total_src:11,d} {total_sub:10,d} {1 - total_sub / total_src:6.1%}")
+    if manifest["no_glyph_in_any_font"]:
+        print(f"WARNING: no font has a glyph for: {' '.join(manifest['no_glyph_in_any_font'])}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Subset the app's web fonts to the characters its data and UI use.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'public/' (default: current dir)")
+    ap.add_argument("--check", action="store_true", help="Only verify that the existing subset covers the current data")
+    args = ap.parse_args()
+
+    root = find_project_root(Path(args.root))
+
+    if args.check:
+        if not (root / SUBSET_DIR / MANIFEST_NAME).exists():
+            print(f"ERROR: {(SUBSET_DIR / MANIFEST_NAME).as_posix()} not found; run scripts/subset_fonts.py first.", file=sys.stderr)
+            return 1
+        problems = check_font_coverage(root)
+        for msg in problems:
+            print(f"[ERROR] {msg}", file=sys.stderr)
+        if problems:
+            print(f"\n{len(problems)} character(s) missing from the font subset: rerun scripts/subset_fonts.py.", file=sys.stderr)
+            return 1
+        print("Font subset covers all characters used by the data and UI.")
+        return 0
+
+    if ft_subset is None:
+        print("ERROR: Missing dependency 'fonttools'. Install with: pip install fonttools brotli", file=sys.stderr)
+        return 1
+    manifest = build_subsets(root)
+    print_subset_report(manifest)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -23,18 +23,48 @@
 # Usage:
 #   python scripts/validate_data.py --root .
 #
+# Results are cached per check in .cache/validate_data.json, keyed by the content
+# hash of every schema/data file the check reads (and of this script). Unchanged
+# checks are replayed from the cache; pass --no-cache to force a full run.
+#
+#   python scripts/validate_data.py --root . --jobs 4
+#
+# validates files in a process pool and splits large JSONL files into line
+# ranges across workers. The report is identical to the serial run.
+#
+#   python scripts/validate_data.py --root . --stream
+#
+# validates the verbs JSONL in a single pass that keeps only compact indexes
+# (id -> byte offset, kana -> count), for expanded verb sets far larger than
+# the shipped file. The report is identical to the default mode.
+#
+#   python scripts/validate_data.py --root . --no-cache --profile --profile-memory --format json
+#
+# --profile records wall time, calls and records/sec per phase (schema
+# compilation, JSON reads, JSONL parsing, iter_errors, verb record checks, each
+# cross-check, cache hashing, waiting on --jobs workers); nested phases are
+# timed exclusively, so the phases add up to the run. --profile-memory adds the
+# tracemalloc peak per phase (slower). --format json prints the issues and the
+# profile as one JSON document. Work done inside --jobs workers shows up as
+# worker_wait, and cached units are not rerun, so use --no-cache for timings.
+#
 # Requirements:
 #   pip install jsonschema
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
 import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List, Mapping, Tuple
 
 try:
     from jsonschema import Draft202012Validator
@@ -43,6 +73,10 @@ except Exception:
     raise
 
 HIRAGANA_RE = re.compile(r"^[ぁ-ゟ]+$")  # hiragana + small kana
+PLACEHOLDER_RE = re.compile(r"\{([A-Za-z0-9_]+)\}")  # example-sentence {token}
+DEFAULT_CACHE_PATH = Path(".cache") / "validate_data.json"
+# --jobs only splits a JSONL file when each chunk gets at least this many lines.
+JSONL_CHUNK_MIN_LINES = 500
 
 @dataclass
 class Issue:
@@ -50,6 +84,87 @@ class Issue:
     where: str
     message: str
 
+class PhaseFrame:
+    """One running phase; callers may raise `records` before it ends."""
+
+    __slots__ = ("start", "child_s", "peak", "records")
+
+    def __init__(self, records: int = 0) -> None:
+        self.start = time.perf_counter()
+        self.child_s = 0.0
+        self.peak = 0
+        self.records = records
+
+class PhaseProfiler:
+    """Per-phase wall time (nested phases excluded), calls and records, plus the
+    tracemalloc peak while each phase ran when `trace_memory` is set."""
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.stack: List[PhaseFrame] = []
+        self.started = time.perf_counter()
+        self.total_s = 0.0
+        self.peak_bytes = 0
+        if trace_memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str, records: int = 0) -> Iterator[PhaseFrame]:
+        if self.trace_memory:
+            if self.stack:
+                self.stack[-1].peak = max(self.stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = PhaseFrame(records)
+        self.stack.append(frame)
+        try:
+            yield frame
+        finally:
+            elapsed = time.perf_counter() - frame.start
+            self.stack.pop()
+            stat = self.phases.setdefault(name, {"wall_s": 0.0, "calls": 0, "records": 0, "peak_bytes": 0})
+            stat["wall_s"] += elapsed - frame.child_s
+            stat["calls"] += 1
+            stat["records"] += frame.records
+            if self.stack:
+                self.stack[-1].child_s += elapsed
+            if self.trace_memory:
+                peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+                stat["peak_bytes"] = max(stat["peak_bytes"], peak)
+                self.peak_bytes = max(self.peak_bytes, peak)
+                if self.stack:
+                    self.stack[-1].peak = max(self.stack[-1].peak, peak)
+
+    def stop(self) -> None:
+        self.total_s = time.perf_counter() - self.started
+        if self.trace_memory:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    def as_dict(self) -> Dict[str, Any]:
+        phases = []
+        for name, stat in self.phases.items():
+            row = {"phase": name, "wall_s": round(stat["wall_s"], 6), "calls": stat["calls"], "records": stat["records"],
+                   "records_per_s": round(stat["records"] / stat["wall_s"], 1) if stat["wall_s"] > 0 else None}
+            if self.trace_memory:
+                row["peak_bytes"] = stat["peak_bytes"]
+            phases.append(row)
+        tracked = sum(stat["wall_s"] for stat in self.phases.values())
+        return {
+            "total_wall_s": round(self.total_s, 6),
+            "untracked_wall_s": round(max(0.0, self.total_s - tracked), 6),
+            "peak_bytes": self.peak_bytes if self.trace_memory else None,
+            "phases": phases,
+        }
+
+# Set by run_checks while a profiled run is in progress.
+_PROFILER: PhaseProfiler | None = None
+_NO_PHASE = nullcontext(PhaseFrame())
+
+def _phase(name: str, records: int = 0) -> Any:
+    """Context manager timing `name` under the active profiler (a no-op without one)."""
+    return _NO_PHASE if _PROFILER is None else _PROFILER.phase(name, records)
+
 def find_project_root(start: Path) -> Path:
     """Walk upward until we see 'schemas/' and 'data/' folders."""
     cur = start.resolve()
@@ -62,92 +177,259 @@ def find_project_root(start: Path) -> Path:
     return start.resolve()
 
 def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+    with _phase("read_json", 1):
+        return json.loads(path.read_text(encoding="utf-8"))
 
 def build_validator(schema_path: Path) -> Draft202012Validator:
     schema = load_json(schema_path)
-    return Draft202012Validator(schema)
+    with _phase("compile_schema", 1):
+        return Draft202012Validator(schema)
 
 def validate_json(validator: Draft202012Validator, data: Any, where: str, issues: List[Issue]) -> None:
-    for err in sorted(validator.iter_errors(data), key=str):
+    with _phase("iter_errors", 1):
+        errors = sorted(validator.iter_errors(data), key=str)
+    for err in errors:
         issues.append(Issue("ERROR", where, err.message))
 
-def validate_jsonl_records(
-    schema_validator: Draft202012Validator,
+# One parsed JSONL line: (line number, issues found on that line alone, record or None)
+LineResult = Tuple[int, List[Issue], Any]
+# Compact verb summary for streaming: (id, kana, has disambiguation, byte offset)
+RecordKey = Tuple[Any, Any, bool, int]
+
+def check_jsonl_line(schema_validator: Draft202012Validator, line: str, where: str) -> Tuple[List[Issue], Dict[str, Any] | None]:
+    """Checks that need only the line itself (schema, kana, gloss, id shape)."""
+    issues: List[Issue] = []
+    try:
+        with _phase("parse_jsonl", 1):
+            rec = json.loads(line)
+    except Exception as e:
+        issues.append(Issue("ERROR", where, f"Invalid JSON: {e}"))
+        return issues, None
+
+    # Schema validation
+    validate_json(schema_validator, rec, where, issues)
+
+    # Basic integrity checks (align with DATA_SPEC.md)
+    with _phase("verb_checks", 1):
+        kana = rec.get("kana")
+        if not isinstance(kana, str) or not kana:
+            issues.append(Issue("ERROR", where, "Missing or invalid 'kana'."))
+        elif not HIRAGANA_RE.match(kana):
+            issues.append(Issue("ERROR", where, f"'kana' must be hiragana-only. Got: {kana!r}"))
+
+        gloss = rec.get("gloss_en")
+        if not isinstance(gloss, list) or len(gloss) == 0 or not all(isinstance(x, str) and x.strip() for x in gloss):
+            issues.append(Issue("ERROR", where, "'gloss_en' must be a non-empty array of strings."))
+
+        rid = rec.get("id")
+        if not isinstance(rid, str) or not rid:
+            issues.append(Issue("ERROR", where, "Missing or invalid 'id'."))
+    return issues, rec
+
+def compact_record(rec: Any, offset: int) -> RecordKey:
+    """The only fields file-level and cross-file checks need from a verb record."""
+    if not isinstance(rec, dict):
+        return (None, None, False, offset)
+    return (rec.get("id"), rec.get("kana"), bool(rec.get("disambiguation")), offset)
+
+def iter_jsonl_range(
+    schema_validator: Draft202012Validator | None,
     jsonl_path: Path,
-    issues: List[Issue],
-) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
-    records: List[Dict[str, Any]] = []
-    by_id: Dict[str, Dict[str, Any]] = {}
+    start: int = 0,
+    stop: int | None = None,
+    first_lineno: int = 1,
+    compact: bool = False,
+) -> Iterator[LineResult]:
+    """Yield per-line results over bytes [start, stop) of a JSONL file.
 
-    if not jsonl_path.exists():
-        issues.append(Issue("ERROR", str(jsonl_path), "File not found."))
-        return records, by_id
+    `start` must sit at the beginning of line `first_lineno`; `stop` (None for
+    end of file) must sit at a line boundary. With `compact`, the record slot
+    holds a RecordKey instead of the parsed record. Without a validator the
+    lines are only parsed (used to rebuild indexes for cached runs).
+    """
+    with jsonl_path.open("rb") as f:
+        f.seek(start)
+        lineno = first_lineno
+        pos = start
+        while stop is None or pos < stop:
+            raw = f.readline()
+            if not raw:
+                break
+            offset = pos
+            pos += len(raw)
+            line = raw.decode("utf-8").strip()
+            if line:
+                if schema_validator is None:
+                    try:
+                        with _phase("parse_jsonl", 1):
+                            line_issues, rec = [], json.loads(line)
+                    except Exception:
+                        line_issues, rec = [], None
+                else:
+                    line_issues, rec = check_jsonl_line(schema_validator, line, f"{jsonl_path}:{lineno}")
+                if compact and rec is not None:
+                    rec = compact_record(rec, offset)
+                yield (lineno, line_issues, rec)
+            lineno += 1
 
-    with jsonl_path.open("r", encoding="utf-8") as f:
-        for lineno, raw in enumerate(f, start=1):
-            line = raw.strip()
-            if not line:
-                continue
-            where = f"{jsonl_path}:{lineno}"
-            try:
-                rec = json.loads(line)
-            except Exception as e:
-                issues.append(Issue("ERROR", where, f"Invalid JSON: {e}"))
-                continue
+def check_jsonl_range(
+    schema_validator: Draft202012Validator,
+    jsonl_path: Path,
+    start: int = 0,
+    stop: int | None = None,
+    first_lineno: int = 1,
+    compact: bool = False,
+) -> List[LineResult]:
+    """List form of iter_jsonl_range; used whole-file by the serial path and
+    per chunk by --jobs workers."""
+    return list(iter_jsonl_range(schema_validator, jsonl_path, start, stop, first_lineno, compact))
 
-            # Schema validation
-            validate_json(schema_validator, rec, where, issues)
+class VerbIndex:
+    """Compact stand-in for the parsed verbs list in --stream mode.
 
-            # Basic integrity checks (align with DATA_SPEC.md)
-            kana = rec.get("kana")
-            if not isinstance(kana, str) or not kana:
-                issues.append(Issue("ERROR", where, "Missing or invalid 'kana'."))
-            elif not HIRAGANA_RE.match(kana):
-                issues.append(Issue("ERROR", where, f"'kana' must be hiragana-only. Got: {kana!r}"))
+    Holds id -> byte offset, kana -> count and the (kana, id) of records
+    without a disambiguation, which is all the file-level and cross-file
+    checks read. Full records can still be fetched by id via `record()`.
+    """
 
-            gloss = rec.get("gloss_en")
-            if not isinstance(gloss, list) or len(gloss) == 0 or not all(isinstance(x, str) and x.strip() for x in gloss):
-                issues.append(Issue("ERROR", where, "'gloss_en' must be a non-empty array of strings."))
+    def __init__(self, jsonl_path: Path) -> None:
+        self.path = jsonl_path
+        self.offsets: Dict[str, int] = {}
+        self.kana_counts: Dict[str, int] = {}
+        self.undisambiguated: List[Tuple[str, Any]] = []
+        self.count = 0
 
-            rid = rec.get("id")
-            if not isinstance(rid, str) or not rid:
-                issues.append(Issue("ERROR", where, "Missing or invalid 'id'."))
+    def add(self, lineno: int, key: RecordKey, issues: List[Issue]) -> None:
+        rid, kana, disambiguated, offset = key
+        if isinstance(rid, str) and rid:
+            if rid in self.offsets:
+                issues.append(Issue("ERROR", f"{self.path}:{lineno}", f"Duplicate id: {rid!r}"))
             else:
-                if rid in by_id:
-                    issues.append(Issue("ERROR", where, f"Duplicate id: {rid!r}"))
-                else:
-                    by_id[rid] = rec
+                self.offsets[rid] = offset
+        if isinstance(kana, str):
+            self.kana_counts[kana] = self.kana_counts.get(kana, 0) + 1
+            if not disambiguated:
+                self.undisambiguated.append((kana, rid))
+        self.count += 1
 
-            records.append(rec)
+    def finish(self, issues: List[Issue]) -> None:
+        # Same soft warning as merge_jsonl_results, in the same record order.
+        for kana, rid in self.undisambiguated:
+            if self.kana_counts.get(kana, 0) > 1:
+                issues.append(Issue("WARN", str(self.path), f"kana {kana!r} appears multiple times but an entry has null/empty disambiguation (id={rid})."))
+
+    def record(self, rid: str) -> Dict[str, Any]:
+        with self.path.open("rb") as f:
+            f.seek(self.offsets[rid])
+            return json.loads(f.readline())
+
+def stream_jsonl_records(
+    schema_validator: Draft202012Validator | None,
+    jsonl_path: Path,
+    issues: List[Issue],
+    chunks: Iterable[Iterable[LineResult]] | None = None,
+) -> VerbIndex:
+    """One pass over the verbs JSONL keeping only a VerbIndex.
+
+    `chunks` supplies precomputed compact results (from --jobs workers);
+    otherwise the file is read here line by line.
+    """
+    index = VerbIndex(jsonl_path)
+    if chunks is None:
+        if not jsonl_path.exists():
+            issues.append(Issue("ERROR", str(jsonl_path), "File not found."))
+            return index
+        chunks = [iter_jsonl_range(schema_validator, jsonl_path, compact=True)]
+    with _phase("verb_file_checks") as phase:
+        for chunk in chunks:
+            for lineno, line_issues, key in chunk:
+                issues.extend(line_issues)
+                if key is not None:
+                    index.add(lineno, key, issues)
+        index.finish(issues)
+        phase.records = index.count
+    return index
+
+def merge_jsonl_results(
+    chunks: List[List[LineResult]],
+    jsonl_path: Path,
+    issues: List[Issue],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Fold per-line results (in file order) into records, ids and file-level checks."""
+    with _phase("verb_file_checks") as phase:
+        records: List[Dict[str, Any]] = []
+        by_id: Dict[str, Dict[str, Any]] = {}
 
-    # Soft warning: if kana appears multiple times, disambiguation should be present for each entry.
-    kana_counts: Dict[str, int] = {}
-    for r in records:
-        k = r.get("kana")
-        if isinstance(k, str):
-            kana_counts[k] = kana_counts.get(k, 0) + 1
-    for r in records:
-        k = r.get("kana")
-        if isinstance(k, str) and kana_counts.get(k, 0) > 1:
-            if not r.get("disambiguation"):
-                issues.append(Issue("WARN", str(jsonl_path), f"kana {k!r} appears multiple times but an entry has null/empty disambiguation (id={r.get('id')})."))
+        for chunk in chunks:
+            for lineno, line_issues, rec in chunk:
+                issues.extend(line_issues)
+                if rec is None:
+                    continue
+                rid = rec.get("id")
+                if isinstance(rid, str) and rid:
+                    if rid in by_id:
+                        issues.append(Issue("ERROR", f"{jsonl_path}:{lineno}", f"Duplicate id: {rid!r}"))
+                    else:
+                        by_id[rid] = rec
+                records.append(rec)
 
+        # Soft warning: if kana appears multiple times, disambiguation should be present for each entry.
+        kana_counts: Dict[str, int] = {}
+        for r in records:
+            k = r.get("kana")
+            if isinstance(k, str):
+                kana_counts[k] = kana_counts.get(k, 0) + 1
+        for r in records:
+            k = r.get("kana")
+            if isinstance(k, str) and kana_counts.get(k, 0) > 1:
+                if not r.get("disambiguation"):
+                    issues.append(Issue("WARN", str(jsonl_path), f"kana {k!r} appears multiple times but an entry has null/empty disambiguation (id={r.get('id')})."))
+
+        phase.records = len(records)
     return records, by_id
 
+def validate_jsonl_records(
+    schema_validator: Draft202012Validator,
+    jsonl_path: Path,
+    issues: List[Issue],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    if not jsonl_path.exists():
+        issues.append(Issue("ERROR", str(jsonl_path), "File not found."))
+        return [], {}
+    return merge_jsonl_results([check_jsonl_range(schema_validator, jsonl_path)], jsonl_path, issues)
+
+def split_jsonl(jsonl_path: Path, parts: int, min_lines: int = JSONL_CHUNK_MIN_LINES) -> List[Tuple[int, int | None, int]]:
+    """Cut a JSONL file into up to `parts` line-aligned (start, stop, first_lineno) ranges."""
+    with jsonl_path.open("rb") as f:
+        line_starts = [0]
+        for raw in f:
+            line_starts.append(line_starts[-1] + len(raw))
+    total = len(line_starts) - 1
+    parts = max(1, min(parts, total // max(1, min_lines)))
+    ranges: List[Tuple[int, int | None, int]] = []
+    for i in range(parts):
+        first = total * i // parts
+        last = total * (i + 1) // parts
+        stop = None if i == parts - 1 else line_starts[last]
+        ranges.append((line_starts[first], stop, first + 1))
+    return ranges
+
 def validate_exceptions_against_verbs(
     exceptions: Dict[str, Any],
-    verbs_by_id: Dict[str, Dict[str, Any]],
+    verbs_by_id: Mapping[str, Any],
     verbs_records: List[Dict[str, Any]],
     issues: List[Issue],
     where: str,
+    verbs_by_kana: Container[str] | None = None,
 ) -> None:
-    # Build quick lookup by kana
-    verbs_by_kana: Dict[str, List[Dict[str, Any]]] = {}
-    for r in verbs_records:
-        k = r.get("kana")
-        if isinstance(k, str):
-            verbs_by_kana.setdefault(k, []).append(r)
+    # Build quick lookup by kana (streaming callers pass their kana index instead)
+    if verbs_by_kana is None:
+        by_kana: Dict[str, List[Dict[str, Any]]] = {}
+        for r in verbs_records:
+            k = r.get("kana")
+            if isinstance(k, str):
+                by_kana.setdefault(k, []).append(r)
+        verbs_by_kana = by_kana
 
     # irregular_verbs should exist in verbs list (by kana)
     for k in exceptions.get("irregular_verbs", []):
@@ -178,7 +460,7 @@ def validate_exceptions_against_verbs(
 
 def validate_example_sentences(
     example_sentences: Dict[str, Any],
-    verbs_by_id: Dict[str, Dict[str, Any]],
+    verbs_by_id: Mapping[str, Any],
     templates: List[Dict[str, Any]],
     issues: List[Issue],
     where: str,
@@ -231,12 +513,42 @@ def validate_example_sentences(
         issues.append(Issue("ERROR", where, "lexicon must be an object if present."))
         lexicon = {}
 
-    placeholder_re = re.compile(r"\{([A-Za-z0-9_]+)\}")
+    # Reference indexes, built once: every later check is a set operation.
+    known_placeholders = set(k for k in lexicon.keys() if isinstance(k, str))
+    known_placeholders.add("V")
+    token_cache: Dict[str, frozenset] = {}
+
+    def unknown_placeholders(text: str) -> frozenset:
+        tokens = token_cache.get(text)
+        if tokens is None:
+            tokens = token_cache[text] = frozenset(PLACEHOLDER_RE.findall(text))
+        return tokens - known_placeholders if tokens else tokens
 
     for template_id, tpl in tpl_map.items():
         if not isinstance(tpl, dict):
             issues.append(Issue("ERROR", where, f"templates[{template_id!r}] must be an object."))
             continue
+
+        # Missing references for this template: value -> locations, in first-seen order.
+        missing_tokens: Dict[str, List[str]] = {}
+        missing_cids: Dict[str, List[str]] = {}
+        missing_vids: Dict[str, List[str]] = {}
+
+        def collect(ex: Dict[str, Any], loc: str) -> bool:
+            """Record unknown placeholders/character ids; False if character_ids is malformed."""
+            text = ex.get("text")
+            if isinstance(text, str):
+                for token in sorted(unknown_placeholders(text)):
+                    missing_tokens.setdefault(token, []).append(f"{loc}.text")
+            cids = ex.get("character_ids", [])
+            if not isinstance(cids, list):
+                issues.append(Issue("ERROR", where, f"templates[{template_id!r}].{loc}.character_ids must be an array."))
+                return False
+            for cid in cids:
+                if cid not in character_ids:
+                    missing_cids.setdefault(cid, []).append(loc)
+            return True
+
         by_class = tpl.get("by_verb_class", {})
         if not isinstance(by_class, dict):
             issues.append(Issue("ERROR", where, f"templates[{template_id!r}].by_verb_class must be an object."))
@@ -249,20 +561,7 @@ def validate_example_sentences(
                 if not isinstance(ex, dict):
                     issues.append(Issue("ERROR", where, f"templates[{template_id!r}].by_verb_class[{verb_class!r}][{i}] must be an object."))
                     continue
-                text = ex.get("text")
-                if isinstance(text, str):
-                    for token in placeholder_re.findall(text):
-                        if token == "V":
-                            continue
-                        if token not in lexicon:
-                            issues.append(Issue("ERROR", where, f"Unknown placeholder {{{token}}} in templates[{template_id!r}].by_verb_class[{verb_class!r}][{i}].text"))
-                cids = ex.get("character_ids", [])
-                if not isinstance(cids, list):
-                    issues.append(Issue("ERROR", where, f"templates[{template_id!r}].by_verb_class[{verb_class!r}][{i}].character_ids must be an array."))
-                    continue
-                for cid in cids:
-                    if cid not in character_ids:
-                        issues.append(Issue("ERROR", where, f"templates[{template_id!r}].by_verb_class[{verb_class!r}][{i}] references unknown character_id: {cid!r}"))
+                collect(ex, f"by_verb_class[{verb_class!r}][{i}]")
 
         # overrides: verb_ids must exist; examples must reference valid characters
         overrides = tpl.get("overrides", []) or []
@@ -281,7 +580,7 @@ def validate_example_sentences(
                         continue
                     for vid in vids:
                         if vid not in verbs_by_id:
-                            issues.append(Issue("ERROR", where, f"templates[{template_id!r}].overrides[{j}] references missing verb id: {vid!r}"))
+                            missing_vids.setdefault(vid, []).append(f"overrides[{j}]")
                         if vid in used_verb_ids:
                             issues.append(Issue("ERROR", where, f"templates[{template_id!r}] has duplicate override for verb id: {vid!r}"))
                         used_verb_ids.add(vid)
@@ -298,20 +597,35 @@ def validate_example_sentences(
                         if not isinstance(ex, dict):
                             issues.append(Issue("ERROR", where, f"templates[{template_id!r}].overrides[{j}].examples[{k}] must be an object."))
                             continue
-                        text = ex.get("text")
-                        if isinstance(text, str):
-                            for token in placeholder_re.findall(text):
-                                if token == "V":
-                                    continue
-                                if token not in lexicon:
-                                    issues.append(Issue("ERROR", where, f"Unknown placeholder {{{token}}} in templates[{template_id!r}].overrides[{j}].examples[{k}].text"))
-                        cids = ex.get("character_ids", [])
-                        if not isinstance(cids, list):
-                            issues.append(Issue("ERROR", where, f"templates[{template_id!r}].overrides[{j}].examples[{k}].character_ids must be an array."))
-                            continue
-                        for cid in cids:
-                            if cid not in character_ids:
-                                issues.append(Issue("ERROR", where, f"templates[{template_id!r}].overrides[{j}].examples[{k}] references unknown character_id: {cid!r}"))
+                        collect(ex, f"overrides[{j}].examples[{k}]")
+
+        # One batch per template and reference kind.
+        if missing_tokens:
+            issues.append(Issue("ERROR", where, f"templates[{template_id!r}] has unknown placeholders: " + format_missing(missing_tokens, "{{{}}}")))
+        if missing_cids:
+            issues.append(Issue("ERROR", where, f"templates[{template_id!r}] references unknown character_ids: " + format_missing(missing_cids)))
+        if missing_vids:
+            issues.append(Issue("ERROR", where, f"templates[{template_id!r}] overrides reference missing verb ids: " + format_missing(missing_vids)))
+
+def count_examples(example_sentences: Dict[str, Any]) -> int:
+    """Examples (class lists and overrides) in an example_sentences file, for --profile rates."""
+    total = 0
+    templates = example_sentences.get("templates")
+    for tpl in templates.values() if isinstance(templates, dict) else []:
+        if not isinstance(tpl, dict):
+            continue
+        by_class = tpl.get("by_verb_class")
+        if isinstance(by_class, dict):
+            total += sum(len(v) for v in by_class.values() if isinstance(v, list))
+        overrides = tpl.get("overrides")
+        if isinstance(overrides, list):
+            total += sum(len(ov.get("examples") or []) if isinstance(ov, dict) and isinstance(ov.get("examples"), list) else 1
+                         for ov in overrides)
+    return total
+
+def format_missing(missing: Dict[Any, List[str]], fmt: str = "{!r}") -> str:
+    """Render {value: [locations]} as "value (loc, loc); value (loc)"."""
+    return "; ".join(f"{fmt.format(value)} ({', '.join(locs)})" for value, locs in missing.items())
 
 def validate_learning_path(
     path_data: Dict[str, Any],
@@ -378,12 +692,152 @@ def print_report(issues: List[Issue], verbs_count: int | None = None) -> None:
     if not issues:
         print("All checks passed.")
 
-def main() -> int:
-    ap = argparse.ArgumentParser(description="Validate language data files for Japanese SRS App.")
-    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'schemas/' (default: current dir)")
-    args = ap.parse_args()
+def print_profile(profile: Dict[str, Any]) -> None:
+    total = profile["total_wall_s"]
+    memory = profile["peak_bytes"] is not None
+    title = f"\n=== PROFILE ({total:.3f} s wall"
+    print(title + (f", peak {profile['peak_bytes'] / 1e6:.1f} MB traced) ===" if memory else ") ==="))
+    header = f"{'phase':24s} {'wall s':>9s} {'share':>6s} {'calls':>8s} {'records':>9s} {'records/s':>11s}"
+    print(header + (f" {'peak MB':>8s}" if memory else ""))
+    rows = sorted(profile["phases"], key=lambda row: -row["wall_s"])
+    rows.append({"phase": "(untracked)", "wall_s": profile["untracked_wall_s"], "calls": None, "records": None, "records_per_s": None})
+    for row in rows:
+        line = (f"{row['phase']:24s} {row['wall_s']:9.4f} {row['wall_s'] / total if total else 0:6.1%} "
+                f"{row['calls'] if row['calls'] is not None else '':>8} {row['records'] if row['records'] is not None else '':>9} "
+                f"{format(row['records_per_s'], ',.0f') if row['records'] else '':>11s}")
+        if memory and "peak_bytes" in row:
+            line += f" {row['peak_bytes'] / 1e6:8.1f}"
+        print(line)
 
-    root = find_project_root(Path(args.root))
+def report_dict(issues: List[Issue], verbs_count: int | None = None, profile: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """The --format json document: counts, every issue in report order, and the profile."""
+    return {
+        "verbs_count": verbs_count,
+        "errors": sum(1 for i in issues if i.severity == "ERROR"),
+        "warnings": sum(1 for i in issues if i.severity == "WARN"),
+        "issues": [{"severity": i.severity, "where": i.where, "message": i.message}
+                   for i in sorted(issues, key=lambda i: i.severity != "ERROR")],
+        "profile": profile,
+    }
+
+def validate_json_file(validator: Draft202012Validator, path: Path, issues: List[Issue]) -> Any:
+    """Load and schema-check one JSON file; returns the data (None if unreadable)."""
+    data = None
+    if path.exists():
+        try:
+            data = load_json(path)
+            validate_json(validator, data, str(path), issues)
+        except Exception as e:
+            issues.append(Issue("ERROR", str(path), f"Invalid JSON: {e}"))
+    else:
+        issues.append(Issue("ERROR", str(path), "File not found."))
+    return data
+
+def load_json_quiet(path: Path) -> Any:
+    """Load JSON for a cross-check whose schema pass was answered from cache."""
+    try:
+        return load_json(path)
+    except Exception:
+        return None
+
+def load_jsonl_records(jsonl_path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Parse JSONL the same way validate_jsonl_records does, without checking it."""
+    records: List[Dict[str, Any]] = []
+    by_id: Dict[str, Dict[str, Any]] = {}
+    if not jsonl_path.exists():
+        return records, by_id
+    with jsonl_path.open("r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            rid = rec.get("id")
+            if isinstance(rid, str) and rid and rid not in by_id:
+                by_id[rid] = rec
+            records.append(rec)
+    return records, by_id
+
+def file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+class ValidationCache:
+    """Persistent results of individual check units, keyed by input content hashes.
+
+    Each unit (one schema pass or one cross-file check) is stored under its name
+    with a digest of this script plus every input file it reads. A unit whose
+    digest is unchanged replays its stored issues instead of running again.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        if path is not None and path.exists():
+            try:
+                data = load_json(path)
+                if data.get("version") == self.VERSION and isinstance(data.get("entries"), dict):
+                    self.entries = data["entries"]
+            except Exception:
+                self.entries = {}
+
+    def lookup(self, unit: str, digest: str) -> Dict[str, Any] | None:
+        entry = self.entries.get(unit)
+        if entry and entry.get("digest") == digest:
+            return entry
+        return None
+
+    def store(self, unit: str, digest: str, issues: List[Issue], extra: Any) -> None:
+        self.entries[unit] = {
+            "digest": digest,
+            "issues": [[i.severity, i.where, i.message] for i in issues],
+            "extra": extra,
+        }
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "entries": self.entries}, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
+        self.dirty = False
+
+def run_checks(
+    root: Path,
+    cache: ValidationCache | None = None,
+    jobs: int = 1,
+    stream: bool = False,
+    profiler: PhaseProfiler | None = None,
+) -> Tuple[List[Issue], int | None]:
+    """Run every schema and cross-file check under `root`.
+
+    Returns the collected issues and the number of verb records loaded
+    (None when validation could not start, e.g. a schema is missing).
+    With a cache, units whose inputs are unchanged are replayed, not rerun.
+    With jobs > 1, schema passes (and verbs JSONL chunks) run in a process
+    pool; issue order is identical to the serial run.
+    With stream, the verbs JSONL is never held in memory: one pass builds a
+    VerbIndex and the cross-file checks are answered from it.
+    With a profiler, every phase of this run is timed into it.
+    """
+    global _PROFILER
+    _PROFILER = profiler
+    try:
+        return _run_checks(root, cache, jobs, stream)
+    finally:
+        _PROFILER = None
+
+def _run_checks(root: Path, cache: ValidationCache | None, jobs: int, stream: bool) -> Tuple[List[Issue], int | None]:
     schemas_dir = root / "schemas"
     data_dir = root / "data"
 
@@ -408,72 +862,221 @@ def main() -> int:
         if not p.exists():
             issues.append(Issue("ERROR", str(p), "Schema file not found."))
     if any(i.severity == "ERROR" for i in issues):
-        print_report(issues)
-        return 1
+        return issues, None
 
-    verbs_validator = build_validator(verbs_schema_path)
-    templates_validator = build_validator(templates_schema_path)
-    exceptions_validator = build_validator(exceptions_schema_path)
-    example_sentences_validator = build_validator(example_sentences_schema_path)
-    learning_path_validator = build_validator(learning_path_schema_path)
+    # Validators are compiled on first use, so fully cached runs never build them.
+    validators: Dict[Path, Draft202012Validator] = {}
 
-    # Validate verbs JSONL (line-by-line)
-    verbs_records, verbs_by_id = validate_jsonl_records(verbs_validator, verbs_jsonl_path, issues)
+    def validator(schema_path: Path) -> Draft202012Validator:
+        if schema_path not in validators:
+            validators[schema_path] = build_validator(schema_path)
+        return validators[schema_path]
 
-    # Validate conjugation templates JSON
-    templates = None
-    if templates_json_path.exists():
-        try:
-            templates = load_json(templates_json_path)
-            validate_json(templates_validator, templates, str(templates_json_path), issues)
-        except Exception as e:
-            issues.append(Issue("ERROR", str(templates_json_path), f"Invalid JSON: {e}"))
-    else:
-        issues.append(Issue("ERROR", str(templates_json_path), "File not found."))
+    digests: Dict[Path, str] = {}
 
-    # Validate exceptions JSON
-    exceptions_data = None
-    if exceptions_json_path.exists():
-        try:
-            exceptions_data = load_json(exceptions_json_path)
-            validate_json(exceptions_validator, exceptions_data, str(exceptions_json_path), issues)
-        except Exception as e:
-            issues.append(Issue("ERROR", str(exceptions_json_path), f"Invalid JSON: {e}"))
-    else:
-        issues.append(Issue("ERROR", str(exceptions_json_path), "File not found."))
+    def unit_digest(inputs: List[Path]) -> str:
+        h = hashlib.sha256()
+        for p in [Path(__file__).resolve(), *inputs]:
+            if p not in digests:
+                with _phase("cache_digest", 1):
+                    digests[p] = file_digest(p)
+            h.update(f"{p}\0{digests[p]}\0".encode("utf-8"))
+        return h.hexdigest()
 
-    # Validate example sentences JSON
-    example_sentences = None
-    if example_sentences_json_path.exists():
-        try:
-            example_sentences = load_json(example_sentences_json_path)
-            validate_json(example_sentences_validator, example_sentences, str(example_sentences_json_path), issues)
-        except Exception as e:
-            issues.append(Issue("ERROR", str(example_sentences_json_path), f"Invalid JSON: {e}"))
-    else:
-        issues.append(Issue("ERROR", str(example_sentences_json_path), "File not found."))
+    def is_cached(name: str, inputs: List[Path]) -> bool:
+        return cache is not None and cache.lookup(name, unit_digest(inputs)) is not None
 
-    # Cross-file checks
-    if isinstance(exceptions_data, dict) and verbs_records:
-        validate_exceptions_against_verbs(exceptions_data, verbs_by_id, verbs_records, issues, str(exceptions_json_path))
-    if isinstance(example_sentences, dict) and isinstance(templates, list):
-        validate_example_sentences(example_sentences, verbs_by_id, templates, issues, str(example_sentences_json_path))
+    def unit(name: str, inputs: List[Path], compute: Callable[[List[Issue]], Any]) -> Any:
+        if cache is None:
+            return compute(issues)
+        digest = unit_digest(inputs)
+        hit = cache.lookup(name, digest)
+        if hit is not None:
+            issues.extend(Issue(*i) for i in hit["issues"])
+            return hit.get("extra")
+        unit_issues: List[Issue] = []
+        extra = compute(unit_issues)
+        issues.extend(unit_issues)
+        cache.store(name, digest, unit_issues, extra)
+        return extra
 
-    # Validate learning path JSON files
+    # Schema passes over single files: (unit name, schema, data file)
+    schema_units: List[Tuple[str, Path, Path]] = [
+        ("schema:templates", templates_schema_path, templates_json_path),
+        ("schema:exceptions", exceptions_schema_path, exceptions_json_path),
+        ("schema:example_sentences", example_sentences_schema_path, example_sentences_json_path),
+    ]
     for learning_path_json_path in [guided_path_json_path, genki_path_json_path]:
-        learning_path_data = None
-        if learning_path_json_path.exists():
-            try:
-                learning_path_data = load_json(learning_path_json_path)
-                validate_json(learning_path_validator, learning_path_data, str(learning_path_json_path), issues)
-            except Exception as e:
-                issues.append(Issue("ERROR", str(learning_path_json_path), f"Invalid JSON: {e}"))
-        else:
-            issues.append(Issue("ERROR", str(learning_path_json_path), "File not found."))
-        if isinstance(learning_path_data, dict) and isinstance(templates, list):
-            validate_learning_path(learning_path_data, templates, issues, str(learning_path_json_path))
-
-    print_report(issues, verbs_count=len(verbs_records))
+        schema_units.append((f"schema:{learning_path_json_path.name}", learning_path_schema_path, learning_path_json_path))
+
+    # With --jobs, submit every schema pass that will actually run up front; the
+    # units below then collect results in the serial order, so reports match.
+    pool: ProcessPoolExecutor | None = None
+    pending: Dict[Path, Any] = {}
+    verbs_chunks: List[Any] = []
+    if jobs > 1:
+        verbs_needed = verbs_jsonl_path.exists() and not is_cached("schema:verbs", [verbs_schema_path, verbs_jsonl_path])
+        to_run = [(sp, p) for name, sp, p in schema_units if not is_cached(name, [sp, p])]
+        if verbs_needed or to_run:
+            pool = ProcessPoolExecutor(max_workers=jobs)
+        if pool is not None and verbs_needed:
+            for start, stop, first_lineno in split_jsonl(verbs_jsonl_path, jobs):
+                verbs_chunks.append(pool.submit(_jsonl_chunk_task, verbs_schema_path, verbs_jsonl_path, start, stop, first_lineno, stream))
+        if pool is not None:
+            for schema_path, path in to_run:
+                pending[path] = pool.submit(_schema_task, schema_path, path)
+
+    # Parsed inputs, filled by whichever unit needs them first.
+    loaded: Dict[Any, Any] = {}
+
+    def verbs() -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        if "verbs" not in loaded:
+            loaded["verbs"] = load_jsonl_records(verbs_jsonl_path)
+        return loaded["verbs"]
+
+    def verb_index() -> VerbIndex:
+        if "verb_index" not in loaded:
+            loaded["verb_index"] = stream_jsonl_records(None, verbs_jsonl_path, [])
+        return loaded["verb_index"]
+
+    def verb_ids() -> Mapping[str, Any]:
+        return verb_index().offsets if stream else verbs()[1]
+
+    def data(path: Path) -> Any:
+        if path not in loaded:
+            loaded[path] = load_json_quiet(path)
+        return loaded[path]
+
+    def schema_unit(schema_path: Path, path: Path) -> Callable[[List[Issue]], Any]:
+        def compute(out: List[Issue]) -> None:
+            if path in pending:
+                with _phase("worker_wait"):
+                    unit_issues, loaded[path] = pending.pop(path).result()
+                out.extend(unit_issues)
+            else:
+                loaded[path] = validate_json_file(validator(schema_path), path, out)
+        return compute
+
+    try:
+        # Validate verbs JSONL (line-by-line)
+        def check_verbs(out: List[Issue]) -> Dict[str, Any]:
+            if stream:
+                with _phase("worker_wait"):
+                    chunks = [f.result() for f in verbs_chunks] if verbs_chunks else None
+                loaded["verb_index"] = stream_jsonl_records(validator(verbs_schema_path), verbs_jsonl_path, out, chunks)
+                return {"count": loaded["verb_index"].count}
+            if verbs_chunks:
+                with _phase("worker_wait"):
+                    chunks = [f.result() for f in verbs_chunks]
+                loaded["verbs"] = merge_jsonl_results(chunks, verbs_jsonl_path, out)
+            else:
+                loaded["verbs"] = validate_jsonl_records(validator(verbs_schema_path), verbs_jsonl_path, out)
+            return {"count": len(loaded["verbs"][0])}
+
+        verbs_summary = unit("schema:verbs", [verbs_schema_path, verbs_jsonl_path], check_verbs)
+
+        # Validate conjugation templates, exceptions and example sentences JSON
+        for name, schema_path, path in schema_units[:3]:
+            unit(name, [schema_path, path], schema_unit(schema_path, path))
+
+        # Cross-file checks
+        def check_exceptions(out: List[Issue]) -> None:
+            exceptions_data = data(exceptions_json_path)
+            if stream:
+                index = verb_index()
+                if isinstance(exceptions_data, dict) and index.count:
+                    with _phase("cross_exceptions", index.count):
+                        validate_exceptions_against_verbs(exceptions_data, index.offsets, [], out, str(exceptions_json_path), verbs_by_kana=index.kana_counts)
+                return
+            verbs_records, verbs_by_id = verbs()
+            if isinstance(exceptions_data, dict) and verbs_records:
+                with _phase("cross_exceptions", len(verbs_records)):
+                    validate_exceptions_against_verbs(exceptions_data, verbs_by_id, verbs_records, out, str(exceptions_json_path))
+
+        def check_example_sentences(out: List[Issue]) -> None:
+            example_sentences = data(example_sentences_json_path)
+            templates = data(templates_json_path)
+            if isinstance(example_sentences, dict) and isinstance(templates, list):
+                ids = verb_ids()
+                with _phase("cross_example_sentences", count_examples(example_sentences)):
+                    validate_example_sentences(example_sentences, ids, templates, out, str(example_sentences_json_path))
+
+        unit("cross:exceptions", [exceptions_json_path, verbs_jsonl_path], check_exceptions)
+        unit("cross:example_sentences", [example_sentences_json_path, verbs_jsonl_path, templates_json_path], check_example_sentences)
+
+        # Validate learning path JSON files
+        for name, schema_path, learning_path_json_path in schema_units[3:]:
+            def check_learning_path(out: List[Issue], path: Path = learning_path_json_path) -> None:
+                learning_path_data = data(path)
+                templates = data(templates_json_path)
+                if isinstance(learning_path_data, dict) and isinstance(templates, list):
+                    stages = learning_path_data.get("stages")
+                    with _phase("cross_learning_path", len(stages) if isinstance(stages, list) else 0):
+                        validate_learning_path(learning_path_data, templates, out, str(path))
+
+            unit(name, [schema_path, learning_path_json_path], schema_unit(schema_path, learning_path_json_path))
+            unit(f"cross:{learning_path_json_path.name}", [learning_path_json_path, templates_json_path], check_learning_path)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if cache is not None:
+        cache.save()
+    return issues, verbs_summary["count"]
+
+# --jobs workers: each process compiles a schema's validator once and reuses it.
+_WORKER_VALIDATORS: Dict[str, Draft202012Validator] = {}
+
+def _worker_validator(schema_path: Path) -> Draft202012Validator:
+    key = str(schema_path)
+    if key not in _WORKER_VALIDATORS:
+        _WORKER_VALIDATORS[key] = build_validator(schema_path)
+    return _WORKER_VALIDATORS[key]
+
+def _schema_task(schema_path: Path, path: Path) -> Tuple[List[Issue], Any]:
+    issues: List[Issue] = []
+    data = validate_json_file(_worker_validator(schema_path), path, issues)
+    return issues, data
+
+def _jsonl_chunk_task(
+    schema_path: Path,
+    jsonl_path: Path,
+    start: int,
+    stop: int | None,
+    first_lineno: int,
+    compact: bool,
+) -> List[LineResult]:
+    return check_jsonl_range(_worker_validator(schema_path), jsonl_path, start, stop, first_lineno, compact)
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Validate language data files for Japanese SRS App.")
+    ap.add_argument("--root", default=".", help="Project root containing 'data/' and 'schemas/' (default: current dir)")
+    ap.add_argument("--cache-file", default=None, help="Validation cache path (default: <root>/.cache/validate_data.json)")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not update the validation cache")
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes for schema validation (default: 1, serial)")
+    ap.add_argument("--stream", action="store_true", help="Validate the verbs JSONL in one pass without keeping records in memory")
+    ap.add_argument("--profile", action="store_true", help="Record wall time, calls and records/sec per validation phase")
+    ap.add_argument("--profile-memory", action="store_true", help="Like --profile, plus the tracemalloc peak per phase (slower)")
+    ap.add_argument("--format", choices=["text", "json"], default="text", help="Report format (default: text)")
+    args = ap.parse_args()
+
+    root = find_project_root(Path(args.root))
+    profiler = PhaseProfiler(trace_memory=args.profile_memory) if args.profile or args.profile_memory else None
+    cache = None
+    if not args.no_cache:
+        with profiler.phase("read_cache") if profiler else nullcontext():
+            cache = ValidationCache(Path(args.cache_file) if args.cache_file else root / DEFAULT_CACHE_PATH)
+    issues, verbs_count = run_checks(root, cache, jobs=max(1, args.jobs), stream=args.stream, profiler=profiler)
+    profile = None
+    if profiler is not None:
+        profiler.stop()
+        profile = profiler.as_dict()
+    if args.format == "json":
+        print(json.dumps(report_dict(issues, verbs_count, profile), ensure_ascii=False, indent=2))
+    else:
+        print_report(issues, verbs_count=verbs_count)
+        if profile is not None:
+            print_profile(profile)
     return 1 if any(i.severity == "ERROR" for i in issues) else 0
 
 if __name__ == "__main__":
@@ -134,16 +134,23 @@ function attachEnterHandler(inputEl, primaryBtn, secondaryBtn) {
 }
 
 const DATA_PATHS = {
-  verbs: "data/verbs/verbs.v2.jsonl?v=20260204_1",
-  exceptions: "data/exceptions/verb_exceptions.v1.json?v=20260204_1",
-  templates: "data/conjugations/conjugation_templates.v3.json?v=20260210_1",
-  ruleHints: "data/ui_text/rule_hints.v3.json?v=20260210_1",
-  exampleSentences: "data/ui_text/example_sentences.v4.json?v=20260210_1",
-  furigana: "data/ui_text/furigana.verbs.v2.v1.json?v=20260204_1",
-  learningPathGuided: "data/learning_paths/learning_path.guided.v1.json?v=20260222_1",
-  learningPathGenki: "data/learning_paths/learning_path.genki_aligned.v1.json?v=20260222_1",
+  verbs: "data/verbs/verbs.v2.jsonl",
+  exceptions: "data/exceptions/verb_exceptions.v1.json",
+  templates: "data/conjugations/conjugation_templates.v3.json",
+  ruleHints: "data/ui_text/rule_hints.v3.json",
+  exampleSentences: "data/ui_text/example_sentences.v4.json",
+  furigana: "data/ui_text/furigana.verbs.v2.v1.json",
+  learningPathGuided: "data/learning_paths/learning_path.guided.v1.json",
+  learningPathGenki: "data/learning_paths/learning_path.genki_aligned.v1.json",
 };
 
+// Written by scripts/build_bundle.py; points at one content-hashed file holding all DATA_PATHS data.
+// scripts/build_assets.py rewrites this and DATA_PATHS to content-hashed names for deploys.
+const DATA_BUNDLE_MANIFEST = "data/bundle/manifest.json";
+// Hashed names never change in place, so only the unhashed (dev) manifest needs revalidating.
+const FINGERPRINTED_ASSET_RE = /\.[0-9a-f]{16}\.[A-Za-z0-9]+$/;
+const DATA_BUNDLE_FORMAT = 1;
+
 const STORAGE_KEY = "japanese_srs_cards_v1";
 const SETTINGS_KEY = "japanese_srs_settings_v1";
 const STATS_KEY = "japanese_srs_stats_v1";
@@ -154,6 +161,13 @@ const DEMO_FLAG_KEY = "japanese_srs_demo_mode_v1";
 const DEMO_BACKUP_KEY = "japanese_srs_demo_backup_v1";
 const DAY_MS = 24 * 60 * 60 * 1000;
 const BACKUP_VERSION = "v1";
+// Optional server-side progress store (scripts/serve.py --progress-db).
+const PROGRESS_API_URL = "api/progress";
+const PROGRESS_PROFILE = "default";
+const PROGRESS_FLUSH_DELAY_MS = 1500;
+const PROGRESS_RETRY_DELAY_MS = 30 * 1000;
+const PROGRESS_LOCAL_SNAPSHOT_MS = 60 * 1000;
+const PROGRESS_KEEPALIVE_MAX_BYTES = 60 * 1024;
 
 const state = {
   verbs: [],
@@ -162,6 +176,8 @@ const state = {
   ruleHints: null,
   exampleSentences: null,
   furigana: null,
+  answerTable: null,
+  exampleIndex: null,
   stats: null,
   settings: null,
   cards: {},
@@ -187,6 +203,17 @@ let onboardingCustomFormIds = [];
 let onboardingPendingConfig = null;
 let pendingQuitConfirmAction = null;
 let storageRecoveryNotice = "";
+const progressSync = {
+  enabled: false,
+  revision: 0,
+  // The card store last sent in full; a different object means it was replaced.
+  syncedCards: null,
+  dirtyIds: new Set(),
+  events: [],
+  timer: null,
+  inFlight: false,
+  lastLocalSaveAt: 0,
+};
 const VERB_BROWSER_PAGE_SIZE = 12;
 const TAB_UI_MEMORY_SCREENS = new Set(["stats", "verb-browser"]);
 const tabUiMemory = {
@@ -1292,7 +1319,170 @@ function loadCards() {
 }
 
 function saveCards() {
-  saveStoredValue(STORAGE_KEY, STORAGE_BACKUP_KEY, state.cards);
+  if (!progressSync.enabled) {
+    saveStoredValue(STORAGE_KEY, STORAGE_BACKUP_KEY, state.cards);
+    return;
+  }
+  scheduleProgressFlush(0);
+  if (Date.now() - progressSync.lastLocalSaveAt >= PROGRESS_LOCAL_SNAPSHOT_MS) {
+    saveLocalCardsSnapshot();
+  }
+}
+
+function saveLocalCardsSnapshot() {
+  try {
+    saveStoredValue(STORAGE_KEY, STORAGE_BACKUP_KEY, state.cards);
+    progressSync.lastLocalSaveAt = Date.now();
+  } catch (err) {
+    console.warn("Failed to save local card snapshot", err);
+  }
+}
+
+// With the progress API available, each review sends the changed card (a few
+// hundred bytes) instead of rewriting the whole card store; localStorage keeps
+// a periodic full copy for offline starts.
+function progressApiUrl(query) {
+  const params = new URLSearchParams({ profile: PROGRESS_PROFILE, ...(query || {}) });
+  return `${PROGRESS_API_URL}?${params.toString()}`;
+}
+
+async function initProgressSync() {
+  let snapshot = null;
+  try {
+    const res = await fetch(progressApiUrl(), { cache: "no-store" });
+    if (!res.ok) {
+      return;
+    }
+    snapshot = await res.json();
+  } catch (err) {
+    return;
+  }
+  if (!snapshot || typeof snapshot.revision !== "number") {
+    return;
+  }
+  progressSync.enabled = true;
+  progressSync.revision = snapshot.revision;
+  if (snapshot.revision > 0) {
+    state.cards = filterCardStore(Core.applyProgressSnapshot({}, snapshot));
+    progressSync.syncedCards = state.cards;
+  } else {
+    // Empty store: the first flush uploads the local cards.
+    progressSync.syncedCards = null;
+  }
+  window.addEventListener("pagehide", flushProgressOnHide);
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "hidden") {
+      flushProgressOnHide();
+    } else {
+      pullProgressChanges();
+    }
+  });
+}
+
+function markCardChanged(cardId, event) {
+  if (!progressSync.enabled) return;
+  progressSync.dirtyIds.add(cardId);
+  if (event) {
+    progressSync.events.push({ card_id: cardId, at: new Date().toISOString(), ...event });
+  }
+  scheduleProgressFlush(PROGRESS_FLUSH_DELAY_MS);
+}
+
+function scheduleProgressFlush(delayMs) {
+  if (progressSync.timer) {
+    clearTimeout(progressSync.timer);
+  }
+  progressSync.timer = setTimeout(() => {
+    progressSync.timer = null;
+    flushProgress();
+  }, delayMs);
+}
+
+function takeProgressPatch() {
+  const replace = progressSync.syncedCards !== state.cards;
+  if (!replace && progressSync.dirtyIds.size === 0 && progressSync.events.length === 0) {
+    return null;
+  }
+  const patch = Core.buildProgressPatch({
+    cards: state.cards,
+    dirtyIds: Array.from(progressSync.dirtyIds),
+    events: progressSync.events,
+    replace,
+  });
+  progressSync.dirtyIds.clear();
+  progressSync.events = [];
+  progressSync.syncedCards = state.cards;
+  return patch;
+}
+
+function restoreProgressPatch(patch) {
+  if (patch.replace) {
+    progressSync.syncedCards = null;
+  } else {
+    Object.keys(patch.cards).forEach((id) => progressSync.dirtyIds.add(id));
+  }
+  progressSync.events = patch.events.concat(progressSync.events);
+}
+
+async function flushProgress(options) {
+  if (!progressSync.enabled || progressSync.inFlight) return;
+  const patch = takeProgressPatch();
+  if (!patch) return;
+  const body = JSON.stringify(patch);
+  const keepalive = Boolean(options && options.keepalive) && body.length <= PROGRESS_KEEPALIVE_MAX_BYTES;
+  let retryDelay = PROGRESS_FLUSH_DELAY_MS;
+  progressSync.inFlight = true;
+  try {
+    const res = await fetch(progressApiUrl(), {
+      method: "PATCH",
+      headers: { "Content-Type": "application/json" },
+      body,
+      keepalive,
+    });
+    if (!res.ok) {
+      throw new Error(`Progress sync failed (${res.status})`);
+    }
+    const result = await res.json();
+    // Only advance when no other client wrote in between, so a later pull still sees their changes.
+    if (result && result.revision === progressSync.revision + 1) {
+      progressSync.revision = result.revision;
+    }
+  } catch (err) {
+    console.warn("Progress sync failed; keeping changes for retry", err);
+    restoreProgressPatch(patch);
+    saveLocalCardsSnapshot();
+    retryDelay = PROGRESS_RETRY_DELAY_MS;
+  } finally {
+    progressSync.inFlight = false;
+  }
+  if (progressSync.dirtyIds.size > 0 || progressSync.events.length > 0 || progressSync.syncedCards !== state.cards) {
+    scheduleProgressFlush(retryDelay);
+  }
+}
+
+function flushProgressOnHide() {
+  if (!progressSync.enabled) return;
+  saveLocalCardsSnapshot();
+  flushProgress({ keepalive: true });
+}
+
+async function pullProgressChanges() {
+  if (!progressSync.enabled || progressSync.inFlight || progressSync.dirtyIds.size > 0) return;
+  if (lessonsActive || isSessionInProgress(reviewSession)) return;
+  try {
+    const res = await fetch(progressApiUrl({ since: progressSync.revision }), { cache: "no-store" });
+    if (!res.ok) return;
+    const delta = await res.json();
+    if (!delta || typeof delta.revision !== "number" || delta.revision <= progressSync.revision) return;
+    if (progressSync.dirtyIds.size > 0 || progressSync.syncedCards !== state.cards) return;
+    state.cards = filterCardStore(Core.applyProgressSnapshot(state.cards, delta));
+    progressSync.syncedCards = state.cards;
+    progressSync.revision = delta.revision;
+    updateReviewSummary();
+    updateLessonSummary();
+  } catch (err) {
+    console.warn("Failed to pull progress changes", err);
+  }
 }
 
 function defaultStats() {
@@ -1613,8 +1803,8 @@ function getLessonVerbPool() {
   return (state.verbs || []).slice();
 }
 
-async function loadJson(url) {
-  const res = await fetch(url);
+async function loadJson(url, options) {
+  const res = await fetch(url, options);
   if (!res.ok) {
     throw new Error(`Failed to load ${url}`);
   }
@@ -1634,10 +1824,160 @@ async function loadJsonl(url) {
     .map((line) => JSON.parse(line));
 }
 
+async function loadDataBundle() {
+  try {
+    const manifest = await loadJson(
+      DATA_BUNDLE_MANIFEST,
+      FINGERPRINTED_ASSET_RE.test(DATA_BUNDLE_MANIFEST) ? undefined : { cache: "no-cache" }
+    );
+    if (!manifest || manifest.format !== DATA_BUNDLE_FORMAT || typeof manifest.bundle !== "string") {
+      return null;
+    }
+    const bundle = await loadJson(manifest.bundle);
+    if (!bundle || bundle.format !== DATA_BUNDLE_FORMAT || !Array.isArray(bundle.verbs)) {
+      return null;
+    }
+    return bundle;
+  } catch (err) {
+    return null;
+  }
+}
+
+// Bundles carry a precomputed answer table (scripts/conjugation.py) so card
+// renders look answers up instead of running the conjugation rules.
+function indexAnswerTable(table) {
+  if (
+    !table ||
+    table.format !== 1 ||
+    !Array.isArray(table.verb_ids) ||
+    !Array.isArray(table.template_ids) ||
+    !Array.isArray(table.answers) ||
+    table.answers.length !== table.verb_ids.length * table.template_ids.length
+  ) {
+    return null;
+  }
+  return {
+    verbIndex: Object.fromEntries(table.verb_ids.map((id, idx) => [id, idx])),
+    templateIndex: Object.fromEntries(table.template_ids.map((id, idx) => [id, idx])),
+    width: table.template_ids.length,
+    answers: table.answers,
+    accepted: table.accepted || {},
+  };
+}
+
+// Bundles also carry example_index (scripts/example_index.py): the example sentence
+// each (verb, template) resolves to, lexicon tokens filled in, {V} left for the answer.
+// Entries index `texts`; null means no example, false an override that disables it.
+function indexExampleTable(table) {
+  if (
+    !table ||
+    table.format !== 1 ||
+    !Array.isArray(table.verb_ids) ||
+    !Array.isArray(table.template_ids) ||
+    !Array.isArray(table.texts) ||
+    !Array.isArray(table.sentences) ||
+    table.sentences.length !== table.verb_ids.length * table.template_ids.length
+  ) {
+    return null;
+  }
+  return {
+    verbIndex: Object.fromEntries(table.verb_ids.map((id, idx) => [id, idx])),
+    templateIndex: Object.fromEntries(table.template_ids.map((id, idx) => [id, idx])),
+    width: table.template_ids.length,
+    texts: table.texts,
+    sentences: table.sentences,
+  };
+}
+
+function lookupAnswers(verb, templateId) {
+  const table = state.answerTable;
+  if (!table || !verb) return null;
+  const row = table.verbIndex[verb.id];
+  const col = table.templateIndex[templateId];
+  if (row === undefined || col === undefined) return null;
+  const flat = row * table.width + col;
+  const canonical = table.answers[flat];
+  if (typeof canonical !== "string") return null;
+  return table.accepted[flat] || [canonical];
+}
+
+function conjugateExpected(verb, templateId) {
+  const answers = lookupAnswers(verb, templateId);
+  if (answers) return answers[0];
+  return Core.conjugate(verb, templateId, state.exceptions);
+}
+
+function conjugateAcceptedAnswers(verb, templateId) {
+  const answers = lookupAnswers(verb, templateId);
+  if (answers) return answers.slice();
+  return Core.conjugateAccepted
+    ? Core.conjugateAccepted(verb, templateId, state.exceptions)
+    : [Core.conjugate(verb, templateId, state.exceptions)];
+}
+
+function applyDataBundle(bundle) {
+  state.verbs = bundle.verbs;
+  state.templates = bundle.templates;
+  state.exceptions = bundle.exceptions;
+  state.ruleHints = bundle.rule_hints || null;
+  state.exampleSentences = bundle.example_sentences || null;
+  state.furigana = bundle.furigana && bundle.furigana.entries ? bundle.furigana.entries : null;
+  state.answerTable = indexAnswerTable(bundle.answers);
+  state.exampleIndex = indexExampleTable(bundle.example_index);
+  state.learningPaths = {};
+  if (bundle.learning_path_guided && bundle.learning_path_genki) {
+    state.learningPaths = {
+      guided: bundle.learning_path_guided,
+      textbook_genki: bundle.learning_path_genki,
+    };
+  }
+}
+
+async function loadDataFiles() {
+  state.answerTable = null;
+  state.exampleIndex = null;
+  state.verbs = await loadJsonl(DATA_PATHS.verbs);
+  state.templates = await loadJson(DATA_PATHS.templates);
+  state.exceptions = await loadJson(DATA_PATHS.exceptions);
+  try {
+    state.ruleHints = await loadJson(DATA_PATHS.ruleHints);
+  } catch (err) {
+    console.warn("Failed to load rule hints", err);
+    state.ruleHints = null;
+  }
+  try {
+    state.exampleSentences = await loadJson(DATA_PATHS.exampleSentences);
+  } catch (err) {
+    console.warn("Failed to load example sentences", err);
+    state.exampleSentences = null;
+  }
+  try {
+    const furiganaData = await loadJson(DATA_PATHS.furigana);
+    state.furigana = furiganaData && furiganaData.entries ? furiganaData.entries : null;
+  } catch (err) {
+    console.warn("Failed to load furigana helper", err);
+    state.furigana = null;
+  }
+  try {
+    const [guided, genki] = await Promise.all([
+      loadJson(DATA_PATHS.learningPathGuided),
+      loadJson(DATA_PATHS.learningPathGenki),
+    ]);
+    state.learningPaths = {
+      guided,
+      textbook_genki: genki,
+    };
+  } catch (err) {
+    console.warn("Failed to load learning path data", err);
+    state.learningPaths = {};
+  }
+}
+
 function ensureCard(verbId, templateId) {
   const cardId = Core.makeCardId(verbId, templateId);
   if (!state.cards[cardId]) {
     state.cards[cardId] = Core.createCard(verbId, templateId, new Date());
+    markCardChanged(cardId);
   }
   return state.cards[cardId];
 }
@@ -1935,7 +2275,7 @@ function buildDemoCards(activePathValue, learningPathStateMap) {
     if (compatibleCache[templateId]) return compatibleCache[templateId];
     const list = verbs.filter((verb) => {
       try {
-        Core.conjugate(verb, templateId, state.exceptions);
+        conjugateExpected(verb, templateId);
         return true;
       } catch (err) {
         return false;
@@ -2661,61 +3001,30 @@ function formatVerbTypeLabel(label) {
     .replace(/\b([a-z])/g, (match) => match.toUpperCase());
 }
 
-function getExampleSentence(verb, templateId, expected) {
-  if (!verb || !templateId || !expected) return "";
-  const verbClass = verb.verb_class;
-  if (!verbClass) return "";
-  const data = state.exampleSentences;
-  const templates = data && data.templates ? data.templates : null;
-  if (!templates) return "";
-  const templateData = templates[templateId];
-  if (!templateData || !templateData.by_verb_class) return "";
-  const lexicon = (data && data.lexicon) || {};
-
-  function hashStringToUint32(str) {
-    let hash = 2166136261;
-    for (let i = 0; i < str.length; i += 1) {
-      hash ^= str.charCodeAt(i);
-      hash = Math.imul(hash, 16777619);
+function lookupExampleText(verb, templateId) {
+  const table = state.exampleIndex;
+  if (table) {
+    const row = table.verbIndex[verb.id];
+    const col = table.templateIndex[templateId];
+    if (row !== undefined && col !== undefined) {
+      const entry = table.sentences[row * table.width + col];
+      return typeof entry === "number" ? table.texts[entry] || "" : "";
     }
-    return hash >>> 0;
   }
+  return Core.resolveExampleSentence(state.exampleSentences, verb, templateId).text;
+}
 
-  let list = templateData.by_verb_class[verbClass];
-  const overrides = Array.isArray(templateData.overrides) ? templateData.overrides : [];
-  const matchedOverride = overrides.find(
-    (ov) =>
-      ov &&
-      Array.isArray(ov.verb_ids) &&
-      ov.verb_ids.includes(verb.id)
-  );
-  if (matchedOverride && matchedOverride.disabled) return "";
-  if (matchedOverride && Array.isArray(matchedOverride.examples)) {
-    list = matchedOverride.examples;
-  }
-
-  if (!Array.isArray(list) || list.length === 0) return "";
-  const key = `${verb.id}|${templateId}`;
-  const idx = hashStringToUint32(key) % list.length;
-  const item = list[idx];
-  const text = item && typeof item.text === "string" ? item.text : "";
-  if (!text) return "";
-  const withVerb = text.split("{V}").join(expected);
-  return withVerb.replace(/\{([A-Za-z0-9_]+)\}/g, (match, token) => {
-    if (token === "V") return expected;
-    const options = lexicon[token];
-    if (!Array.isArray(options) || options.length === 0) return "";
-    const tokenKey = `${key}|${token}`;
-    const tokenIdx = hashStringToUint32(tokenKey) % options.length;
-    return options[tokenIdx];
-  });
+function getExampleSentence(verb, templateId, expected) {
+  if (!verb || !templateId || !expected) return "";
+  const text = lookupExampleText(verb, templateId);
+  return text ? text.split("{V}").join(expected) : "";
 }
 
 function getLessonBreakdown(verb, templateId, expected) {
   if (!verb || !templateId || !expected) return "";
   const base = verb.kana;
   if (templateId === "polite_te_form") {
-    const teForm = Core.conjugate(verb, "plain_te_form", state.exceptions);
+    const teForm = conjugateExpected(verb, "plain_te_form");
     if (teForm && teForm !== expected) {
       return `${base} -> ${teForm} -> ${expected}`;
     }
@@ -3880,10 +4189,8 @@ function renderSessionCard(session) {
   const item = session.queue[0];
   const verb = state.verbsById[item.verb_id];
   const template = state.templatesById[item.conjugation_id];
-  const expected = Core.conjugate(verb, template.id, state.exceptions);
-  const acceptedAnswers = Core.conjugateAccepted
-    ? Core.conjugateAccepted(verb, template.id, state.exceptions)
-    : [expected];
+  const acceptedAnswers = conjugateAcceptedAnswers(verb, template.id);
+  const expected = acceptedAnswers[0];
   const verbDisplay = renderVerbDisplay(verb);
   const ruleDisplay = getRuleDisplay(verb, template.id);
   const showRulesInPrompt = false;
@@ -4040,6 +4347,12 @@ function renderSessionCard(session) {
           now: new Date(),
         });
         state.cards[cardRecord.card_id] = update.card;
+        markCardChanged(cardRecord.card_id, {
+          mode: session.mode,
+          correct: Boolean(result.correct),
+          hint_used: Boolean(session.hintUsed),
+          stage: update.card.stage,
+        });
         progress.scheduled = true;
       }
 
@@ -4073,6 +4386,12 @@ function renderSessionCard(session) {
         now: new Date(),
       });
       state.cards[cardRecord.card_id] = update.card;
+      markCardChanged(cardRecord.card_id, {
+        mode: session.mode,
+        correct,
+        hint_used: Boolean(session.hintUsed),
+        stage: update.card.stage,
+      });
 
       session.queue.shift();
       session.completed += 1;
@@ -4373,7 +4692,7 @@ function renderLessonCard(session) {
     const item = session.lessons[session.lessonIndex];
     const verb = state.verbsById[item.verb_id];
     const template = state.templatesById[item.conjugation_id];
-    const expected = Core.conjugate(verb, template.id, state.exceptions);
+    const expected = conjugateExpected(verb, template.id);
     const verbDisplay = renderVerbDisplay(verb);
     const ruleDisplay = getRuleDisplay(verb, template.id);
     const classLabelText = ruleDisplay.classLabel || "";
@@ -4471,10 +4790,8 @@ function renderLessonCard(session) {
   const item = session.practiceQueue[0];
   const verb = state.verbsById[item.verb_id];
   const template = state.templatesById[item.conjugation_id];
-  const expected = Core.conjugate(verb, template.id, state.exceptions);
-  const acceptedAnswers = Core.conjugateAccepted
-    ? Core.conjugateAccepted(verb, template.id, state.exceptions)
-    : [expected];
+  const acceptedAnswers = conjugateAcceptedAnswers(verb, template.id);
+  const expected = acceptedAnswers[0];
   const verbDisplay = renderVerbDisplay(verb);
 
   const card = document.createElement("div");
@@ -4597,6 +4914,7 @@ function renderLessonCard(session) {
     result.card.learning_step = null;
     result.card.due_at = addDays(now, 1).toISOString();
     state.cards[cardRecord.card_id] = result.card;
+    markCardChanged(cardRecord.card_id, { mode: "lesson", correct: true, hint_used: false, stage: result.card.stage });
     if (outcome.recordCompletedLesson) {
       recordCompletedLesson();
     }
@@ -5260,40 +5578,11 @@ async function init() {
   try {
     setStatus("Loading data...");
     state.cards = loadCards();
-    state.verbs = await loadJsonl(DATA_PATHS.verbs);
-    state.templates = await loadJson(DATA_PATHS.templates);
-    state.exceptions = await loadJson(DATA_PATHS.exceptions);
-    try {
-      state.ruleHints = await loadJson(DATA_PATHS.ruleHints);
-    } catch (err) {
-      console.warn("Failed to load rule hints", err);
-      state.ruleHints = null;
-    }
-    try {
-      state.exampleSentences = await loadJson(DATA_PATHS.exampleSentences);
-    } catch (err) {
-      console.warn("Failed to load example sentences", err);
-      state.exampleSentences = null;
-    }
-    try {
-      const furiganaData = await loadJson(DATA_PATHS.furigana);
-      state.furigana = furiganaData && furiganaData.entries ? furiganaData.entries : null;
-    } catch (err) {
-      console.warn("Failed to load furigana helper", err);
-      state.furigana = null;
-    }
-    try {
-      const [guided, genki] = await Promise.all([
-        loadJson(DATA_PATHS.learningPathGuided),
-        loadJson(DATA_PATHS.learningPathGenki),
-      ]);
-      state.learningPaths = {
-        guided,
-        textbook_genki: genki,
-      };
-    } catch (err) {
-      console.warn("Failed to load learning path data", err);
-      state.learningPaths = {};
+    const bundle = await loadDataBundle();
+    if (bundle) {
+      applyDataBundle(bundle);
+    } else {
+      await loadDataFiles();
     }
     state.verbsById = Object.fromEntries(state.verbs.map((v) => [v.id, v]));
     state.templatesById = Object.fromEntries(state.templates.map((t) => [t.id, t]));
@@ -5318,6 +5607,7 @@ async function init() {
     saveSettings();
     applyLessonUnlocks(new Date());
     state.cards = filterCardStore(state.cards);
+    await initProgressSync();
     saveCards();
     renderEnabledFormsUI();
     updateFormsWarnings();
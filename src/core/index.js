@@ -5,8 +5,8 @@
     root.JapaneseSrsCore = factory();
   }
 })(typeof window !== "undefined" ? window : global, function () {
-  const VOWELS = new Set(["a", "i", "u", "e", "o"]);
-  const CONSONANTS = new Set("bcdfghjklmnpqrstvwxyz".split(""));
+  // Doubling any of these (a run of two or more) types a single っ.
+  const SOKUON_CONSONANTS = "bcdfghjklmpqrstvwxyz";
 
   const ROMAJI_MAP = {
     a: "あ",
@@ -137,6 +137,82 @@
     ltsu: "っ",
   };
 
+  // [key, kana, matched characters left for the next match] on top of ROMAJI_MAP.
+  // A lone n is ん unless a vowel or y follows (those keys are longer); ny without a
+  // vowel after it stays a literal n.
+  const ROMAJI_RULES = [
+    ["n", "ん", 0],
+    ["nn", "ん", 0],
+    ["n'", "ん", 0],
+    ["n ", "ん", 0],
+    ["ny", "n", 1],
+  ];
+
+  // Longest-match DFA over ROMAJI_MAP, ROMAJI_RULES and doubled consonants (which loop,
+  // so kittta is one っ). State 0 is the start; next[state * width + symbol] is the
+  // following state or 0. Accepting states emit emit[state] and hand keep[state] of the
+  // matched characters back. scripts/romaji.py builds the same table.
+  function compileRomajiTable(map) {
+    const entries = Object.keys(map)
+      .map(function (key) {
+        return [key, map[key], 0];
+      })
+      .concat(ROMAJI_RULES);
+    const alphabet = Array.from(
+      new Set(
+        entries
+          .map(function (entry) {
+            return entry[0];
+          })
+          .join("") + SOKUON_CONSONANTS
+      )
+    )
+      .sort()
+      .join("");
+    const width = alphabet.length;
+    const symbols = new Int8Array(128).fill(-1);
+    for (let i = 0; i < width; i += 1) {
+      symbols[alphabet.charCodeAt(i)] = i;
+    }
+    const next = [];
+    const emit = [];
+    const keep = [];
+    function addState() {
+      for (let i = 0; i < width; i += 1) next.push(0);
+      emit.push(null);
+      keep.push(0);
+      return emit.length - 1;
+    }
+    function step(state, ch) {
+      const slot = state * width + symbols[ch.charCodeAt(0)];
+      if (!next[slot]) next[slot] = addState();
+      return next[slot];
+    }
+    addState();
+    entries.forEach(function (entry) {
+      let state = 0;
+      for (const ch of entry[0]) state = step(state, ch);
+      emit[state] = entry[1];
+      keep[state] = entry[2];
+    });
+    for (const ch of SOKUON_CONSONANTS) {
+      const doubled = step(step(0, ch), ch);
+      emit[doubled] = "っ";
+      keep[doubled] = 1;
+      next[doubled * width + symbols[ch.charCodeAt(0)]] = doubled;
+    }
+    return {
+      alphabet: alphabet,
+      symbols: symbols,
+      width: width,
+      next: Uint16Array.from(next),
+      emit: emit,
+      keep: Uint8Array.from(keep),
+    };
+  }
+
+  const ROMAJI_TABLE = compileRomajiTable(ROMAJI_MAP);
+
   function isHiraganaChar(ch) {
     const code = ch.charCodeAt(0);
     return code >= 0x3041 && code <= 0x309f;
@@ -160,26 +236,10 @@
     return out;
   }
 
-  function isAsciiLetter(ch) {
-    return ch >= "a" && ch <= "z";
-  }
-
-  function isConsonant(ch) {
-    return CONSONANTS.has(ch);
-  }
-
-  function countRun(input, index, ch) {
-    let i = index;
-    while (i < input.length && input[i] === ch) {
-      i += 1;
-    }
-    return i - index;
-  }
-
   function romajiToKana(input) {
     if (input == null) return "";
-    const raw = String(input);
-    const lower = raw.toLowerCase();
+    const lower = String(input).toLowerCase();
+    const table = ROMAJI_TABLE;
     let out = "";
     let i = 0;
 
@@ -209,51 +269,24 @@
         continue;
       }
 
-      if (!isAsciiLetter(ch)) {
-        out += ch;
-        i += 1;
-        continue;
-      }
-
-      const next = lower[i + 1] || "";
-
-      if (ch === "n") {
-        if (next === "'" || next === " ") {
-          out += "ん";
-          i += 2;
-          continue;
-        }
-        if (next === "n") {
-          out += "ん";
-          i += 2;
-          continue;
-        }
-        if (!next || (!VOWELS.has(next) && next !== "y")) {
-          out += "ん";
-          i += 1;
-          continue;
-        }
-      }
-
-      if (isConsonant(ch) && ch !== "n" && next === ch) {
-        const runLen = countRun(lower, i, ch);
-        out += "っ";
-        i += Math.max(1, runLen - 1);
-        continue;
-      }
-
-      let matched = null;
-      for (const len of [4, 3, 2, 1]) {
-        const chunk = lower.slice(i, i + len);
-        if (ROMAJI_MAP[chunk]) {
-          matched = ROMAJI_MAP[chunk];
-          i += len;
-          break;
+      let state = 0;
+      let matched = 0;
+      let end = i;
+      for (let j = i; j < lower.length; j += 1) {
+        const code = lower.charCodeAt(j);
+        const symbol = code < 128 ? table.symbols[code] : -1;
+        if (symbol < 0) break;
+        state = table.next[state * table.width + symbol];
+        if (state === 0) break;
+        if (table.emit[state] !== null) {
+          matched = state;
+          end = j + 1;
         }
       }
 
       if (matched) {
-        out += matched;
+        out += table.emit[matched];
+        i = end - table.keep[matched];
         continue;
       }
 
@@ -1018,6 +1051,96 @@
     };
   }
 
+  // Progress sync with `scripts/serve.py --progress-db`: a PATCH body carries only the
+  // changed cards (null = deleted) and the review events since the last flush;
+  // `replace` resends the whole store (after an import, reset or first upload).
+  function buildProgressPatch(options) {
+    const opts = options || {};
+    const cards = opts.cards && typeof opts.cards === "object" ? opts.cards : {};
+    const replace = Boolean(opts.replace);
+    const ids = replace ? Object.keys(cards) : Array.from(new Set(opts.dirtyIds || []));
+    const patchCards = {};
+    ids.forEach(function (id) {
+      const card = cards[id];
+      patchCards[id] = card && typeof card === "object" ? card : null;
+    });
+    return {
+      cards: patchCards,
+      events: Array.isArray(opts.events) ? opts.events.slice() : [],
+      replace: replace,
+    };
+  }
+
+  // Applies a GET /api/progress response: `full` snapshots replace the store,
+  // `since` responses carry changed cards plus deleted ids.
+  function applyProgressSnapshot(cards, snapshot) {
+    const current = cards && typeof cards === "object" ? cards : {};
+    if (!snapshot || typeof snapshot !== "object" || !snapshot.cards || typeof snapshot.cards !== "object") {
+      return current;
+    }
+    const next = snapshot.full ? {} : Object.assign({}, current);
+    Object.keys(snapshot.cards).forEach(function (id) {
+      next[id] = snapshot.cards[id];
+    });
+    (Array.isArray(snapshot.deleted) ? snapshot.deleted : []).forEach(function (id) {
+      delete next[id];
+    });
+    return next;
+  }
+
+  function hashStringToUint32(str) {
+    let hash = 2166136261;
+    for (let i = 0; i < str.length; i += 1) {
+      hash ^= str.charCodeAt(i);
+      hash = Math.imul(hash, 16777619);
+    }
+    return hash >>> 0;
+  }
+
+  // Picks the example sentence for a card from example_sentences.v4.json data. The first
+  // override listing the verb replaces the class list (or disables examples); the example
+  // and each lexicon token are chosen by FNV-1a of `verb_id|template_id` (`|token`).
+  // The returned text keeps the {V} placeholder for the expected answer.
+  // scripts/example_index.py mirrors this to precompile the bundle's example_index.
+  function resolveExampleSentence(exampleData, verb, templateId) {
+    const none = function (status) {
+      return { status: status, text: "" };
+    };
+    if (!verb || !templateId) return none("no_template");
+    const verbClass = verb.verb_class;
+    if (!verbClass) return none("no_verb_class");
+    const templates = exampleData && exampleData.templates ? exampleData.templates : null;
+    if (!templates) return none("no_template");
+    const templateData = templates[templateId];
+    if (!templateData || !templateData.by_verb_class) return none("no_template");
+    const lexicon = exampleData.lexicon || {};
+
+    let list = templateData.by_verb_class[verbClass];
+    const overrides = Array.isArray(templateData.overrides) ? templateData.overrides : [];
+    const matchedOverride = overrides.find(function (ov) {
+      return ov && Array.isArray(ov.verb_ids) && ov.verb_ids.includes(verb.id);
+    });
+    if (matchedOverride && matchedOverride.disabled) return none("disabled");
+    if (matchedOverride && Array.isArray(matchedOverride.examples)) {
+      list = matchedOverride.examples;
+    }
+    if (!Array.isArray(list) || list.length === 0) return none("no_examples");
+
+    const key = `${verb.id}|${templateId}`;
+    const item = list[hashStringToUint32(key) % list.length];
+    const text = item && typeof item.text === "string" ? item.text : "";
+    if (!text) return none("empty_text");
+    return {
+      status: "ok",
+      text: text.replace(/\{([A-Za-z0-9_]+)\}/g, function (match, token) {
+        if (token === "V") return match;
+        const options = lexicon[token];
+        if (!Array.isArray(options) || options.length === 0) return "";
+        return options[hashStringToUint32(`${key}|${token}`) % options.length];
+      }),
+    };
+  }
+
   return {
     romajiToKana: romajiToKana,
     normalizeAnswer: normalizeAnswer,
@@ -1037,5 +1160,8 @@
     getRequeueInsertIndex: getRequeueInsertIndex,
     getLessonPracticeOutcome: getLessonPracticeOutcome,
     recoverStoredJson: recoverStoredJson,
+    buildProgressPatch: buildProgressPatch,
+    applyProgressSnapshot: applyProgressSnapshot,
+    resolveExampleSentence: resolveExampleSentence,
   };
 });
@@ -270,6 +270,17 @@
     };
   }
 
+  // mulberry32: a small seeded generator for reproducible queues (tests, scripts/lesson_sim.py).
+  function createSeededRng(seed) {
+    let a = seed >>> 0;
+    return function rng() {
+      a = (a + 0x6d2b79f5) | 0;
+      let t = Math.imul(a ^ (a >>> 15), 1 | a);
+      t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+      return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+  }
+
   function randomIndex(max, rng) {
     if (max <= 1) return 0;
     const value = typeof rng === "function" ? rng() : Math.random();
@@ -1030,5 +1041,6 @@
     applyConfusablePairBoost,
     evaluatePathAdvance,
     buildLessonQueue,
+    createSeededRng,
   };
 });